@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+分析流水线基准测试脚本
+
+用 benchmark_data 生成的合成数据（按参数缓存）测量两类场景：
+
+  - stages-*: 单个工作簿的各阶段耗时（读取、脉冲检测、等级匹配、电荷计算、
+    Info_Image 写入、单文件完整处理），规模 1k / 100k / 1M 行
+  - run-*:    整个目录的 BatteryAnalysis.run 耗时，规模 10 / 100 / 500 个文件
+
+每个场景在独立子进程中运行，记录各阶段多次重复的最小值与中位数，以及该场景
+的峰值常驻内存（本进程与最大的工作子进程）。结果连同提交号、Python / 依赖
+版本与 CPU 数写入 JSON，可用 compare 子命令对比两次运行。持久化工作表缓存
+在基准中始终禁用。
+
+用法:
+    python scripts/benchmark.py run --suite quick
+    python scripts/benchmark.py run --scenario stages-100k --scenario run-100 -j 4 -o after.json
+    python scripts/benchmark.py compare before.json after.json --threshold 1.1
+"""
+
+import argparse
+import datetime
+import importlib.metadata
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+
+_SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+_REPO_ROOT = os.path.dirname(_SCRIPTS_DIR)
+# 直接以脚本运行时让 "scripts.benchmark_data" 可导入
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from scripts.benchmark_data import WorkbookSpec, generate_dataset  # noqa: E402
+
+RESULTS_FORMAT = 1
+
+DEFAULT_DATA_ROOT = os.path.join(tempfile.gettempdir(), "battery_analysis_benchmark")
+DEFAULT_RESULTS_DIR = os.path.join(_REPO_ROOT, "benchmark-results")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """一个基准场景
+
+    Attributes:
+        name: 场景名（命令行与结果中的键）
+        kind: "stages"（单文件分阶段）或 "run"（整个目录）
+        spec: 合成数据参数
+    """
+    name: str
+    kind: str
+    spec: WorkbookSpec
+
+
+SCENARIOS = {scenario.name: scenario for scenario in (
+    Scenario("stages-1k", "stages", WorkbookSpec(rows=1_000, cycles=10)),
+    Scenario("stages-100k", "stages", WorkbookSpec(rows=100_000, cycles=100)),
+    Scenario("stages-1m", "stages", WorkbookSpec(rows=1_000_000, cycles=1000)),
+    Scenario("run-10", "run", WorkbookSpec(files=10, rows=2_000, cycles=20)),
+    Scenario("run-100", "run", WorkbookSpec(files=100, rows=2_000, cycles=20)),
+    Scenario("run-500", "run", WorkbookSpec(files=500, rows=2_000, cycles=20)),
+)}
+
+SUITES = {
+    "quick": ("stages-1k", "run-10"),
+    "default": ("stages-1k", "stages-100k", "run-10", "run-100"),
+    "full": tuple(SCENARIOS),
+}
+
+
+def dataset_dir(data_root: str, scenario: Scenario) -> str:
+    """场景数据的缓存目录：参数相同的场景共用"""
+    spec = scenario.spec
+    return os.path.join(data_root, f"f{spec.files}_r{spec.rows}_c{spec.cycles}_s{spec.seed}")
+
+
+# ────────────────────────────────────────────────────────────
+#  计时与内存
+# ────────────────────────────────────────────────────────────
+def time_repeated(fn, repeat: int, warmup: int = 0) -> dict:
+    """先不计时地调用 fn() warmup 次，再计时调用 repeat 次，返回 {"min", "median", "runs"}（秒）"""
+    for _ in range(warmup):
+        fn()
+    runs = []
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return {"min": min(runs), "median": statistics.median(runs), "runs": runs}
+
+
+def peak_rss() -> dict:
+    """本进程与（已结束的）最大子进程的峰值常驻内存（字节），平台不支持时为 None"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        try:
+            import psutil
+            return {"self": psutil.Process().memory_info().peak_wset, "children": None}
+        except (ImportError, AttributeError):
+            return {"self": None, "children": None}
+    # Linux 的 ru_maxrss 单位为 KB，macOS 为字节
+    scale = 1 if sys.platform == "darwin" else 1024
+    return {"self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+            "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale}
+
+
+# ────────────────────────────────────────────────────────────
+#  场景
+# ────────────────────────────────────────────────────────────
+def bench_stages(path: str, spec: WorkbookSpec, repeat: int) -> dict:
+    """单个工作簿的分阶段耗时；各阶段以上一阶段的输出为输入"""
+    from battery_analysis.utils.processors.battery_analysis import BatteryAnalysis
+    from battery_analysis.utils.processors.charge_calculator import ChargeCalculator
+    from battery_analysis.utils.processors.pulse_detector import detect_pulse_rows
+    from battery_analysis.utils.processors.pulse_matcher import match_pulse_levels
+    from battery_analysis.utils.processors.pulse_curves import PulseCurves
+    from battery_analysis.utils.readers.xlsx_reader import read_projected_sheets, read_xlsx_sheets
+    from battery_analysis.utils.writers.info_csv_writer import InfoImageWriter, write_info_csv
+
+    current_levels, voltage_levels = list(spec.current_levels), list(spec.voltage_levels)
+    timings = {"read_xlsx_sheets": time_repeated(lambda: read_xlsx_sheets(path), repeat),
+               "read_projected_sheets": time_repeated(lambda: read_projected_sheets(path), repeat)}
+    cycle_df, step_df, record_df = read_projected_sheets(path)
+
+    timings["detect_pulse_rows"] = time_repeated(lambda: detect_pulse_rows(record_df), repeat)
+    pulse_mask = detect_pulse_rows(record_df).to_numpy()
+
+    def _match():
+        return match_pulse_levels(record_df.iloc[:, 2].to_numpy(), record_df.iloc[:, 3].to_numpy(),
+                                  pulse_mask, current_levels, voltage_levels, start_row=2)
+
+    timings["match_pulse_levels"] = time_repeated(_match, repeat)
+    _, level_rows, posi, voltage = _match()
+    positions = [row for rows in level_rows for row in rows] + [p for rows in posi for p in rows]
+
+    def _charges():
+        return ChargeCalculator(cycle_df, step_df, record_df).calculate_batch(positions)
+
+    timings["charge_calculator"] = time_repeated(_charges, repeat)
+    charges, valid = _charges()
+    curve_charges, curve_valid = charges[-sum(map(len, posi)):], valid[-sum(map(len, posi)):]
+    curves = PulseCurves.from_levels(posi, voltage, curve_charges, curve_valid)
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        timings["write_info_csv"] = time_repeated(
+            lambda: write_info_csv(out_dir, ["B1"], current_levels, [curves.posi_lists()],
+                                   [curves.charge_lists()], [curves.voltage_lists()]), repeat)
+
+        def _write_info_image():
+            with InfoImageWriter(out_dir, len(current_levels)) as writer:
+                writer.add("B1", curves)
+
+        timings["info_image_writer"] = time_repeated(_write_info_image, repeat)
+
+    args = (path, current_levels, voltage_levels)
+    timings["process_file"] = time_repeated(lambda: BatteryAnalysis._parallel_process_file(args), repeat)
+    return timings
+
+
+def bench_run(input_dir: str, spec: WorkbookSpec, repeat: int, jobs: int) -> dict:
+    """整个目录的 BatteryAnalysis.run 耗时（非增量，不含进程池启动）"""
+    from battery_analysis.utils.processors.battery_analysis import BatteryAnalysis
+    from battery_analysis.utils.task_executor import TaskExecutor
+    from battery_analysis.utils.worker_pool import shutdown_worker_pool
+
+    executor = TaskExecutor("serial") if jobs == 1 else TaskExecutor("process", max_workers=jobs or None)
+    errors = []
+
+    def _run():
+        with tempfile.TemporaryDirectory() as out_dir:
+            os.mkdir(os.path.join(out_dir, "V1"))
+            analysis = BatteryAnalysis(input_dir, out_dir, spec.test_info(), incremental=False,
+                                       executor=executor)
+            errors.append(analysis.UBA_GetErrorLog())
+
+    try:
+        # 预热一次：进程池启动与工作进程导入不计入分析耗时
+        timings = {"battery_analysis_run": time_repeated(_run, repeat, warmup=1)}
+    finally:
+        # 结束工作进程，使其峰值内存计入 RUSAGE_CHILDREN
+        shutdown_worker_pool()
+    if any(errors):
+        raise RuntimeError(f"BatteryAnalysis.run failed: {next(e for e in errors if e)}")
+    return timings
+
+
+def run_scenario(scenario: Scenario, data_root: str, repeat: int, jobs: int) -> dict:
+    """在当前进程中运行一个场景（由 run_suite 在独立子进程中调用）"""
+    os.environ["BATTERY_ANALYSIS_SHEET_CACHE"] = "0"
+    data_dir = dataset_dir(data_root, scenario)
+    paths = generate_dataset(data_dir, scenario.spec)
+    if scenario.kind == "stages":
+        timings = bench_stages(paths[0], scenario.spec, repeat)
+    else:
+        timings = bench_run(data_dir, scenario.spec, repeat, jobs)
+    return {"scenario": scenario.name, "kind": scenario.kind, "params": scenario.spec.to_dict(),
+            "timings": timings, "peak_rss_bytes": peak_rss()}
+
+
+def environment_info() -> dict:
+    """结果文件中的运行环境：提交号、平台与主要依赖版本"""
+    def _git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=_REPO_ROOT, capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return ""
+
+    versions = {}
+    for package in ("numpy", "pandas", "python-calamine", "openpyxl"):
+        try:
+            versions[package] = importlib.metadata.version(package)
+        except importlib.metadata.PackageNotFoundError:
+            versions[package] = None
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.datetime.now().astimezone().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "versions": versions,
+    }
+
+
+def run_suite(names, data_root: str, repeat: int, jobs: int) -> dict:
+    """逐个场景启动子进程运行，汇总为结果字典"""
+    results = []
+    for name in names:
+        print(f"[benchmark] {name} ...", file=sys.stderr, flush=True)
+        cmd = [sys.executable, os.path.abspath(__file__), "_scenario", name,
+               "--data-root", data_root, "--repeat", str(repeat), "-j", str(jobs)]
+        proc = subprocess.run(cmd, capture_output=True, text=True, check=False)
+        if proc.returncode != 0:
+            sys.stderr.write(proc.stderr)
+            results.append({"scenario": name, "error": (proc.stderr.strip().splitlines() or ["failed"])[-1]})
+            continue
+        results.append(json.loads(proc.stdout))
+        for stage, timing in results[-1]["timings"].items():
+            print(f"[benchmark]   {stage:<24} {timing['median'] * 1000:10.1f} ms", file=sys.stderr)
+    return {"format": RESULTS_FORMAT, "environment": environment_info(),
+            "repeat": repeat, "jobs": jobs, "results": results}
+
+
+# ────────────────────────────────────────────────────────────
+#  对比
+# ────────────────────────────────────────────────────────────
+def compare_results(baseline: dict, current: dict, threshold: float = 1.1) -> tuple:
+    """按 (场景, 阶段) 对比两次结果的中位数耗时
+
+    Returns:
+        (行列表 [(场景, 阶段, 基准秒, 当前秒, 比值)], 是否存在比值超过 threshold 的退化)
+    """
+    def _medians(data):
+        return {(result["scenario"], stage): timing["median"]
+                for result in data.get("results", []) if "timings" in result
+                for stage, timing in result["timings"].items()}
+
+    before, after = _medians(baseline), _medians(current)
+    rows, regressed = [], False
+    for key in sorted(before.keys() & after.keys()):
+        ratio = after[key] / before[key] if before[key] > 0 else float("inf")
+        rows.append((*key, before[key], after[key], ratio))
+        regressed |= ratio > threshold
+    return rows, regressed
+
+
+def print_comparison(rows) -> None:
+    print(f"{'scenario':<14} {'stage':<24} {'before ms':>11} {'after ms':>11} {'ratio':>7}")
+    for scenario, stage, before, after, ratio in rows:
+        print(f"{scenario:<14} {stage:<24} {before * 1000:11.1f} {after * 1000:11.1f} {ratio:7.2f}")
+
+
+def _load_json(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the battery analysis pipeline.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run benchmark scenarios and write a results JSON")
+    run.add_argument("--suite", choices=sorted(SUITES), default="default")
+    run.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                     help="run only these scenarios (repeatable; overrides --suite)")
+    run.add_argument("--repeat", type=int, default=3, help="repetitions per stage")
+    run.add_argument("-j", "--jobs", type=int, default=0,
+                     help="worker processes for run-* scenarios (0 = one per CPU, 1 = in-process)")
+    run.add_argument("--data-root", default=DEFAULT_DATA_ROOT, help="synthetic data cache directory")
+    run.add_argument("-o", "--output", help="results JSON (default: benchmark-results/<commit>-<time>.json)")
+    run.add_argument("--baseline", help="compare against this results JSON after the run")
+    run.add_argument("--threshold", type=float, default=1.1,
+                     help="with --baseline: exit 1 when a stage is slower by more than this ratio")
+
+    compare = sub.add_parser("compare", help="compare two results JSON files")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=1.1,
+                         help="exit 1 when a stage is slower by more than this ratio")
+
+    scenario = sub.add_parser("_scenario")  # 内部：子进程中运行单个场景
+    scenario.add_argument("name", choices=sorted(SCENARIOS))
+    scenario.add_argument("--data-root", required=True)
+    scenario.add_argument("--repeat", type=int, default=3)
+    scenario.add_argument("-j", "--jobs", type=int, default=0)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "_scenario":
+        result = run_scenario(SCENARIOS[args.name], args.data_root, args.repeat, args.jobs)
+        json.dump(result, sys.stdout)
+        return 0
+
+    if args.command == "compare":
+        rows, regressed = compare_results(_load_json(args.baseline), _load_json(args.current), args.threshold)
+        print_comparison(rows)
+        return 1 if regressed else 0
+
+    results = run_suite(args.scenario or SUITES[args.suite], args.data_root, args.repeat, args.jobs)
+    output = args.output
+    if not output:
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(DEFAULT_RESULTS_DIR, f"{results['environment']['commit'][:10] or 'local'}-{stamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(output)
+
+    failed = [result["scenario"] for result in results["results"] if "error" in result]
+    if args.baseline:
+        rows, regressed = compare_results(_load_json(args.baseline), results, args.threshold)
+        print_comparison(rows)
+        if regressed:
+            return 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+基准测试用的合成电池数据生成脚本
+
+按固定随机种子生成与测试设备导出格式一致的 Cycle / Step / Record 三表 xlsx：
+每个循环依次对各电流等级施加放电脉冲（"脉冲" 步骤，若干采样点）并静置
+（"Rest" 步骤），开路电压随放电深度线性下降，负载电压再减去与电流成正比的
+内阻压降，因此各电流等级的脉冲结束电压都会依次穿过默认电压等级。
+
+相同参数与种子生成的数据逐单元格一致；生成结果按参数缓存在目录中，
+重复运行基准时直接复用。
+
+用法:
+    python scripts/benchmark_data.py OUT_DIR --files 10 --rows 100000
+"""
+
+import argparse
+import datetime
+import json
+import os
+from dataclasses import asdict, dataclass
+
+import numpy as np
+import openpyxl
+
+# 默认测试条件（与 CR2450 纽扣电池的典型测试一致）
+DEFAULT_CURRENT_LEVELS = (30, 26, 15)
+DEFAULT_VOLTAGE_LEVELS = (2.6, 2.5, 2.4, 2.3)
+
+# 电压模型：开路电压从 OCV_START 线性降到 OCV_END，负载压降 = 电流(mA) × 内阻(kΩ)
+OCV_START = 3.2
+OCV_END = 2.5
+INTERNAL_RESISTANCE_KOHM = 0.012
+VOLTAGE_NOISE = 0.002
+CURRENT_NOISE = 0.01
+
+# 每个 Record 采样点的时间间隔（秒），用于累计电荷
+SAMPLE_SECONDS = 1.0
+
+# 缓存目录中记录生成参数的文件
+SPEC_FILE = "dataset.json"
+
+TEST_DATE = "20250610"
+
+
+@dataclass
+class WorkbookSpec:
+    """合成数据集参数
+
+    Attributes:
+        files: 文件（电池）数
+        rows: 每个文件 Record 表的数据行数（不含 2 行表头）
+        cycles: 循环数（Cycle 表行数）
+        current_levels: 电流等级（mA），脉冲按此顺序轮流施加
+        voltage_levels: 电压等级（V），仅用于 test_info
+        pulse_rows: 每个脉冲的采样行数
+        rest_rows: 每次静置的采样行数
+        seed: 随机种子
+    """
+    files: int = 1
+    rows: int = 1000
+    cycles: int = 10
+    current_levels: tuple = DEFAULT_CURRENT_LEVELS
+    voltage_levels: tuple = DEFAULT_VOLTAGE_LEVELS
+    pulse_rows: int = 4
+    rest_rows: int = 6
+    seed: int = 0
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["current_levels"] = list(self.current_levels)
+        data["voltage_levels"] = list(self.voltage_levels)
+        return data
+
+    def test_info(self, version: str = "1") -> list:
+        """与本数据集匹配的 TestInfo 位置列表"""
+        return ["", "", "CR2450", "1S1P", "Synthetic", "B1", "", "25:C", "600", "", "", "", "", "",
+                list(self.current_levels), list(self.voltage_levels), version, "", ""]
+
+
+def record_columns(spec: WorkbookSpec, index: int) -> dict:
+    """生成第 index 个电池的 Record 数据列
+
+    Returns:
+        {"cycle", "step", "current", "voltage", "charge"}；step 为 0/1 数组（1 表示脉冲）
+    """
+    rng = np.random.default_rng([spec.seed, index])
+    levels = np.asarray(spec.current_levels, dtype=np.float64)
+    period = spec.pulse_rows + spec.rest_rows
+    rows = np.arange(spec.rows)
+
+    # 行 → (脉冲序号, 脉冲内位置)；脉冲序号轮流对应各电流等级
+    pulse_no, offset = np.divmod(rows, period)
+    is_pulse = offset < spec.pulse_rows
+    level_ma = levels[pulse_no % len(levels)]
+    current_ma = np.where(is_pulse, -level_ma * (1 + rng.normal(0, CURRENT_NOISE, spec.rows)), 0.0)
+
+    # 各电池的容量略有差异：放电深度按电池缩放
+    depth = rows / max(spec.rows - 1, 1) * rng.uniform(0.95, 1.05)
+    ocv = OCV_START - (OCV_START - OCV_END) * depth
+    drop = np.where(is_pulse, level_ma * INTERNAL_RESISTANCE_KOHM * (1 + 0.5 * depth), 0.0)
+    voltage = np.round(ocv - drop + rng.normal(0, VOLTAGE_NOISE, spec.rows), 4)
+
+    # 循环号：行均分到各循环；步内电荷（mAh）在每个步骤开头清零
+    cycle = rows * spec.cycles // spec.rows + 1
+    step_start = np.r_[True, (is_pulse[1:] != is_pulse[:-1]) | (cycle[1:] != cycle[:-1])]
+    step_id = np.cumsum(step_start) - 1
+    sample_charge = np.abs(current_ma) * SAMPLE_SECONDS / 3600
+    total = np.cumsum(sample_charge)
+    step_base = (total - sample_charge)[step_start][step_id]
+    charge = np.round(total - step_base, 6)
+    return {"cycle": cycle, "step": is_pulse.astype(np.int8), "current": np.round(current_ma / 1000, 6),
+            "voltage": voltage, "charge": charge}
+
+
+def write_workbook(path: str, spec: WorkbookSpec, index: int) -> None:
+    """生成第 index 个电池的 xlsx（Cycle / Step / Record 三表）
+
+    每个工作表首行为电池名、第 2 行为列名，数据从第 3 行开始（与分析流程的读取约定一致）。
+    """
+    columns = record_columns(spec, index)
+    battery_name = f"SYN_{index + 1:04d}"
+    cycle, is_pulse, charge = columns["cycle"], columns["step"], columns["charge"]
+
+    # 按 (循环, 步骤) 汇总：每段连续的同类行为一个步骤，其电荷为段末值
+    step_end = np.r_[(is_pulse[1:] != is_pulse[:-1]) | (cycle[1:] != cycle[:-1]), True]
+    cycle_charge = np.zeros(spec.cycles + 1)
+    np.add.at(cycle_charge, cycle[step_end], charge[step_end])
+    first_row = np.searchsorted(cycle, np.arange(1, spec.cycles + 1))
+    last_row = np.searchsorted(cycle, np.arange(1, spec.cycles + 1), side="right") - 1
+    start = datetime.datetime(2025, 6, 10, 8, 0, 0)
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws_cycle = wb.create_sheet("Cycle")
+    ws_cycle.append([battery_name, "", "", ""])
+    ws_cycle.append(["Cycle#", "CycleBegin", "CycleEnd", "Charge"])
+    for c in range(1, spec.cycles + 1):
+        begin = start + datetime.timedelta(seconds=float(first_row[c - 1]) * SAMPLE_SECONDS)
+        end = start + datetime.timedelta(seconds=float(last_row[c - 1] + 1) * SAMPLE_SECONDS)
+        ws_cycle.append([c, begin.strftime("%Y-%m-%d %H:%M:%S"), end.strftime("%Y-%m-%d %H:%M:%S"),
+                         round(float(cycle_charge[c]), 6)])
+
+    ws_step = wb.create_sheet("Step")
+    ws_step.append([battery_name, "", ""])
+    ws_step.append(["Cycle#", "Step#", "Charge"])
+    for row in np.flatnonzero(step_end).tolist():
+        ws_step.append([int(cycle[row]), "脉冲" if is_pulse[row] else "Rest", float(charge[row])])
+
+    ws_record = wb.create_sheet("Record")
+    ws_record.append([battery_name, "", "", "", ""])
+    ws_record.append(["Cycle#", "Step#", "Current", "Voltage", "Charge"])
+    step_names = ("Rest", "脉冲")
+    for row in zip(cycle.tolist(), is_pulse.tolist(), columns["current"].tolist(),
+                   columns["voltage"].tolist(), charge.tolist()):
+        ws_record.append([row[0], step_names[row[1]], row[2], row[3], row[4]])
+    wb.save(path)
+
+
+def workbook_name(index: int) -> str:
+    # 文件名末尾的数字组为测试日期，供 extract_test_date_from_xls 解析
+    return f"cell{index + 1:04d}_{TEST_DATE}.xlsx"
+
+
+def generate_dataset(out_dir: str, spec: WorkbookSpec) -> list:
+    """在 out_dir 下生成 spec 描述的数据集；参数一致的已有数据集直接复用
+
+    Returns:
+        生成（或复用）的 xlsx 路径列表
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    paths = [os.path.join(out_dir, workbook_name(i)) for i in range(spec.files)]
+    spec_path = os.path.join(out_dir, SPEC_FILE)
+    try:
+        with open(spec_path, "r", encoding="utf-8") as f:
+            if json.load(f) == spec.to_dict() and all(os.path.isfile(p) for p in paths):
+                return paths
+    except (OSError, ValueError):
+        pass
+
+    if os.path.exists(spec_path):
+        os.remove(spec_path)
+    for i, path in enumerate(paths):
+        write_workbook(path, spec, i)
+    # 全部写完后才记录参数，生成中断的数据集下次会重新生成
+    with open(spec_path, "w", encoding="utf-8") as f:
+        json.dump(spec.to_dict(), f, indent=2)
+    return paths
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate deterministic synthetic battery workbooks.")
+    parser.add_argument("out_dir", help="output directory")
+    parser.add_argument("--files", type=int, default=1, help="number of workbooks (batteries)")
+    parser.add_argument("--rows", type=int, default=1000, help="Record rows per workbook")
+    parser.add_argument("--cycles", type=int, default=10, help="cycles per workbook")
+    parser.add_argument("--levels", default=",".join(map(str, DEFAULT_CURRENT_LEVELS)),
+                        help="comma separated current levels in mA")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args(argv)
+
+    spec = WorkbookSpec(files=args.files, rows=args.rows, cycles=args.cycles, seed=args.seed,
+                        current_levels=tuple(int(v) for v in args.levels.split(",") if v.strip()))
+    for path in generate_dataset(args.out_dir, spec):
+        print(path)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,288 @@
+"""
+命令行入口（无图形界面）
+
+在构建服务器等无显示环境中运行完整的"分析 → 报告"流程，输出布局与 GUI 一致。
+不导入任何 PyQt 模块，启动快，可同时对多个目录各启动一个进程。
+
+示例::
+
+    battery-analysis-cli data/2_xlsx -o "data/3_analysis results" --test-info info.json -j 8
+    battery-analysis-cli data/2_xlsx -o out --test-info info.json --set version=2 --formats csv,xlsx --no-plots
+    battery-analysis-cli --batch campaigns.json -o out -j 8
+    battery-analysis-cli data/2_xlsx -o out --test-info info.json --svg lazy
+    battery-analysis-cli --render-svg out/20250610_v1
+
+测试信息 JSON 为 TestInfo 字段名 → 值的对象（或 19 项位置列表），可额外包含
+"equipment" 对象作为 Word 报告中的测试设备信息。批量任务文件格式见 _load_campaigns，
+由 utils.batch_scheduler 共享一个进程池调度，中断后重新运行会跳过已完成的批次。
+--svg lazy 只记录 SVG 的绘图参数，之后用 --render-svg 按需生成。
+结果目录中总会写出各阶段耗时 timings.json；--trace 另写出可在 chrome://tracing
+或 Perfetto 中打开的 trace.json。
+"""
+
+import argparse
+import dataclasses
+import json
+import logging
+import multiprocessing
+import os
+import sys
+
+from battery_analysis.domain.entities.test_info import TestInfo
+from battery_analysis.utils.constants import REPORT_FORMATS, SVG_MODES
+
+# 以逗号分隔的数值列表形式出现在 --set 中的字段
+_LEVEL_FIELDS = {"current_levels": int, "voltage_levels": float}
+
+# 运行分析必须提供的字段
+_REQUIRED_FIELDS = ("current_levels", "voltage_levels", "version")
+
+# --no-plots 时不可生成的格式（docx 引用绘制的图片）
+_PLOT_FORMATS = ("png", "svg", "docx")
+
+
+def _parse_level_list(text: str, cast) -> list:
+    return [cast(item) for item in text.split(",") if item.strip()]
+
+
+def _load_test_info(path: str | None, overrides: list, loaded=None) -> tuple:
+    """读取测试信息 JSON 并应用 --set 覆盖
+
+    Args:
+        path: 测试信息 JSON 路径
+        overrides: "字段=值" 列表
+        loaded: 已解析的测试信息（对象或位置列表），提供时不读取 path
+
+    Returns:
+        (TestInfo, 设备信息字典)
+
+    Raises:
+        ValueError: 文件内容或覆盖项无效
+        OSError: 文件无法读取
+    """
+    data, equipment = {}, {}
+    if loaded is None and path:
+        with open(path, "r", encoding="utf-8") as f:
+            loaded = json.load(f)
+    if isinstance(loaded, list):
+        data = dataclasses.asdict(TestInfo.from_list(loaded))
+    elif isinstance(loaded, dict):
+        data = dict(loaded)
+        equipment = data.pop("equipment", None) or {}
+    elif loaded is not None:
+        raise ValueError(f"{path or 'test info'}: expected a JSON object or list")
+
+    field_names = {f.name for f in dataclasses.fields(TestInfo)}
+    for item in overrides:
+        name, sep, value = item.partition("=")
+        name = name.strip()
+        if not sep:
+            raise ValueError(f"--set expects FIELD=VALUE, got {item!r}")
+        data[name] = _parse_level_list(value, _LEVEL_FIELDS[name]) if name in _LEVEL_FIELDS else value
+
+    unknown = sorted(set(data) - field_names)
+    if unknown:
+        raise ValueError(f"Unknown test info fields: {', '.join(unknown)}")
+    test_info = TestInfo(**data)
+    test_info.version = str(test_info.version)
+    missing = [name for name in _REQUIRED_FIELDS if not getattr(test_info, name)]
+    if missing:
+        raise ValueError(f"Missing required test info fields: {', '.join(missing)}")
+    return test_info, equipment
+
+
+def _load_campaigns(path: str, default_output: str | None, overrides: list, formats: list,
+                    svg_mode: str = "eager") -> list:
+    """读取批量任务文件
+
+    文件为批次对象列表（或 {"campaigns": [...]}），每项包含 input_dir、
+    output_dir（缺省取 --output）、test_info（对象或 JSON 路径），可选 name、
+    equipment、formats。相对路径相对于任务文件所在目录。
+
+    Raises:
+        ValueError: 文件内容无效
+        OSError: 文件无法读取
+    """
+    from battery_analysis.utils.batch_scheduler import Campaign
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    with open(path, "r", encoding="utf-8") as f:
+        loaded = json.load(f)
+    entries = loaded.get("campaigns") if isinstance(loaded, dict) else loaded
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{path}: expected a non-empty list of campaigns")
+
+    campaigns = []
+    for number, entry in enumerate(entries, start=1):
+        if not isinstance(entry, dict) or "input_dir" not in entry:
+            raise ValueError(f"{path}: campaign #{number} needs an input_dir")
+        output_dir = entry.get("output_dir") or default_output
+        if not output_dir:
+            raise ValueError(f"{path}: campaign #{number} needs an output_dir (or pass --output)")
+        info = entry.get("test_info")
+        info_path = os.path.join(base_dir, info) if isinstance(info, str) else None
+        test_info, equipment = _load_test_info(info_path, overrides, None if info_path else info)
+        campaign_formats = entry.get("formats", formats)
+        if isinstance(campaign_formats, str):
+            campaign_formats = _parse_formats(campaign_formats)
+        campaigns.append(Campaign(
+            input_dir=os.path.join(base_dir, entry["input_dir"]),
+            output_dir=os.path.join(base_dir, output_dir),
+            test_info=test_info,
+            name=entry.get("name", ""),
+            equipment_info=entry.get("equipment") or equipment,
+            formats=tuple(campaign_formats),
+            svg_mode=svg_mode,
+        ))
+    return campaigns
+
+
+def _parse_formats(text: str) -> list:
+    formats = [item.strip().lower() for item in text.split(",") if item.strip()]
+    unknown = sorted(set(formats).difference(REPORT_FORMATS))
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown format(s) {', '.join(unknown)}; choose from {', '.join(REPORT_FORMATS)}")
+    return formats
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="battery-analysis-cli",
+        description="Analyze a directory of battery test workbooks and write the reports (no GUI).")
+    parser.add_argument("input_dir", nargs="?", help="directory containing the .xlsx test data")
+    parser.add_argument("-o", "--output", help="output root directory")
+    parser.add_argument("-b", "--batch", metavar="JSON",
+                        help="analyze every campaign listed in this file, sharing one worker pool")
+    parser.add_argument("--state", metavar="JSON",
+                        help="batch resume state (default: <batch file>.state.json)")
+    parser.add_argument("-t", "--test-info", metavar="JSON",
+                        help="test info JSON (TestInfo field names, optional 'equipment' object)")
+    parser.add_argument("-s", "--set", dest="overrides", action="append", default=[], metavar="FIELD=VALUE",
+                        help="override a TestInfo field; levels are comma separated (repeatable)")
+    parser.add_argument("-j", "--jobs", type=int, default=0,
+                        help="worker processes for per-file analysis (0 = automatic: sized from CPU "
+                             "count, current load and free memory, at most 8; 1 = in-process)")
+    parser.add_argument("--formats", type=_parse_formats, default=None,
+                        help=f"comma separated report formats (default: {','.join(REPORT_FORMATS)})")
+    parser.add_argument("--svg", choices=SVG_MODES, default="eager",
+                        help="eager: draw SVGs with the reports; lazy: only record them for --render-svg")
+    parser.add_argument("--render-svg", metavar="RESULT_DIR",
+                        help="draw the SVGs recorded by an earlier --svg lazy run and exit")
+    parser.add_argument("--no-plots", action="store_true",
+                        help="skip chart rendering (implies no png/svg/docx; xlsx is written without charts)")
+    parser.add_argument("--no-incremental", action="store_true",
+                        help="re-analyze every file instead of reusing the previous result manifest")
+    parser.add_argument("--trace", action="store_true",
+                        help="also write a Chrome trace (trace.json) next to timings.json in the result directory")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not print progress")
+    parser.add_argument("-v", "--verbose", action="store_true", help="enable debug logging")
+    return parser
+
+
+def main(argv=None) -> int:
+    """命令行入口，返回进程退出码（0 成功，1 分析或报告失败，2 参数错误）"""
+    multiprocessing.freeze_support()
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(logging.DEBUG if args.verbose else logging.WARNING)
+
+    if args.jobs < 0:
+        parser.error("--jobs must be >= 0")
+    formats = list(REPORT_FORMATS) if args.formats is None else args.formats
+    if args.no_plots:
+        if args.formats is not None and set(args.formats) & set(_PLOT_FORMATS):
+            parser.error("--no-plots cannot be combined with png, svg or docx formats")
+        formats = [fmt for fmt in formats if fmt not in _PLOT_FORMATS]
+    if sum(map(bool, (args.input_dir, args.batch, args.render_svg))) != 1:
+        parser.error("pass exactly one of an input directory, --batch or --render-svg")
+    if args.input_dir and not args.output:
+        parser.error("--output is required")
+    try:
+        if args.batch:
+            campaigns = _load_campaigns(args.batch, args.output, args.overrides, formats, args.svg)
+        elif args.input_dir:
+            test_info, equipment = _load_test_info(args.test_info, args.overrides)
+    except (OSError, ValueError, TypeError, argparse.ArgumentTypeError) as e:
+        parser.error(str(e))
+
+    from battery_analysis.utils.task_executor import TaskExecutor
+    from battery_analysis.utils.worker_pool import get_worker_pool
+
+    if args.jobs > 1:
+        # 启动前设定共享进程池大小；执行器只限制并发，不再调整进程池
+        get_worker_pool().resize(args.jobs)
+    executor = TaskExecutor("serial") if args.jobs == 1 else TaskExecutor("process", max_workers=args.jobs or None)
+
+    if args.render_svg:
+        return _render_svg(args.render_svg, executor)
+    if args.batch:
+        return _run_batch(args, campaigns, executor)
+
+    from battery_analysis.utils.analysis_pipeline import run_analysis_pipeline
+
+    def _print_progress(value, status):
+        print(f"[{value:3d}%] {status}", file=sys.stderr, flush=True)
+
+    result = run_analysis_pipeline(
+        args.input_dir, args.output, test_info,
+        executor=executor,
+        incremental=not args.no_incremental,
+        formats=formats,
+        equipment_info=equipment,
+        svg_mode=args.svg,
+        progress_callback=None if args.quiet else _print_progress,
+        trace=args.trace or None,
+    )
+    if result.analysis_error:
+        print(f"Analysis failed: {result.analysis_error}", file=sys.stderr)
+        return 1
+    if result.report_error:
+        print(f"Report generation failed: {result.report_error}", file=sys.stderr)
+        return 1
+    print(result.result_dir)
+    return 0
+
+
+def _render_svg(result_dir: str, executor) -> int:
+    """生成 --svg lazy 时记录的 SVG，逐行输出生成的文件路径"""
+    from battery_analysis.utils.report_coordinator import render_deferred_svgs
+
+    try:
+        paths = render_deferred_svgs(result_dir, executor=executor)
+    except (OSError, ValueError) as e:
+        print(f"SVG rendering failed: {e}", file=sys.stderr)
+        return 1
+    if not paths:
+        print(f"No deferred SVGs in {result_dir}", file=sys.stderr)
+    for path in paths:
+        print(path)
+    return 0
+
+
+def _run_batch(args, campaigns: list, executor) -> int:
+    """运行批量任务：每个批次一行结果（状态、名称、结果目录或错误），任一批次失败时返回 1"""
+    from battery_analysis.utils.batch_scheduler import STATUS_FAILED, BatchScheduler
+
+    def _print_progress(campaign_result, status):
+        print(f"[{campaign_result.campaign.name}] {status}", file=sys.stderr, flush=True)
+
+    try:
+        scheduler = BatchScheduler(
+            campaigns, executor=executor, incremental=not args.no_incremental,
+            state_path=args.state or f"{os.path.splitext(args.batch)[0]}.state.json",
+            progress_callback=None if args.quiet else _print_progress)
+    except ValueError as e:
+        print(f"Invalid batch: {e}", file=sys.stderr)
+        return 2
+
+    results = scheduler.run()
+    for result in results:
+        detail = result.error if result.status == STATUS_FAILED else result.pipeline.result_dir
+        print(f"{result.status}\t{result.campaign.name}\t{detail}")
+    return 1 if any(result.status == STATUS_FAILED for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
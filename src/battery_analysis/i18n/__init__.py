@@ -9,10 +9,12 @@ All public API symbols are exposed at module level so callers can just:
 
 import logging
 import sys
+import threading
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
-from battery_analysis.i18n.translator import SimplePOTranslator
+from battery_analysis.i18n.translator import SimplePOTranslator, load_catalog
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +29,9 @@ logger.info("Using locale directory: %s", LOCALEDIR)
 # Global state
 _current_locale: str = "en"
 _po_translator = SimplePOTranslator()
+# Catalogs being loaded in the background by preload_locale()
+_preloaded: Dict[str, Future] = {}
+_preload_lock = threading.Lock()
 
 
 # ── Internal ──────────────────────────────────────────────────────
@@ -35,11 +40,25 @@ _po_translator = SimplePOTranslator()
 def _load_locale(locale_code: str) -> bool:
     """Load translations for *locale_code* into the global translator."""
     global _current_locale
-    if _po_translator.load_locale(locale_code, LOCALEDIR):
-        _current_locale = locale_code
-        logger.info("Locale set to: %s", locale_code)
-        return True
-    return False
+    with _preload_lock:
+        pending = _preloaded.pop(locale_code, None)
+    if pending is not None:
+        catalog = pending.result()
+        if catalog is None:
+            return False
+        _po_translator.install_catalog(locale_code, catalog)
+    elif not _po_translator.load_locale(locale_code, LOCALEDIR):
+        return False
+    _current_locale = locale_code
+    logger.info("Locale set to: %s", locale_code)
+    return True
+
+
+def _preload_worker(locale_code: str, future: Future) -> None:
+    try:
+        future.set_result(load_catalog(locale_code, LOCALEDIR))
+    except Exception as exc:  # pylint: disable=broad-except
+        future.set_exception(exc)
 
 
 # ── Public API (stable contract for all callers) ──────────────────
@@ -106,6 +125,31 @@ def set_locale(locale_code: str) -> bool:
         return False
 
 
+def preload_locale(locale_code: str) -> None:
+    """Start loading *locale_code*'s catalog in a background thread.
+
+    A following :func:`set_locale` for the same locale picks up the result
+    (waiting for it if still loading) instead of reading the file itself.
+    """
+    from battery_analysis.i18n.locale_utils import (
+        get_available_locales as _get_available,
+        resolve_locale_code,
+    )
+
+    valid_locale = resolve_locale_code(locale_code, _get_available(LOCALEDIR))
+    if valid_locale is None or valid_locale == _current_locale:
+        return
+    with _preload_lock:
+        if valid_locale in _preloaded:
+            return
+        future: Future = Future()
+        _preloaded[valid_locale] = future
+    threading.Thread(
+        target=_preload_worker, args=(valid_locale, future),
+        name=f"i18n-preload-{valid_locale}", daemon=True,
+    ).start()
+
+
 def get_current_locale() -> str:
     """Return the currently active locale code."""
     return _current_locale
@@ -1,13 +1,25 @@
-"""Simple .po file translator — built on Python standard library gettext"""
+"""Simple .po file translator — built on Python standard library gettext
 
+Parsed catalogs are cached as ``marshal`` files under the persistent cache
+directory (``<cache root>/i18n``), keyed by the .po file's path, mtime and
+size.  Startup and locale switches load the cache and only fall back to
+parsing the .po text when it is missing or stale.
+"""
+
+import os
 import re
 import gettext
 import logging
+import marshal
+import tempfile
 from pathlib import Path
 from typing import Callable, Dict, List, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+# Bump when the cached catalog layout changes; older cache files are ignored.
+CATALOG_CACHE_FORMAT = 1
+
 
 # ── Plural-formula compiler ────────────────────────────────────────
 
@@ -31,7 +43,7 @@ def _compile_plural_formula(formula: str) -> Callable[[int], int]:
     if "?" not in formula:
         py = formula.replace("&&", " and ").replace("||", " or ")
         try:
-            return eval(f"lambda n: int({py})", {"__builtins__": {}}, {})
+            return eval(f"lambda n: int({py})", {"__builtins__": {}, "int": int}, {})
         except (SyntaxError, NameError, TypeError) as exc:
             logger.warning("Cannot compile simple plural formula %r: %s", formula, exc)
             return lambda _n: 0
@@ -39,7 +51,7 @@ def _compile_plural_formula(formula: str) -> Callable[[int], int]:
     # ---- C ternary → Python conditional expression -----------------
     try:
         py = _c_ternary_to_python(formula)
-        return eval(f"lambda n: int({py})", {"__builtins__": {}}, {})
+        return eval(f"lambda n: int({py})", {"__builtins__": {}, "int": int}, {})
     except (SyntaxError, NameError, TypeError) as exc:
         logger.warning("Cannot compile complex plural formula %r: %s", formula, exc)
         return lambda _n: 0
@@ -126,6 +138,7 @@ class SimplePOTranslator(gettext.NullTranslations):
             Union[str, tuple], Tuple[str, List[str]]
         ] = {}
         self._nplurals: int = 1
+        self._plural_formula: str = ""
         self._plural_fn: Callable[[int], int] = lambda _n: 0
         self.current_locale: str = "en"
         super().__init__(fp)
@@ -171,6 +184,7 @@ class SimplePOTranslator(gettext.NullTranslations):
             self._nplurals = int(match.group(1))
             formula = match.group(2).strip()
             logger.debug("Plural-Forms: nplurals=%d, plural=%s", self._nplurals, formula)
+            self._plural_formula = formula
             self._plural_fn = _compile_plural_formula(formula)
 
     # ── Entry-block helpers ─────────────────────────────────────────
@@ -239,30 +253,39 @@ class SimplePOTranslator(gettext.NullTranslations):
     def translations(self, value: Dict[Union[str, tuple], str]) -> None:
         self._catalog = value
 
-    def load_locale(self, locale_code: str, localedir: Path) -> bool:
-        """Load translations for *locale_code* from *localedir*."""
-        po_file = Path(localedir) / locale_code / "LC_MESSAGES" / "messages.po"
-        if not po_file.exists():
-            logger.warning("Translation file not found: %s", po_file)
-            return False
-        self._catalog.clear()
-        self._plurals_catalog.clear()
-        try:
-            with open(po_file, "r", encoding="utf-8") as f:
-                self._parse(f)
-            self.current_locale = locale_code
-            logger.info(
-                "Loaded %d translations + %d plural entries for %s",
-                len(self._catalog),
-                len(self._plurals_catalog),
-                locale_code,
-            )
-            return True
-        except (IOError, UnicodeDecodeError) as exc:
-            logger.error("Failed to load %s: %s", po_file, exc)
-            self._catalog.clear()
-            self._plurals_catalog.clear()
+    def load_locale(self, locale_code: str, localedir: Path,
+                    cache_dir: Optional[Path] = None) -> bool:
+        """Load translations for *locale_code* from *localedir*.
+
+        A fresh compiled catalog in *cache_dir* (default: ``<cache root>/i18n``)
+        is used when available; otherwise the .po file is parsed and the
+        result cached for the next start.
+        """
+        catalog = load_catalog(locale_code, localedir, cache_dir)
+        if catalog is None:
             return False
+        self.install_catalog(locale_code, catalog)
+        return True
+
+    def install_catalog(self, locale_code: str, catalog: tuple) -> None:
+        """Activate a catalog returned by :func:`load_catalog`."""
+        translations, plurals, nplurals, formula = catalog
+        self._catalog = translations
+        self._plurals_catalog = plurals
+        self._nplurals = nplurals
+        self._plural_formula = formula
+        self._plural_fn = _compile_plural_formula(formula) if formula else (lambda _n: 0)
+        self.current_locale = locale_code
+        logger.info(
+            "Loaded %d translations + %d plural entries for %s",
+            len(self._catalog),
+            len(self._plurals_catalog),
+            locale_code,
+        )
+
+    def _snapshot(self) -> tuple:
+        """The parsed state in the layout stored by the catalog cache."""
+        return (self._catalog, self._plurals_catalog, self._nplurals, self._plural_formula)
 
     # ── Standard gettext API ───────────────────────────────────────
 
@@ -297,3 +320,72 @@ class SimplePOTranslator(gettext.NullTranslations):
         # Note: the public ngettext() API does not accept a context,
         # but the catalog may hold context-qualified plural entries.
         return msgid1 if n == 1 else msgid2
+
+
+# ── Catalog loading / caching ──────────────────────────────────────
+
+
+def default_catalog_cache_dir() -> Path:
+    """Directory holding compiled catalogs (``<cache root>/i18n``)."""
+    from battery_analysis.utils.cache_paths import default_cache_root
+
+    return default_cache_root() / "i18n"
+
+
+def load_catalog(locale_code: str, localedir: Path,
+                 cache_dir: Optional[Path] = None) -> Optional[tuple]:
+    """Load the catalog for *locale_code*; safe to call from a worker thread.
+
+    Returns:
+        ``(translations, plurals, nplurals, plural_formula)`` for
+        :meth:`SimplePOTranslator.install_catalog`, or ``None`` when the
+        .po file is missing or unreadable.
+    """
+    po_file = Path(localedir) / locale_code / "LC_MESSAGES" / "messages.po"
+    if not po_file.exists():
+        logger.warning("Translation file not found: %s", po_file)
+        return None
+    try:
+        stat = po_file.stat()
+        key = (CATALOG_CACHE_FORMAT, str(po_file.resolve()), stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        key = None
+    cache_file = Path(cache_dir or default_catalog_cache_dir()) / f"{locale_code}.marshal"
+
+    if key is not None:
+        try:
+            with open(cache_file, "rb") as f:
+                cached_key, catalog = marshal.load(f)
+            if cached_key == key:
+                return catalog
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+    parser = SimplePOTranslator()
+    try:
+        with open(po_file, "r", encoding="utf-8") as f:
+            parser._parse(f)  # pylint: disable=protected-access
+    except (IOError, UnicodeDecodeError) as exc:
+        logger.error("Failed to load %s: %s", po_file, exc)
+        return None
+    catalog = parser._snapshot()  # pylint: disable=protected-access
+    if key is not None:
+        _write_catalog_cache(cache_file, key, catalog)
+    return catalog
+
+
+def _write_catalog_cache(cache_file: Path, key: tuple, catalog: tuple) -> None:
+    """Atomically write a compiled catalog; failures only cost the next start a parse."""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+    except OSError as exc:
+        logger.debug("Cannot write catalog cache %s: %s", cache_file, exc)
+        return
+    try:
+        with os.fdopen(fd, "wb") as f:
+            marshal.dump((key, catalog), f)
+        os.replace(tmp_path, cache_file)
+    except (OSError, ValueError) as exc:
+        logger.debug("Cannot write catalog cache %s: %s", cache_file, exc)
+        Path(tmp_path).unlink(missing_ok=True)
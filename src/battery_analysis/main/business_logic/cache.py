@@ -1,8 +1,19 @@
 """
-LRU (Least Recently Used) 缓存实现
+LRU (Least Recently Used) 缓存实现，以及按文件状态（路径、大小、mtime）失效的缓存
 """
 
+import json
+import logging
+import os
+import tempfile
+import threading
 from collections import OrderedDict
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# StatKeyedCache 持久层保留的条目数
+DEFAULT_MAX_PERSISTED = 5000
 
 
 class LRUCache:
@@ -37,3 +48,120 @@ class LRUCache:
 
     def __contains__(self, key):
         return key in self.cache
+
+
+def file_stat_key(path):
+    """返回 (绝对路径, 大小, mtime_ns)；路径不存在时返回 None
+
+    文件被覆盖或目录中增删文件（目录 mtime 随之变化）后键即改变，旧条目不会再命中。
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
+
+
+class StatKeyedCache:
+    """以 file_stat_key 为键的 LRU 缓存，可选 JSON 持久层
+
+    同一路径可按 tag 区分多个条目（如同一目录下不同的文件名模式）。内存层按 max_size 淘汰；persist_path 不为 None 时，内存未命中会查持久层，
+    put 的结果在 flush() 时原子写回磁盘，重启后仍可命中。值需可 JSON 序列化
+    （元组读回为列表，无法序列化的对象按 str 保存）。
+    """
+
+    def __init__(self, max_size=100, persist_path=None, max_persisted=DEFAULT_MAX_PERSISTED):
+        self._memory = LRUCache(max_size)
+        self.persist_path = Path(persist_path) if persist_path else None
+        self.max_persisted = max_persisted
+        self._persisted = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _persist_key(key):
+        return "\x00".join(map(str, key))
+
+    def _load_persisted(self):
+        if self._persisted is None:
+            self._persisted = OrderedDict()
+            if self.persist_path is not None and self.persist_path.exists():
+                try:
+                    with open(self.persist_path, 'r', encoding='utf-8') as f:
+                        self._persisted.update(json.load(f))
+                except (OSError, ValueError) as e:
+                    logger.warning("Discarding unreadable cache file %s: %s", self.persist_path, e)
+        return self._persisted
+
+    def get(self, path, tag=None):
+        key = file_stat_key(path)
+        if key is None:
+            return None
+        key += (tag,)
+        with self._lock:
+            value = self._memory.get(key)
+            if value is None and self.persist_path is not None:
+                value = self._load_persisted().get(self._persist_key(key))
+                if value is not None:
+                    self._memory.put(key, value)
+            return value
+
+    def put(self, path, value, tag=None):
+        key = file_stat_key(path)
+        if key is None:
+            return
+        key += (tag,)
+        with self._lock:
+            self._memory.put(key, value)
+            if self.persist_path is not None:
+                persisted = self._load_persisted()
+                persist_key = self._persist_key(key)
+                persisted.pop(persist_key, None)
+                persisted[persist_key] = value
+                while len(persisted) > self.max_persisted:
+                    persisted.popitem(last=False)
+                self._dirty = True
+
+    def remove(self, path):
+        """删除某路径的所有条目（任意大小 / mtime / tag）"""
+        abs_path = os.path.abspath(path)
+        prefix = abs_path + "\x00"
+        with self._lock:
+            for key in [k for k in self._memory.cache if k[0] == abs_path]:
+                self._memory.remove(key)
+            if self.persist_path is not None:
+                persisted = self._load_persisted()
+                for key in [k for k in persisted if k.startswith(prefix)]:
+                    del persisted[key]
+                    self._dirty = True
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self.persist_path is not None:
+                self._persisted = OrderedDict()
+                self._dirty = True
+
+    def flush(self):
+        """把持久层写回磁盘（无改动时不写）"""
+        with self._lock:
+            if self.persist_path is None or not self._dirty:
+                return
+            data = dict(self._persisted)
+            self._dirty = False
+        try:
+            self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(suffix=".json.tmp", dir=self.persist_path.parent)
+        except OSError as e:
+            logger.warning("Failed to create cache directory for %s: %s", self.persist_path, e)
+            return
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, default=str)
+            os.replace(tmp_path, self.persist_path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Failed to write cache file %s: %s", self.persist_path, e)
+            Path(tmp_path).unlink(missing_ok=True)
+
+    def __len__(self):
+        return len(self._memory)
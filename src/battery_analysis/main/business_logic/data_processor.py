@@ -6,16 +6,39 @@
 
 import logging
 import os
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, wait
 from PyQt6 import QtWidgets as QW
 from PyQt6 import QtCore as QC
 
 from battery_analysis.i18n.language_manager import _
-from battery_analysis.main.business_logic.cache import LRUCache
+from battery_analysis.main.business_logic.cache import StatKeyedCache
 from battery_analysis.main.business_logic.background_worker import BackgroundWorker
 from battery_analysis.main.business_logic import excel_validator
 from battery_analysis.main.business_logic import filename_parser
-from battery_analysis.utils.processors.excel_processor import optimize_dataframe_memory, read_excel_file, analyze_single_excel
+from battery_analysis.utils.processors.excel_processor import read_excel_file, analyze_single_excel
+from battery_analysis.utils.readers.sheet_cache import default_cache_root
+from battery_analysis.utils.resource_manager import ResourceManager
+from battery_analysis.utils.task_executor import TaskExecutor
+from battery_analysis.utils.worker_pool import get_worker_pool
+
+
+def _submit_limited(pool, fn, file_paths):
+    """逐个提交 fn(路径) 并按完成顺序产出 (路径, 结果)
+
+    同时在途的任务数取 ResourceManager.recommend 的建议，避免多个大文件同时被解析。
+    """
+    limit = ResourceManager.recommend(file_paths).workers
+    pending, in_flight = iter(file_paths), {}
+    while True:
+        for file_path in pending:
+            in_flight[pool.submit(fn, file_path)] = file_path
+            if len(in_flight) >= limit:
+                break
+        if not in_flight:
+            return
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield in_flight.pop(future), future.result()
 
 
 class _MainThreadCallback(QC.QObject):
@@ -46,18 +69,26 @@ class DataProcessor:
     MAX_EXCEL_CACHE_SIZE = 50
     MAX_DIRECTORY_CACHE_SIZE = 20
     MAX_VALIDATION_CACHE_SIZE = 100
+    # 选择目录后并发探测 Excel 文件的线程数
+    MAX_PROBE_WORKERS = 4
 
     def __init__(self, main_window=None, ctx=None):
         self.main_window = main_window
         self._ctx = ctx
         self.logger = logging.getLogger(__name__)
+        # 缓存以 (路径, 大小, mtime_ns) 为键：文件被覆盖、目录增删文件后自动失效；
+        # 目录列表与探测结果另存磁盘，重启后重新打开同一目录无需再读取工作簿
+        persist_dir = default_cache_root() / "validation"
         self._cache = {
-            'excel_files': LRUCache(self.MAX_EXCEL_CACHE_SIZE),
-            'directory_files': LRUCache(self.MAX_DIRECTORY_CACHE_SIZE),
-            'file_validation': LRUCache(self.MAX_VALIDATION_CACHE_SIZE),
+            'excel_files': StatKeyedCache(self.MAX_EXCEL_CACHE_SIZE),
+            'directory_files': StatKeyedCache(self.MAX_DIRECTORY_CACHE_SIZE,
+                                              persist_dir / "directory_files.json"),
+            'file_validation': StatKeyedCache(self.MAX_VALIDATION_CACHE_SIZE,
+                                              persist_dir / "file_validation.json"),
         }
         self._background_thread = None
         self._background_worker = None
+        self._watcher = None
 
     def _invalidate_cache(self, path=None):
         if path:
@@ -68,6 +99,26 @@ class DataProcessor:
         else:
             for c in self._cache.values():
                 c.clear()
+        self._flush_cache()
+
+    def _flush_cache(self):
+        for c in self._cache.values():
+            c.flush()
+
+    def _watch_input_directory(self, input_dir, excel_files):
+        """监视输入目录及其中的 xlsx：增删、改名或覆盖文件时立即丢弃对应缓存"""
+        if self._watcher is None:
+            self._watcher = QC.QFileSystemWatcher()
+            self._watcher.directoryChanged.connect(self._on_watched_path_changed)
+            self._watcher.fileChanged.connect(self._on_watched_path_changed)
+        watched = self._watcher.directories() + self._watcher.files()
+        if watched:
+            self._watcher.removePaths(watched)
+        self._watcher.addPaths([input_dir] + [os.path.join(input_dir, f) for f in excel_files])
+
+    def _on_watched_path_changed(self, path):
+        self.logger.debug("Watched path changed, invalidating cache: %s", path)
+        self._invalidate_cache(path)
 
     def clear_cache(self):
         self._invalidate_cache()
@@ -130,18 +181,21 @@ class DataProcessor:
             if not listAllInXlsx:
                 return []
 
-            from battery_analysis.utils.resource_manager import ResourceManager
             excel_data = []
-            optimal_count = ResourceManager.get_optimal_process_count()
-            actual_count = min(optimal_count, len(listAllInXlsx))
-
-            with ProcessPoolExecutor(max_workers=actual_count) as executor:
-                futures = {executor.submit(self.process_excel_with_pandas, os.path.join(directory, f)): f
-                           for f in listAllInXlsx}
-                for future in as_completed(futures):
-                    info = future.result()
-                    if info:
-                        excel_data.append(info)
+            pool = get_worker_pool()
+            uncached = []
+            for f in listAllInXlsx:
+                file_path = os.path.join(directory, f)
+                cached_info = self._cache['excel_files'].get(file_path)
+                if cached_info is not None:
+                    excel_data.append(cached_info)
+                else:
+                    uncached.append(file_path)
+            # 提交模块级函数（绑定方法携带 Qt 对象无法 pickle），结果回到主进程缓存
+            for file_path, info in _submit_limited(pool, read_excel_file, uncached):
+                if info:
+                    self._cache['excel_files'].put(file_path, info)
+                    excel_data.append(info)
             return excel_data
         except Exception:
             excel_data = []
@@ -152,18 +206,51 @@ class DataProcessor:
                         excel_data.append(info)
             return excel_data
 
-    def _scan_excel_files_task(self, input_dir, **kwargs):
-        return [f for f in os.listdir(input_dir) if f[:2] != "~$" and f[-5:] == ".xlsx"]
+    def _scan_excel_files_task(self, input_dir, excel_files=None, **kwargs):
+        """后台任务：列出目录中的 xlsx（已缓存时沿用）并探测各文件"""
+        if excel_files is None:
+            excel_files = [f for f in os.listdir(input_dir) if f[:2] != "~$" and f[-5:] == ".xlsx"]
+        return excel_files, self._probe_excel_files(input_dir, excel_files)
+
+    def _probe_excel_files(self, input_dir, excel_files) -> dict:
+        """并发探测未缓存的文件（只读表头与前若干行），返回 {文件名: (是否有效, 错误消息, 文件信息)}
 
-    def _on_scan_finished(self, excel_files):
+        探测结果写入 file_validation 缓存；读取失败（OSError，如文件被 Excel 锁定）
+        可能是暂时的，不缓存，下次选择目录时重新探测。
+        """
+        results = {}
+        pending = []
+        for filename in excel_files:
+            cached = self._cache['file_validation'].get(os.path.join(input_dir, filename))
+            if cached is not None:
+                results[filename] = cached
+            else:
+                pending.append(filename)
+
+        errors = {}
+        outcomes = TaskExecutor("thread", max_workers=self.MAX_PROBE_WORKERS).map(
+            lambda filename: excel_validator.probe_excel_file(os.path.join(input_dir, filename), filename),
+            pending, on_error=lambda idx, e: errors.setdefault(idx, e))
+        for idx, (filename, outcome) in enumerate(zip(pending, outcomes)):
+            if outcome is None:
+                outcome = (False, f"Failed to read Excel file: {filename} - {errors.get(idx)}", None)
+            else:
+                self._cache['file_validation'].put(os.path.join(input_dir, filename), outcome)
+            results[filename] = outcome
+        return results
+
+    def _on_scan_finished(self, result):
+        excel_files, probes = result
         input_dir = self.main_window.lineEdit_InputPath.text()
         self._cache['directory_files'].put(input_dir, excel_files)
+        self._cache['directory_files'].flush()
+        self._watch_input_directory(input_dir, excel_files)
 
         if not excel_files:
             self._handle_no_excel_files(input_dir)
             return
 
-        excel_data = self._process_excel_files(input_dir, excel_files)
+        excel_data = self._process_excel_files(input_dir, excel_files, probes)
         if not excel_data:
             self.logger.error("No Excel files were processed successfully")
             if hasattr(self.main_window, 'checker_input_xlsx'):
@@ -202,14 +289,12 @@ class DataProcessor:
                 self.main_window.statusBar_BatteryAnalysis.showMessage(f"[Error]: {error_msg.split(':')[0]}")
             return
 
-        cached = self._cache['directory_files'].get(input_dir)
-        if cached is None:
-            if hasattr(self.main_window, 'statusBar_BatteryAnalysis'):
-                self.main_window.statusBar_BatteryAnalysis.showMessage("Scanning Excel files...")
-            self.run_in_background(self._scan_excel_files_task, self._on_scan_finished,
-                                   self._on_scan_error, input_dir)
-        else:
-            self._on_scan_finished(cached)
+        # 目录列表与文件探测都在后台线程完成，界面不再因逐个读取工作簿而卡住
+        if hasattr(self.main_window, 'statusBar_BatteryAnalysis'):
+            self.main_window.statusBar_BatteryAnalysis.showMessage("Scanning Excel files...")
+        self.run_in_background(self._scan_excel_files_task, self._on_scan_finished,
+                               self._on_scan_error, input_dir,
+                               excel_files=self._cache['directory_files'].get(input_dir))
 
     def _disconnect_specification_signals(self):
         try:
@@ -244,25 +329,19 @@ class DataProcessor:
             self.main_window.statusBar_BatteryAnalysis.showMessage(
                 _("[Error]: Input path has no data"))
 
-    def _process_excel_files(self, input_dir, excel_files):
+    def _process_excel_files(self, input_dir, excel_files, probes=None):
+        if probes is None:
+            probes = self._probe_excel_files(input_dir, excel_files)
         excel_data = []
         error_files = []
         for filename in excel_files:
-            file_path = os.path.join(input_dir, filename)
-            is_valid, error_msg, df = excel_validator.validate_excel_file(
-                file_path, filename, self._cache['file_validation'], optimize_dataframe_memory)
+            is_valid, error_msg, file_info = probes[filename]
             if not is_valid:
                 self.logger.error(error_msg)
                 error_files.append((filename, error_msg))
                 continue
-            file_info = {
-                'filename': filename,
-                'sheet_name': df.columns.tolist(),
-                'row_count': len(df),
-                'column_count': len(df.columns),
-                'first_five_rows': df.head().to_dict('records'),
-            }
             excel_data.append(file_info)
+        self._flush_cache()
 
         if error_files:
             error_message = "The following files have issues:\n" + "\n".join(f"- {f}: {m}" for f, m in error_files)
@@ -403,22 +482,14 @@ class DataProcessor:
                                            _("No Excel files found."))
                 return
 
-            from battery_analysis.utils.resource_manager import ResourceManager
             all_data = []
-            optimal_count = ResourceManager.get_optimal_process_count()
-            actual_count = min(optimal_count, len(excel_files))
-
-            with ProcessPoolExecutor(max_workers=actual_count) as executor:
-                futures = {
-                    executor.submit(analyze_single_excel, os.path.join(input_path, f), f): f
-                    for f in excel_files
-                }
-                for future in as_completed(futures):
-                    result = future.result()
-                    if 'error' in result:
-                        self.logger.error("Analysis failed %s: %s", result['filename'], result['error'])
-                    else:
-                        all_data.append(result)
+            pool = get_worker_pool()
+            file_paths = [os.path.join(input_path, f) for f in excel_files]
+            for _path, result in _submit_limited(pool, analyze_single_excel, file_paths):
+                if 'error' in result:
+                    self.logger.error("Analysis failed %s: %s", result['filename'], result['error'])
+                else:
+                    all_data.append(result)
 
             summary = {
                 'total_files': len(excel_files),
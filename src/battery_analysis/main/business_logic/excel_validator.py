@@ -3,8 +3,10 @@ Excel文件验证模块
 """
 
 import logging
+import os
 import pandas as pd
 from battery_analysis.utils.file_validator import FileValidator
+from battery_analysis.utils.readers.xlsx_reader import probe_xlsx
 
 
 logger = logging.getLogger(__name__)
@@ -69,48 +71,45 @@ def validate_excel_file_content(df, filename):
     return True, ""
 
 
-def validate_excel_file(file_path, filename, cache, optimize_dataframe_memory):
+def probe_excel_file(file_path, filename):
     """
-    验证Excel文件的有效性
+    轻量验证Excel文件：只读取工作表名、首个工作表的行列数和前若干行
+
+    按 validate_excel_file_content 判定，但不读取整表，供选择目录后填充界面使用。
+    不访问缓存，可在工作线程中并发调用。
 
     Returns:
-        tuple: (是否有效, 错误消息, 数据框)
-    """
-    cache_key = f"{file_path}:{filename}"
-    cached_result = cache.get(cache_key)
-    if cached_result is not None:
-        logger.debug("Reading file validation result from cache: %s", cache_key)
-        return cached_result
+        tuple: (是否有效, 错误消息, 文件信息字典)
 
+    Raises:
+        OSError: 无法读取文件（如被 Excel 锁定）；这类失败可能是暂时的，
+            不应与文件名、格式、内容错误一样按文件状态缓存
+    """
     validator = FileValidator()
 
     is_valid, error_msg = validate_excel_filename(filename)
+    if is_valid:
+        is_valid, error_msg = validator.validate_file_not_empty(file_path)
     if not is_valid:
-        result = (False, error_msg, None)
-        cache.put(cache_key, result)
-        return result
-
-    is_valid, error_msg = validator.validate_file_not_empty(file_path)
-    if not is_valid:
-        result = (False, error_msg, None)
-        cache.put(cache_key, result)
-        return result
+        return False, error_msg, None
 
     try:
-        df = pd.read_excel(file_path, sheet_name=0, engine='calamine', header=0)
-        df = optimize_dataframe_memory(df)
-
-        is_valid, error_msg = validate_excel_file_content(df, filename)
-        if not is_valid:
-            result = (False, error_msg, None)
-            cache.put(cache_key, result)
-            return result
-
-        result = (True, "", df)
-        cache.put(cache_key, result)
-        return result
-
+        probe = probe_xlsx(file_path)
+    except OSError:
+        raise
     except Exception as e:
-        result = (False, f"Failed to read Excel file: {filename} - {str(e)}", None)
-        cache.put(cache_key, result)
-        return result
+        return False, f"Failed to read Excel file: {filename} - {str(e)}", None
+
+    preview = probe['preview']
+    is_valid, error_msg = validate_excel_file_content(preview, filename)
+    if not is_valid:
+        return False, error_msg, None
+
+    return True, "", {
+        'filename': os.path.basename(filename),
+        'sheet_names': probe['sheet_names'],
+        'sheet_name': preview.columns.tolist(),
+        'row_count': probe['row_count'],
+        'column_count': probe['column_count'],
+        'first_five_rows': preview.head().to_dict('records'),
+    }
@@ -215,6 +215,9 @@ class Main(QW.QMainWindow, ui_main_window.Ui_MainWindow):
             except Exception:
                 logging.getLogger(__name__).exception("Failed to log environment info")
 
+            # 4e) 空闲时预热常驻进程池，首次分析无需等待子进程启动
+            QC.QTimer.singleShot(2000, self._warm_up_worker_pool)
+
             self.logger.info("  Phase [%s] completed ✓", PHASE_LAUNCH)
 
             elapsed = (time.time() - t0) * 1000
@@ -222,6 +225,20 @@ class Main(QW.QMainWindow, ui_main_window.Ui_MainWindow):
         except Exception as e:
             logging.getLogger(__name__).exception("Background initialization error: %s", e)
 
+    def _warm_up_worker_pool(self) -> None:
+        """启动共享进程池并预导入分析模块（配置 worker_pool.warm_up 可关闭）"""
+        try:
+            config = self._get_service("config")
+            if config and not config.get_config_value("worker_pool.warm_up", True):
+                return
+            from battery_analysis.utils.worker_pool import get_worker_pool
+            pool = get_worker_pool()
+            if config:
+                pool.resize(int(config.get_config_value("worker_pool.max_workers", 0) or 0) or None)
+            pool.warm_up()
+        except Exception as e:
+            self.logger.warning("Failed to warm up worker pool: %s", e)
+
     # ------------------------------
     # 服务和控制器获取方法
     # ------------------------------
@@ -604,6 +621,10 @@ def main(app=None, splash=None) -> None:
     window = Main(splash=splash)
     window.setMinimumSize(800, 600)
 
+    # 退出时回收常驻进程池
+    from battery_analysis.utils.worker_pool import shutdown_worker_pool
+    app.aboutToQuit.connect(shutdown_worker_pool)
+
     # 运行应用程序事件循环
     try:
         result = app.exec()
@@ -11,25 +11,25 @@ import shutil
 from typing import Optional, List, Dict, Any, Tuple, Union
 from pathlib import Path
 
+from battery_analysis.main.business_logic.cache import StatKeyedCache
+
 
 class FileService:
     """
     文件服务实现
     """
+
+    MAX_CACHE_SIZE = 1000
+    _CACHE_TYPES = ('list_files', 'get_file_size', 'is_file_hidden', 'get_directory_info', 'get_file_info')
     
     def __init__(self):
         """
         初始化文件服务
         """
         self.logger = logging.getLogger(__name__)
-        # 初始化缓存，用于存储文件系统操作结果
-        self._cache = {
-            'list_files': {},
-            'get_file_size': {},
-            'is_file_hidden': {},
-            'get_directory_info': {},
-            'get_file_info': {}
-        }
+        # 初始化缓存，用于存储文件系统操作结果；
+        # 键为 (路径, 大小, mtime_ns)，文件被修改或目录增删文件后旧条目不再命中
+        self._cache = {name: StatKeyedCache(self.MAX_CACHE_SIZE) for name in self._CACHE_TYPES}
     
     def _invalidate_cache(self, path=None):
         """
@@ -39,34 +39,16 @@ class FileService:
             path: 可选的路径，用于更精确地失效缓存
         """
         if path:
-            # 失效与特定路径相关的缓存
-            path_str = str(path)
-            for cache_type in self._cache:
-                if cache_type == 'list_files':
-                    # 失效包含此路径的目录列表缓存
-                    keys_to_remove = []
-                    for key in self._cache[cache_type]:
-                        if path_str in key:
-                            keys_to_remove.append(key)
-                    for key in keys_to_remove:
-                        del self._cache[cache_type][key]
-                elif cache_type in ['get_file_size', 'is_file_hidden', 'get_file_info']:
-                    # 失效特定文件的缓存
-                    if path_str in self._cache[cache_type]:
-                        del self._cache[cache_type][path_str]
-                elif cache_type == 'get_directory_info':
-                    # 失效特定目录的缓存
-                    if path_str in self._cache[cache_type]:
-                        del self._cache[cache_type][path_str]
+            # 失效特定路径及其所在目录（目录列表 / 目录信息）的缓存
+            parent = os.path.dirname(os.path.abspath(path))
+            for cache_type, cache in self._cache.items():
+                cache.remove(path)
+                if cache_type in ('list_files', 'get_directory_info'):
+                    cache.remove(parent)
         else:
             # 完全清空缓存
-            self._cache = {
-                'list_files': {},
-                'get_file_size': {},
-                'is_file_hidden': {},
-                'get_directory_info': {},
-                'get_file_info': {}
-            }
+            for cache in self._cache.values():
+                cache.clear()
     
     def clear_cache(self):
         """
@@ -148,12 +130,10 @@ class FileService:
             List[str]: 文件名列表
         """
         try:
-            # 构建缓存键
-            cache_key = f"{str(directory)}:{pattern}"
-            
-            # 检查缓存
-            if cache_key in self._cache['list_files']:
-                return self._cache['list_files'][cache_key]
+            # 检查缓存（同一目录按文件名模式区分）
+            cached = self._cache['list_files'].get(directory, tag=pattern)
+            if cached is not None:
+                return cached
             
             dir_path = Path(directory)
             if not dir_path.exists() or not dir_path.is_dir():
@@ -166,7 +146,7 @@ class FileService:
                 files = [f.name for f in dir_path.iterdir() if f.is_file()]
             
             # 缓存结果
-            self._cache['list_files'][cache_key] = files
+            self._cache['list_files'].put(directory, files, tag=pattern)
             
             return files
             
@@ -185,17 +165,16 @@ class FileService:
             Optional[int]: 文件大小，失败返回None
         """
         try:
-            file_path_str = str(file_path)
-            
             # 检查缓存
-            if file_path_str in self._cache['get_file_size']:
-                return self._cache['get_file_size'][file_path_str]
+            cached = self._cache['get_file_size'].get(file_path)
+            if cached is not None:
+                return cached
             
             path = Path(file_path)
             if path.exists() and path.is_file():
                 size = path.stat().st_size
                 # 缓存结果
-                self._cache['get_file_size'][file_path_str] = size
+                self._cache['get_file_size'].put(file_path, size)
                 return size
             else:
                 return None
@@ -218,8 +197,9 @@ class FileService:
             file_path_str = str(file_path)
             
             # 检查缓存
-            if file_path_str in self._cache['is_file_hidden']:
-                return self._cache['is_file_hidden'][file_path_str]
+            cached = self._cache['is_file_hidden'].get(file_path)
+            if cached is not None:
+                return cached
             
             import win32api
             import win32con
@@ -229,7 +209,7 @@ class FileService:
             hidden = bool(attrs & win32con.FILE_ATTRIBUTE_HIDDEN)
             
             # 缓存结果
-            self._cache['is_file_hidden'][file_path_str] = hidden
+            self._cache['is_file_hidden'].put(file_path, hidden)
             
             return hidden
             
@@ -395,8 +375,9 @@ class FileService:
         """
         try:
             # 检查缓存
-            if directory in self._cache['get_directory_info']:
-                return self._cache['get_directory_info'][directory]
+            cached = self._cache['get_directory_info'].get(directory)
+            if cached is not None:
+                return cached
             
             dir_path = Path(directory)
             if not dir_path.exists():
@@ -414,7 +395,7 @@ class FileService:
             }
             
             # 缓存结果
-            self._cache['get_directory_info'][directory] = info
+            self._cache['get_directory_info'].put(directory, info)
             
             return info
             
@@ -434,8 +415,9 @@ class FileService:
         """
         try:
             # 检查缓存
-            if file_path in self._cache['get_file_info']:
-                return self._cache['get_file_info'][file_path]
+            cached = self._cache['get_file_info'].get(file_path)
+            if cached is not None:
+                return cached
             
             path = Path(file_path)
             if not path.exists():
@@ -455,7 +437,7 @@ class FileService:
             }
             
             # 缓存结果
-            self._cache['get_file_info'][file_path] = info
+            self._cache['get_file_info'].put(file_path, info)
             
             return info
             
@@ -24,6 +24,7 @@ class Services:
     file: Any = None
     progress: Any = None
     validation: Any = None
+    worker_pool: Any = None
     application: Any = None
     main_controller: Any = None
     file_controller: Any = None
@@ -35,6 +36,7 @@ class Services:
         "file": "file",
         "progress": "progress",
         "validation": "validation",
+        "worker_pool": "worker_pool",
         "main_controller": "main_controller",
         "file_controller": "file_controller",
         "validation_controller": "validation_controller",
@@ -78,12 +80,15 @@ class ServiceContainer:
         from battery_analysis.main.services.file_service import FileService
         from battery_analysis.main.services.progress_service import ProgressService
         from battery_analysis.main.services.validation_service import ValidationService
+        from battery_analysis.utils.worker_pool import get_worker_pool
 
         self._impl.config = ConfigService()
         self._impl.environment = EnvironmentService()
         self._impl.file = FileService()
         self._impl.progress = ProgressService()
         self._impl.validation = ValidationService()
+        # 进程池为进程内单例，分析/验证/报告直接调用 get_worker_pool() 时拿到同一实例
+        self._impl.worker_pool = get_worker_pool()
 
         # 3) 创建可能回调容器的服务（此时 _impl 已有叶子服务，get("file") 等正常返回）
         from battery_analysis.main.controllers.file_controller import FileController
@@ -13,7 +13,9 @@ import PyQt6.QtCore as QC
 import PyQt6.QtGui as QG
 import PyQt6.QtWidgets as QW
 
-from battery_analysis.i18n import _, get_available_locales, set_locale, get_current_locale
+from battery_analysis.i18n import (
+    _, get_available_locales, set_locale, get_current_locale, preload_locale,
+)
 from battery_analysis.i18n.language_manager import get_language_manager
 from battery_analysis.main.ui_components.config_path_provider import IConfigPathProvider
 
@@ -157,6 +159,8 @@ class PreferencesDialog(QW.QDialog):
         lang_selection_layout.addWidget(QW.QLabel(_("Select Language:")))
         self.language_combo = QW.QComboBox()
         self._populate_language_combo()
+        # 选中语言时即在后台加载其翻译，点击应用时无需再读取文件
+        self.language_combo.currentIndexChanged.connect(self._preload_selected_language)
         lang_selection_layout.addWidget(self.language_combo)
         lang_selection_layout.addStretch()
         language_group_layout.addLayout(lang_selection_layout)
@@ -349,6 +353,12 @@ class PreferencesDialog(QW.QDialog):
                 self.language_combo.setCurrentIndex(i)
                 break
     
+    def _preload_selected_language(self, index: int):
+        """Load the selected language's catalog in the background"""
+        locale_code = self.language_combo.itemData(index)
+        if locale_code:
+            preload_locale(locale_code)
+
     def _create_buttons(self, main_layout):
         """Create dialog buttons"""
         button_layout = QW.QHBoxLayout()
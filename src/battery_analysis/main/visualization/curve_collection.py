@@ -0,0 +1,132 @@
+"""
+曲线集合模块
+
+查看器中一种过滤模式（原始 / 过滤后）的全部电池曲线：每个电流等级一个
+LineCollection，而不是每个电池 × 电流等级一个 Line2D。数百个电池时艺术家
+数量从数千降到个位数，构建与重绘耗时大幅下降。
+
+单条曲线的显示 / 隐藏通过集合的逐线段颜色透明度实现；某个电流等级的曲线
+全部隐藏时整个 LineCollection 不参与绘制。CurveHandle 提供与 Line2D 相同的
+get_visible / set_visible / get_xdata / get_ydata / get_label 接口，
+交互控件与悬停索引按原有的"电池主序曲线列表"使用它们。
+
+绘制的线段按视图选择细节层级（见 lod）：缩小时使用 M4 降采样，放大到
+降采样不够细时切回全分辨率。句柄的 x / y 数据始终为全分辨率，悬停不受影响。
+"""
+
+import logging
+
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
+
+from battery_analysis.main.visualization.lod import CurveLODPyramid
+from battery_analysis.utils.writers.plot_utils import curve_segments
+
+logger = logging.getLogger(__name__)
+
+
+class CurveHandle:
+    """单条曲线（电池 × 电流等级）的 Line2D 风格句柄"""
+
+    __slots__ = ("_owner", "battery", "level")
+
+    def __init__(self, owner, battery: int, level: int):
+        self._owner = owner
+        self.battery = battery
+        self.level = level
+
+    def get_visible(self) -> bool:
+        return bool(self._owner.visible[self.level, self.battery])
+
+    def set_visible(self, visible: bool) -> None:
+        self._owner.set_curve_visible(self.battery, self.level, visible)
+
+    def get_xdata(self):
+        return self._owner.segments[self.level][self.battery][:, 0]
+
+    def get_ydata(self):
+        return self._owner.segments[self.level][self.battery][:, 1]
+
+    def get_label(self):
+        return [self._owner.battery_names[self.battery], self._owner.mode]
+
+
+class BatteryCurveCollection:
+    """一种过滤模式下全部电池的曲线
+
+    Args:
+        ax: 目标坐标轴
+        list_x: [电流等级][电池] → x 序列
+        list_y: [电流等级][电池] → y 序列
+        colors: 各电流等级的颜色
+        battery_names: 电池名称（决定电池数）
+        mode: 曲线标签中的模式名（"Filtered" / "Unfiltered"）
+        visible: 初始可见性
+        linewidth: 线宽
+    """
+
+    def __init__(self, ax, list_x, list_y, colors, battery_names, mode: str,
+                 visible: bool = True, linewidth: float = 0.5):
+        self.battery_names = list(battery_names)
+        self.mode = mode
+        battery_num = len(self.battery_names)
+        level_num = len(list_x)
+        self.visible = np.full((level_num, battery_num), bool(visible))
+
+        self.segments = []
+        self.collections = []
+        self._rgba = []
+        # 各电流等级的降采样金字塔（首次需要时构建）与当前层级（None 为全分辨率）
+        self._pyramids = [None] * level_num
+        self._detail = [None] * level_num
+        self._view = None
+        for c in range(level_num):
+            segments = curve_segments(list_x[c][:battery_num], list_y[c][:battery_num])
+            # 数据缺失的电池补空线段，保持曲线索引与电池一一对应
+            segments.extend(np.empty((0, 2)) for _ in range(battery_num - len(segments)))
+            rgba = np.tile(to_rgba(colors[c]), (battery_num, 1))
+            collection = LineCollection(segments, colors=rgba, linewidths=linewidth)
+            ax.add_collection(collection, autolim=False)
+            self.segments.append(segments)
+            self.collections.append(collection)
+            self._rgba.append(rgba)
+            self._apply_visibility(c)
+
+        # 电池主序：handles[b * level_num + c]
+        self.handles = [CurveHandle(self, b, c) for b in range(battery_num) for c in range(level_num)]
+
+    def set_curve_visible(self, battery: int, level: int, visible: bool) -> None:
+        if self.visible[level, battery] != bool(visible):
+            self.visible[level, battery] = bool(visible)
+            self._apply_visibility(level)
+
+    def _apply_visibility(self, level: int) -> None:
+        """把可见性写入该电流等级的逐线段透明度"""
+        mask = self.visible[level]
+        rgba = self._rgba[level]
+        rgba[:, 3] = mask
+        collection = self.collections[level]
+        collection.set_color(rgba)
+        collection.set_visible(bool(mask.any()))
+        self._refresh_detail(level)
+
+    def update_detail(self, view_min: float, view_max: float, pixel_width: float) -> None:
+        """视图（x 范围或画布宽度）变化后，为可见的电流等级切换细节层级"""
+        self._view = (view_min, view_max, pixel_width)
+        for level in range(len(self.collections)):
+            self._refresh_detail(level)
+
+    def _refresh_detail(self, level: int) -> None:
+        # 隐藏的集合不绘制，等到显示时再构建 / 切换
+        if self._view is None or not self.collections[level].get_visible():
+            return
+        pyramid = self._pyramids[level]
+        if pyramid is None:
+            pyramid = self._pyramids[level] = CurveLODPyramid(self.segments[level])
+            logger.debug("%s LOD for current level %d: %s", self.mode, level,
+                         [bins for bins, _ in pyramid.levels])
+        detail = pyramid.select(*self._view)
+        if detail != self._detail[level]:
+            self.collections[level].set_segments(pyramid.segments_for(detail))
+            self._detail[level] = detail
@@ -6,16 +6,32 @@
 
 import logging
 import os
-import csv
 import json
 import traceback
 from pathlib import Path
 
+import numpy as np
+
 from battery_analysis.utils.processors.data_utils import build_plot_title
+from battery_analysis.utils.readers.info_image_reader import load_info_image
 
 logger = logging.getLogger(__name__)
 
 
+def _as_float_array(values) -> np.ndarray:
+    """转换为 float 数组；无法转换的元素为 NaN"""
+    try:
+        return np.asarray(values, dtype=float)
+    except (ValueError, TypeError):
+        out = np.empty(len(values))
+        for i, value in enumerate(values):
+            try:
+                out[i] = float(value)
+            except (ValueError, TypeError):
+                out[i] = np.nan
+        return out
+
+
 class DataLoaderMixin:
     """数据加载混入类，提供数据加载、解析和过滤方法"""
 
@@ -214,19 +230,15 @@ class DataLoaderMixin:
 
             self._initialize_data_structures()
 
-            with open(csv_path, mode='r', encoding='utf-8') as f:
-                csvreader = csv.reader(f)
-                # 流式计数替代 list() 全量读，避免大文件内存翻倍（all_rows 只用于行数检查）
-                row_count = sum(1 for _ in csvreader)
-                if row_count < 5:
-                    logger.error(
-                        "Error: CSV file %s has insufficient data rows", self.strInfoImageCsvPath)
-                    self.intBatteryNum = 0
-                    return
+            # 单次读取并解析为数组；文件未变化时直接复用缓存结果
+            info_image = load_info_image(self.strInfoImageCsvPath, self.intCurrentLevelNum)
+            if info_image.row_count < 5:
+                logger.error(
+                    "Error: CSV file %s has insufficient data rows", self.strInfoImageCsvPath)
+                self.intBatteryNum = 0
+                return
 
-                f.seek(0)
-                csvreader = csv.reader(f)
-                self._process_csv_data(csvreader)
+            self._process_csv_data(info_image)
 
             self.intBatteryNum = len(self.listBatteryName)
 
@@ -282,33 +294,15 @@ class DataLoaderMixin:
             for _ in range(4):
                 self.listPlt[c].append([])
 
-    def _process_csv_data(self, csvreader):
-        """处理CSV数据并填充到数据结构中"""
-        intPerBatteryRows = 1 + self.intCurrentLevelNum * 3
-        index = 0
+    def _process_csv_data(self, info_image):
+        """把 load_info_image 的解析结果填充到数据结构中
 
-        for row in csvreader:
-            loop = index % intPerBatteryRows
-            if loop == 0:
-                if len(row) > 1:
-                    self.listBatteryName.append(row[1].strip())
-            else:
-                if (loop % 3) != 1:
-                    try:
-                        current_idx = int((loop - 1) / 3)
-                        data_idx = ((loop - 1) % 3) - 1
-                        if 0 <= current_idx < self.intCurrentLevelNum and 0 <= data_idx < 4:
-                            float_data = []
-                            for i in range(len(row)):
-                                try:
-                                    float_data.append(float(row[i]))
-                                except ValueError:
-                                    continue
-                            if float_data:
-                                self.listPlt[current_idx][data_idx].append(float_data)
-                    except IndexError as e:
-                        logger.warning("Error parsing CSV row data: %s, skipping this row", e)
-            index += 1
+        空的电荷/电压行不计入（与逐行解析时跳过无数值行的行为一致）。
+        """
+        self.listBatteryName.extend(info_image.battery_names)
+        for c in range(min(self.intCurrentLevelNum, len(info_image.charge))):
+            self.listPlt[c][0].extend(a for a in info_image.charge[c] if len(a))
+            self.listPlt[c][1].extend(a for a in info_image.voltage[c] if len(a))
 
     def _parse_battery_names(self):
         """解析电池名称，提取有意义的标识符"""
@@ -333,46 +327,37 @@ class DataLoaderMixin:
 
     def filter_data(self, list_plt_charge, list_plt_voltage,
                     times=5, slope_max=0.2, difference_max=0.05):
-        """过滤数据以去除异常值和噪声"""
+        """过滤数据以去除异常值和噪声
+
+        每轮保留与前一个原始点之间斜率小于 slope_max 且电压差小于 difference_max
+        的点（首点总是保留），共 times 轮。每轮只比较相邻点，因此整轮用数组掩码完成；
+        无法转换为数值的点按 NaN 处理，与其相邻的点对不保留。
+        """
         filtered_charge = []
         filtered_voltage = []
 
         for p in range(len(list_plt_charge)):
             charge_single = list_plt_charge[p]
             voltage_single = list_plt_voltage[p]
-            current_times = times
-
-            while current_times > 0:
-                charge_temp = [charge_single[0]]
-                voltage_temp = [voltage_single[0]]
-
-                for c in range(1, len(charge_single)):
-                    try:
-                        charge_curr = float(charge_single[c])
-                        charge_prev = float(charge_single[c - 1])
-                        voltage_curr = float(voltage_single[c])
-                        voltage_prev = float(voltage_single[c - 1])
-
-                        charge_diff = charge_curr - charge_prev
-                        if charge_diff == 0:
-                            slope = slope_max
-                        else:
-                            voltage_diff = voltage_curr - voltage_prev
-                            slope = abs(voltage_diff / charge_diff)
-
-                        voltage_diff_abs = abs(voltage_diff)
-                        if slope < slope_max and voltage_diff_abs < difference_max:
-                            charge_temp.append(charge_curr)
-                            voltage_temp.append(voltage_curr)
-                    except (ValueError, TypeError):
-                        continue
-
-                charge_single = charge_temp
-                voltage_single = voltage_temp
-                current_times -= 1
-
-            filtered_charge.append(charge_single)
-            filtered_voltage.append(voltage_single)
+            if len(voltage_single) < len(charge_single):
+                raise IndexError(f"curve {p}: fewer voltage than charge points")
+            # 首点保留原值，其余点输出为 float
+            first_charge, first_voltage = charge_single[0], voltage_single[0]
+            charge = _as_float_array(charge_single)
+            voltage = _as_float_array(voltage_single)[:len(charge)]
+
+            for _ in range(times):
+                charge_diff = np.diff(charge)
+                voltage_diff = np.diff(voltage)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    slope = np.abs(voltage_diff / charge_diff)
+                keep = np.ones(len(charge), dtype=bool)
+                keep[1:] = ((charge_diff != 0) & (slope < slope_max)
+                            & (np.abs(voltage_diff) < difference_max))
+                charge, voltage = charge[keep], voltage[keep]
+
+            filtered_charge.append([first_charge] + charge[1:].tolist())
+            filtered_voltage.append([first_voltage] + voltage[1:].tolist())
 
         return filtered_charge, filtered_voltage
 
@@ -12,6 +12,7 @@ import matplotlib
 import matplotlib.pyplot as plt
 from matplotlib.ticker import MultipleLocator
 
+from battery_analysis.main.visualization.curve_collection import BatteryCurveCollection
 from battery_analysis.main.visualization.styling import MODERN_BUTTON_STYLE
 from battery_analysis.utils.constants import CN_FONT_LIST
 
@@ -54,39 +55,37 @@ class FigureBuilderMixin:
         return fig, ax, title_fontdict, axis_fontdict
 
     def _plot_battery_curves(self, ax):
-        """绘制所有电池的原始和过滤后的曲线"""
-        lines_unfiltered = []
-        lines_filtered = []
-
-        for b in range(self.intBatteryNum):
-            for c in range(self.intCurrentLevelNum):
-                try:
-                    ul, = ax.plot(
-                        self.listPlt[c][0][b],
-                        self.listPlt[c][1][b],
-                        color=self.listColor[c] if c < len(
-                            self.listColor) else f'C{c}',
-                        label=[f'{self.listBatteryNameSplit[b]}',
-                               'Unfiltered'],
-                        visible=False,
-                        linewidth=0.5
-                    )
-                    lines_unfiltered.append(ul)
-
-                    fl, = ax.plot(
-                        self.listPlt[c][2][b],
-                        self.listPlt[c][3][b],
-                        color=self.listColor[c] if c < len(
-                            self.listColor) else f'C{c}',
-                        label=[f'{self.listBatteryNameSplit[b]}', 'Filtered'],
-                        visible=True,
-                        linewidth=0.5
-                    )
-                    lines_filtered.append(fl)
-                except (IndexError, ValueError, TypeError, AttributeError) as e:
-                    logger.error("Error plotting curve for battery %s, current level %s: %s", b, c, e)
-
-        return lines_unfiltered, lines_filtered
+        """绘制所有电池的原始和过滤后的曲线
+
+        每种过滤模式、每个电流等级一个 LineCollection（见 curve_collection），
+        返回按电池主序（b * 电流等级数 + c）排列的曲线句柄列表。
+        """
+        colors = [self.listColor[c] if c < len(self.listColor) else f'C{c}'
+                  for c in range(self.intCurrentLevelNum)]
+        names = self.listBatteryNameSplit[:self.intBatteryNum]
+        levels = self.listPlt[:self.intCurrentLevelNum]
+
+        self.curve_collections = {
+            'unfiltered': BatteryCurveCollection(
+                ax, [level[0] for level in levels], [level[1] for level in levels],
+                colors, names, 'Unfiltered', visible=False),
+            'filtered': BatteryCurveCollection(
+                ax, [level[2] for level in levels], [level[3] for level in levels],
+                colors, names, 'Filtered', visible=True),
+        }
+        self._connect_curve_detail(ax)
+        return self.curve_collections['unfiltered'].handles, self.curve_collections['filtered'].handles
+
+    def _connect_curve_detail(self, ax):
+        """缩放 / 平移 / 窗口大小变化时按可见 x 范围与像素宽度切换曲线细节层级"""
+        def update_detail(*_args):
+            view_min, view_max = ax.get_xlim()
+            for collection in self.curve_collections.values():
+                collection.update_detail(view_min, view_max, ax.bbox.width)
+
+        ax.callbacks.connect('xlim_changed', update_detail)
+        ax.figure.canvas.mpl_connect('resize_event', update_detail)
+        update_detail()
 
     def _show_error_plot(self, title=None, main_message=None, details=None, allow_file_selection=True):
         """显示详细的错误信息图表"""
@@ -203,7 +202,7 @@ class FigureBuilderMixin:
                     try:
                         if c < len(self.listPlt) and b < len(self.listPlt[c][1]):
                             voltage_data = self.listPlt[c][1][b]
-                            if voltage_data:
+                            if len(voltage_data):
                                 current_min = min(voltage_data)
                                 current_max = max(voltage_data)
                                 y_min = min(y_min, current_min)
@@ -211,7 +210,7 @@ class FigureBuilderMixin:
 
                         if c < len(self.listPlt) and b < len(self.listPlt[c][3]):
                             filtered_voltage_data = self.listPlt[c][3][b]
-                            if filtered_voltage_data:
+                            if len(filtered_voltage_data):
                                 current_min = min(filtered_voltage_data)
                                 current_max = max(filtered_voltage_data)
                                 y_min = min(y_min, current_min)
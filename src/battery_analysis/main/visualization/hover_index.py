@@ -0,0 +1,111 @@
+"""
+悬停命中测试模块
+
+把所有可见曲线的数据点一次性变换到显示坐标（像素），按均匀网格分桶后排序存放；
+悬停时只检查鼠标所在网格及相邻 8 个网格中的点，单次查询与曲线数、点数基本无关。
+视图（缩放 / 平移 / 窗口大小）或曲线可见性变化后索引失效，需重新构建。
+"""
+
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class HoverPointIndex:
+    """显示坐标下的均匀网格点索引
+
+    Args:
+        lines: 参与命中测试的曲线（matplotlib Line2D），不可见的曲线被忽略
+        transform: 数据坐标 → 显示坐标的变换（通常为 ax.transData）
+        radius: 命中半径（像素），同时作为网格边长
+    """
+
+    def __init__(self, lines, transform, radius: float):
+        self.lines = list(lines)
+        self.radius = float(radius)
+
+        xy_parts, line_parts, point_parts = [], [], []
+        for line_idx, line in enumerate(self.lines):
+            if not line.get_visible():
+                continue
+            try:
+                x_data = np.asarray(line.get_xdata(), dtype=np.float64)
+                y_data = np.asarray(line.get_ydata(), dtype=np.float64)
+            except (TypeError, ValueError):
+                continue
+            count = min(len(x_data), len(y_data))
+            if count == 0:
+                continue
+            xy = transform.transform(np.column_stack((x_data[:count], y_data[:count])))
+            finite = np.isfinite(xy).all(axis=1)
+            xy_parts.append(xy[finite])
+            line_parts.append(np.full(int(finite.sum()), line_idx, dtype=np.int32))
+            point_parts.append(np.flatnonzero(finite).astype(np.int32))
+
+        if xy_parts:
+            xy = np.concatenate(xy_parts)
+            line_ids = np.concatenate(line_parts)
+            point_ids = np.concatenate(point_parts)
+        else:
+            xy = np.empty((0, 2))
+            line_ids = point_ids = np.empty(0, dtype=np.int32)
+
+        self._cell = max(self.radius, 1.0)
+        if len(xy):
+            cells = np.floor(xy / self._cell).astype(np.int64)
+            self._origin = cells.min(axis=0)
+            cells -= self._origin
+            self._rows = int(cells[:, 1].max()) + 3
+        else:
+            cells = np.empty((0, 2), dtype=np.int64)
+            self._origin = np.zeros(2, dtype=np.int64)
+            self._rows = 3
+
+        # 按网格编号排序，查询时用 searchsorted 取出各网格的连续区间
+        keys = self._keys(cells[:, 0], cells[:, 1])
+        order = np.argsort(keys, kind='stable')
+        self._keys_sorted = keys[order]
+        self._xy = xy[order]
+        self._line_ids = line_ids[order]
+        self._point_ids = point_ids[order]
+
+    def __len__(self):
+        return len(self._xy)
+
+    def _keys(self, col, row):
+        # 列 / 行各偏移 1，使相邻网格（-1）编号仍为非负且互不重叠
+        return (col + 1) * self._rows + (row + 1)
+
+    def query(self, x: float, y: float):
+        """查找距 (x, y)（显示坐标）最近且在命中半径内的点
+
+        Returns:
+            (曲线, 点序号, 数据 x, 数据 y)；无命中时返回 None
+        """
+        if not len(self._xy):
+            return None
+        col, row = (np.floor(np.array([x, y]) / self._cell).astype(np.int64) - self._origin)
+        if row < -1 or row > self._rows - 2:
+            return None
+
+        candidates = []
+        for d_col in (-1, 0, 1):
+            first = self._keys(col + d_col, row - 1)
+            lo, hi = np.searchsorted(self._keys_sorted, [first, first + 3])
+            if hi > lo:
+                candidates.append(np.arange(lo, hi))
+        if not candidates:
+            return None
+
+        candidates = np.concatenate(candidates)
+        dist2 = ((self._xy[candidates] - (x, y)) ** 2).sum(axis=1)
+        best = int(np.argmin(dist2))
+        if dist2[best] > self.radius ** 2:
+            return None
+
+        hit = candidates[best]
+        line = self.lines[self._line_ids[hit]]
+        point = int(self._point_ids[hit])
+        return line, point, float(line.get_xdata()[point]), float(line.get_ydata()[point])
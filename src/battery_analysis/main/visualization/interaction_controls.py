@@ -13,11 +13,17 @@ import matplotlib.pyplot as plt
 from matplotlib.patches import FancyBboxPatch
 from PyQt6.QtWidgets import QFileDialog, QMessageBox
 
+from battery_analysis.main.visualization.hover_index import HoverPointIndex
 from battery_analysis.main.visualization.styling import MODERN_BUTTON_STYLE
 from battery_analysis.utils.version import Version
 
 logger = logging.getLogger(__name__)
 
+# 悬停处理的最小间隔（毫秒），约等于 60 帧/秒；期间的鼠标移动事件只保留最后一个
+HOVER_INTERVAL_MS = 16
+# 悬停命中半径占坐标轴宽度的比例
+HOVER_RADIUS_FRACTION = 0.05
+
 
 def _battery_line_indices(battery_index, current_level_num):
     """返回属于指定电池的所有曲线索引。
@@ -229,6 +235,7 @@ class InteractionControlsMixin:
                             lines_unfiltered[i].set_visible(battery_visible)
                             lines_filtered[i].set_visible(False)
 
+                    self._invalidate_hover_index()
                     fig.canvas.draw_idle()
                 except (AttributeError, TypeError, ValueError, IndexError) as e:
                     logger.error("Error toggling filter mode: %s", e)
@@ -366,6 +373,8 @@ class InteractionControlsMixin:
                     button_state = index_to_state.get(battery_idx)
                 if button_state is None:
                     return
+                self._invalidate_hover_index()
+
                 button_state['active'] = new_visibility
                 self._update_button_style(button_state)
 
@@ -409,8 +418,28 @@ class InteractionControlsMixin:
         except (AttributeError, TypeError, ValueError) as e:
             logger.warning("Error adding help text: %s", e)
 
+    def _invalidate_hover_index(self, *_args):
+        """曲线可见性或视图变化后丢弃悬停索引，下次悬停时重建"""
+        self._hover_indexes = {}
+
+    def _get_hover_index(self, ax, current_lines, filtered):
+        """取当前过滤模式的悬停索引，不存在时按可见曲线构建"""
+        indexes = getattr(self, '_hover_indexes', None)
+        if indexes is None:
+            indexes = self._hover_indexes = {}
+        index = indexes.get(filtered)
+        if index is None:
+            radius = HOVER_RADIUS_FRACTION * ax.bbox.width
+            index = indexes[filtered] = HoverPointIndex(current_lines, ax.transData, radius)
+            logger.debug("Hover index built: %d points", len(index))
+        return index
+
     def _add_hover_functionality(self, fig, ax, lines_filtered, lines_unfiltered, check_filter):
-        """添加鼠标悬停功能，显示数据点信息"""
+        """添加鼠标悬停功能，显示数据点信息
+
+        命中测试使用显示坐标下的网格索引（见 hover_index），每个过滤模式构建一次，
+        可见性切换、缩放 / 平移和窗口大小变化时失效；鼠标移动事件按帧率合并处理。
+        """
         try:
             annot = ax.annotate(
                 '', xy=(0, 0), xytext=(10, 10),
@@ -420,35 +449,21 @@ class InteractionControlsMixin:
             )
             annot.set_visible(False)
 
+            self._invalidate_hover_index()
+            ax.callbacks.connect('xlim_changed', self._invalidate_hover_index)
+            ax.callbacks.connect('ylim_changed', self._invalidate_hover_index)
+            fig.canvas.mpl_connect('resize_event', self._invalidate_hover_index)
+
             def on_hover(event):
                 if event.inaxes == ax:
                     current_lines = _select_hover_lines(
                         check_filter, lines_filtered, lines_unfiltered)
+                    filtered = current_lines is lines_filtered
+                    hit = self._get_hover_index(ax, current_lines, filtered).query(event.x, event.y)
 
-                    min_dist = float('inf')
-                    closest_point = None
-                    closest_line_label = None
-
-                    for line in current_lines:
-                        if line.get_visible():
-                            try:
-                                x_data = line.get_xdata()
-                                y_data = line.get_ydata()
-                                line_label = line.get_label()
-
-                                for i, (x, y) in enumerate(zip(x_data, y_data)):
-                                    dist = ((x - event.xdata)**2 +
-                                            (y - event.ydata) ** 2)**0.5
-                                    if (dist < min_dist
-                                            and dist < 0.05 * (self.maxXaxis - self.listAxis[0])):
-                                        min_dist = dist
-                                        closest_point = (x, y, i)
-                                        closest_line_label = line_label
-                            except (AttributeError, TypeError, ValueError, IndexError):
-                                continue
-
-                    if closest_point:
-                        x, y, idx = closest_point
+                    if hit:
+                        line, idx, x, y = hit
+                        closest_line_label = line.get_label()
                         annot.xy = (x, y)
 
                         label_text = ""
@@ -468,7 +483,24 @@ class InteractionControlsMixin:
                             annot.set_visible(False)
                             fig.canvas.draw_idle()
 
-            fig.canvas.mpl_connect('motion_notify_event', on_hover)
+            # 鼠标移动事件合并：定时器未触发前到达的事件只更新"最新事件"
+            pending = {'event': None}
+            timer = fig.canvas.new_timer(interval=HOVER_INTERVAL_MS)
+            timer.single_shot = True
+
+            def flush_hover():
+                event, pending['event'] = pending['event'], None
+                if event is not None:
+                    on_hover(event)
+
+            timer.add_callback(flush_hover)
+
+            def on_motion(event):
+                if pending['event'] is None:
+                    timer.start()
+                pending['event'] = event
+
+            fig.canvas.mpl_connect('motion_notify_event', on_motion)
 
         except (AttributeError, TypeError, ValueError) as e:
             logger.warning("Error adding hover functionality: %s", e)
@@ -0,0 +1,118 @@
+"""
+曲线细节层级（LOD）模块
+
+对一组曲线（一个 LineCollection 的全部线段）预先计算若干分辨率的 M4 降采样：
+把数据 x 范围等分为若干区间，每条曲线在每个区间只保留首点、末点、y 最小点
+和 y 最大点。区间不大于一个像素时，降采样后的折线与全分辨率绘制在像素上
+基本一致（每列的极值不会丢失），而点数只与区间数有关。
+
+视图变化时按"可见 x 范围 / 画布像素宽度"选择刚好足够细的层级；
+放大到任何层级都不够细时返回 None，由调用方切回全分辨率线段。
+"""
+
+import numpy as np
+
+# 最粗层级的区间数，之后每层乘以 LOD_LEVEL_FACTOR
+LOD_BASE_BINS = 1024
+LOD_LEVEL_FACTOR = 4
+
+# 每个像素至少对应的区间数（M4 每像素一个区间即可保留该像素列的全部极值）
+LOD_BINS_PER_PIXEL = 1
+
+# 层级的总点数须少于全分辨率的 1 / LOD_MIN_REDUCTION，否则不再建立更细的层级
+LOD_MIN_REDUCTION = 2
+
+
+def m4_decimate(segments, x_min: float, x_max: float, bins: int) -> list:
+    """对一组 N×2 线段做 M4 降采样
+
+    Args:
+        segments: 线段列表（每条为 N×2 数组，列为 x / y）
+        x_min, x_max: 区间划分的 x 范围
+        bins: 区间数
+
+    Returns:
+        与 segments 一一对应的降采样线段，保持原有点序
+    """
+    lengths = np.array([len(segment) for segment in segments], dtype=np.int64)
+    if not lengths.sum():
+        return [np.asarray(segment) for segment in segments]
+    points = np.concatenate([segment for segment in segments if len(segment)])
+    curve_ids = np.repeat(np.arange(len(segments)), lengths)
+
+    scale = bins / (x_max - x_min) if x_max > x_min else 0.0
+    bin_ids = np.clip(((points[:, 0] - x_min) * scale).astype(np.int64), 0, bins - 1)
+    keys = curve_ids * bins + bin_ids
+
+    keep = np.zeros(len(points), dtype=bool)
+    if np.all(keys[1:] >= keys[:-1]):
+        # 各曲线 x 单调（常见情形）：分组已连续，无需排序
+        starts = np.r_[0, np.flatnonzero(keys[1:] != keys[:-1]) + 1]
+        ends = np.r_[starts[1:], len(keys)]
+        keep[starts] = keep[ends - 1] = True
+        group_ids = np.repeat(np.arange(len(starts)), ends - starts)
+        y = points[:, 1]
+        for extreme in (np.minimum, np.maximum):
+            # 每组中第一个等于组内极值的点
+            hits = np.flatnonzero(y == extreme.reduceat(y, starts)[group_ids])
+            keep[hits[np.r_[True, group_ids[hits][1:] != group_ids[hits][:-1]]]] = True
+    else:
+        # 按 (曲线, 区间) 分组：原序稳定排序取首 / 末点，按 y 排序取最小 / 最大点
+        for order in (np.argsort(keys, kind='stable'), np.lexsort((points[:, 1], keys))):
+            sorted_keys = keys[order]
+            boundaries = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1])
+            keep[order[np.r_[0, boundaries + 1]]] = True
+            keep[order[np.r_[boundaries, len(order) - 1]]] = True
+
+    offsets = np.r_[0, np.cumsum(lengths)]
+    return [points[offsets[i]:offsets[i + 1]][keep[offsets[i]:offsets[i + 1]]]
+            for i in range(len(segments))]
+
+
+class CurveLODPyramid:
+    """一组线段的多分辨率 M4 降采样
+
+    Args:
+        segments: 全分辨率线段列表（每条为 N×2 数组）
+    """
+
+    def __init__(self, segments):
+        self.segments = list(segments)
+        non_empty = [segment[:, 0] for segment in self.segments if len(segment)]
+        if non_empty:
+            x_values = np.concatenate(non_empty)
+            finite = x_values[np.isfinite(x_values)]
+        else:
+            finite = np.empty(0)
+        self.x_min = float(finite.min()) if len(finite) else 0.0
+        self.x_max = float(finite.max()) if len(finite) else 0.0
+
+        # [(区间数, 降采样线段), ...]，由粗到细
+        self.levels = []
+        lengths = np.array([len(segment) for segment in self.segments], dtype=np.int64)
+        total = int(lengths.sum())
+        bins = LOD_BASE_BINS
+        while total and self.x_max > self.x_min:
+            # 每条曲线每个区间至多保留 4 个点：上界已不足以减少点数时无需计算
+            if np.minimum(lengths, 4 * bins).sum() * LOD_MIN_REDUCTION > total:
+                break
+            decimated = m4_decimate(self.segments, self.x_min, self.x_max, bins)
+            if sum(len(segment) for segment in decimated) * LOD_MIN_REDUCTION > total:
+                break
+            self.levels.append((bins, decimated))
+            bins *= LOD_LEVEL_FACTOR
+
+    def select(self, view_min: float, view_max: float, pixel_width: float):
+        """返回满足当前视图的最粗层级序号；都不够细时返回 None（使用全分辨率）"""
+        view_span = abs(view_max - view_min)
+        if not self.levels or view_span <= 0 or pixel_width <= 0:
+            return None
+        needed = LOD_BINS_PER_PIXEL * pixel_width * (self.x_max - self.x_min) / view_span
+        for level, (bins, _) in enumerate(self.levels):
+            if bins >= needed:
+                return level
+        return None
+
+    def segments_for(self, level):
+        """层级序号（None 为全分辨率）对应的线段列表"""
+        return self.segments if level is None else self.levels[level][1]
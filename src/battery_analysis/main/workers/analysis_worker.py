@@ -2,10 +2,8 @@
 """
 电池分析工作线程模块
 """
-import os
 import sys
 import re
-import shutil
 import subprocess
 import logging
 from PyQt6 import QtCore as QC
@@ -113,152 +111,31 @@ class AnalysisWorker(QC.QRunnable):
             logging.warning("Failed to send initial running status: %s", str(e))
 
         try:
-            self._emit_progress(0, "Preparing analysis...")
-
-            # 后向兼容：若传入 TestInfo，转为 list 供旧版引擎使用
-            from battery_analysis.domain.entities.test_info import TestInfo
-            if isinstance(self.list_test_info, TestInfo):
-                self.list_test_info = self.list_test_info.to_list()
-
-            # 确保输出根目录存在（3_analysis results）
-            os.makedirs(self.str_output_path, exist_ok=True)
-
-            # 检查并创建版本目录
-            version_dir = f"{self.str_output_path}/v{self.list_test_info[16]}"
-            if os.path.exists(version_dir):
-                shutil.rmtree(version_dir)
-            if self.b_cancel_requested:
-                return
-
-            os.mkdir(version_dir)
-            self._emit_progress(3, "Initializing analysis environment...")
-
-            # 电池分析
             # 延迟导入以避免循环引用
-            from battery_analysis.utils.processors import battery_analysis
-
-            self._emit_progress(5, "Loading battery analysis module...")
-
-            self._emit_progress(8, "Initializing battery analysis engine...")
-
-            info_battery = battery_analysis.BatteryAnalysis(
-                strInDataXlsxDir=self.str_input_path,
-                strResultPath=self.str_output_path,
-                listTestInfo=self.list_test_info,
-                progress_callback=lambda v, s: self._emit_progress(v, s)
+            from battery_analysis.utils.analysis_pipeline import run_analysis_pipeline
+
+            result = run_analysis_pipeline(
+                self.str_input_path,
+                self.str_output_path,
+                self.list_test_info,
+                executor=self._build_task_executor(),
+                incremental=self._is_incremental_enabled(),
+                equipment_info=self._load_equipment_info(),
+                progress_callback=self._emit_progress,
+                on_renamed=self._emit_rename_path,
             )
-
-            # BatteryAnalysis.__init__ 内部已报告进度至约55%，继续后续步骤
-            self._emit_progress(self.progress_value, "Processing battery information...")
-
-            self.str_error_battery = info_battery.UBA_GetErrorLog()
-            if self.str_error_battery == "":
-                list_battery_info = info_battery.UBA_GetBatteryInfo()
-
-                if self.b_cancel_requested:
-                    return
-
-                # 获取Test Date和原始周期日期进行验证
-                # 从修改后的UBA_GetBatteryInfo返回值中获取Test Date
-                test_date = list_battery_info[3]
-                # 从修改后的UBA_GetBatteryInfo返回值中获取原始周期日期
-                original_cycle_date = list_battery_info[4]
-
-                logging.info(
-                    "Retrieved Test Date: %s, original cycle date: %s", test_date, original_cycle_date)
-
-                from battery_analysis.utils.readers.date_parser import parse_test_date
-
-                fallback = (
-                    list_battery_info[2][0]
-                    if len(list_battery_info) > 2 and list_battery_info[2]
-                    else ""
-                )
-                self.str_test_date = parse_test_date(
-                    test_date, original_cycle_date, fallback
-                )
-                logging.info("Final test date determined: %s", self.str_test_date)
-
-                self._emit_progress(self.progress_value, "Processing output directory...")
-
-                # 重命名目录
-                try:
-                    final_dir = f"{self.str_output_path}/" \
-                        f"{self.str_test_date}_v{self.list_test_info[16]}"
-                    if os.path.exists(final_dir):
-                        shutil.rmtree(final_dir)
-
-                    # 发送重命名路径信号
-                    try:
-                        self.signals.rename_path.emit(self.str_test_date)
-                    except RuntimeError:
-                        logging.warning("Signal object already deleted, cannot emit rename path signal")
-
-                    os.rename(version_dir, final_dir)
-                except (OSError, PermissionError, FileNotFoundError) as e:
-                    logging.error("Failed to rename directory: %s", e)
-                    # 重命名失败时，使用默认目录名继续执行
-                    final_dir = version_dir
-
-                self._emit_progress(self.progress_value, "Preparing to generate report...")
-
-                self._emit_progress(60, "Initializing report generation module...")
-
-                # 文件写入
+            self.str_error_battery = result.analysis_error
+            self.str_test_date = result.test_date
+            if result.report_error:
+                logging.error(result.report_error)
+                self.str_error_xlsx = result.report_error
+
+            if not self.str_error_battery:
+                # 优化ImageMaker启动逻辑：仅查找与 analyzer 同版本的 visualizer
                 try:
-                    from battery_analysis.utils import file_writer
-                    from battery_analysis.main.services.service_container import get_service_container
-
-                    _equipment = {}
-                    try:
-                        _container = get_service_container()
-                        _config = _container.get("config")
-                        if _config:
-                            _eq = _config.get_config_value("test.equipment", {})
-                            if _eq:
-                                _equipment = next(iter(_eq.values()))
-                    except (KeyError, TypeError, AttributeError, StopIteration):
-                        pass
-
-                    info_file = file_writer.FileWriter(
-                        strResultPath=self.str_output_path,
-                        listTestInfo=self.list_test_info,
-                        listBatteryInfo=list_battery_info,
-                        equipment_info=_equipment,
-                    )
-
-                    self._emit_progress(63, "Organizing analysis data...")
-
-                    self._emit_progress(65, "Writing analysis results...")
-
-                    self._emit_progress(70, "Generating charts...")
-
-                    self._emit_progress(74, "Optimizing chart layout...")
-
-                    self._emit_progress(78, "Validating analysis result data...")
-
-                    self._emit_progress(82, "Packaging final data...")
-
-                    self.str_error_xlsx = info_file.UFW_GetErrorLog()
-                    if self.str_error_xlsx != "":
-                        logging.error(self.str_error_xlsx)
-                    else:
-                        self._emit_progress(85, "Completing final processing...")
-
-                        self._emit_progress(90, "Validating output results...")
-
-                        self._emit_progress(95, "Cleaning up temporary files...")
-
-                        self._emit_progress(100, "Analysis complete!")
-
-                    # 优化ImageMaker启动逻辑：仅查找与 analyzer 同版本的 visualizer
-                    try:
-                        self._start_visualizer()
-                    except (ImportError, OSError, PermissionError, ValueError) as e:
-                        logging.error("Failed to start visualizer: %s", e)
-                except (ImportError, OSError, PermissionError, IOError, ValueError) as e:
-                    logging.error("An error occurred during file writing: %s", e)
-                    self.str_error_xlsx = f"File writing error: {str(e)}"
+                    self._start_visualizer()
+                except (ImportError, OSError, PermissionError, ValueError) as e:
+                    logging.error("Failed to start visualizer: %s", e)
 
         except _TaskCancelled:
             return
@@ -283,6 +160,57 @@ class AnalysisWorker(QC.QRunnable):
             except RuntimeError as e:
                 logging.warning("Signal object already deleted, cannot emit completion status: %s", e)
 
+    def _emit_rename_path(self, test_date):
+        """通知主线程结果目录将按测试日期重命名"""
+        try:
+            self.signals.rename_path.emit(test_date)
+        except RuntimeError:
+            logging.warning("Signal object already deleted, cannot emit rename path signal")
+
+    @staticmethod
+    def _load_equipment_info():
+        """读取配置 test.equipment 中的第一台设备信息"""
+        try:
+            from battery_analysis.main.services.service_container import get_service_container
+            config = get_service_container().get("config")
+            if config:
+                equipment = config.get_config_value("test.equipment", {})
+                if equipment:
+                    return next(iter(equipment.values()))
+        except (KeyError, TypeError, AttributeError, StopIteration):
+            pass
+        return {}
+
+    @staticmethod
+    def _is_incremental_enabled():
+        """读取配置 analysis.incremental（默认开启）"""
+        try:
+            from battery_analysis.main.services.service_container import get_service_container
+            config = get_service_container().get("config")
+            if config:
+                return bool(config.get_config_value("analysis.incremental", True))
+        except (KeyError, TypeError, AttributeError):
+            pass
+        return True
+
+    @staticmethod
+    def _build_task_executor():
+        """按配置 analysis.executor / worker_pool.max_workers 构建执行器（0 表示自动）"""
+        from battery_analysis.utils.task_executor import DEFAULT_BACKEND, EXECUTOR_BACKENDS, TaskExecutor
+        backend, max_workers = DEFAULT_BACKEND, None
+        try:
+            from battery_analysis.main.services.service_container import get_service_container
+            config = get_service_container().get("config")
+            if config:
+                backend = config.get_config_value("analysis.executor", DEFAULT_BACKEND)
+                max_workers = int(config.get_config_value("worker_pool.max_workers", 0) or 0)
+        except (KeyError, TypeError, ValueError, AttributeError):
+            pass
+        if backend not in EXECUTOR_BACKENDS:
+            logging.warning("Unknown analysis.executor %r, falling back to %s", backend, DEFAULT_BACKEND)
+            backend = DEFAULT_BACKEND
+        return TaskExecutor(backend, max_workers=max_workers or None)
+
     def _start_visualizer(self):
         """
         启动可视化工具的内部方法
@@ -0,0 +1,229 @@
+"""
+分析流水线模块
+
+把"电池分析 → 结果目录重命名 → 报告生成"的完整流程从 GUI 工作线程中提取出来，
+供 AnalysisWorker 与命令行入口（battery_analysis.cli）共用。本模块及其依赖
+不导入 PyQt，可在无图形界面的构建服务器上运行。
+
+输出布局（与 GUI 一致）：
+
+    <输出根目录>/<测试日期>_v<版本>/   Info_Image、图片、Excel、CSV、JSON、TIMINGS_JSON
+    <输出根目录>/<报告名>.docx
+
+各阶段（见 PIPELINE_STAGES）与单文件子阶段的耗时、CPU 时间和峰值内存由
+instrumentation 记录并写入结果目录的 TIMINGS_JSON；进度按上一次运行实测的
+阶段耗时分配。传入 trace=True 或设置环境变量 BATTERY_ANALYSIS_TRACE=1 时
+另写出 Chrome trace-event 格式的 TRACE_JSON。
+"""
+
+import glob
+import logging
+import os
+import shutil
+from dataclasses import dataclass, field
+
+from battery_analysis.domain.entities.test_info import TestInfo
+from battery_analysis.utils.constants import REPORT_FORMATS, TIMINGS_JSON, TRACE_JSON
+from battery_analysis.utils.file_writer import write_all
+from battery_analysis.utils.instrumentation import (
+    Profiler, StageProgress, load_stage_weights, profiling, span,
+)
+from battery_analysis.utils.processors.battery_analysis import BatteryAnalysis
+from battery_analysis.utils.processors.result_manifest import find_previous_manifest, read_manifest_file
+from battery_analysis.utils.readers.date_parser import parse_test_date
+from battery_analysis.utils.readers.info_image_reader import clear_info_image_cache
+
+logger = logging.getLogger(__name__)
+
+# 流水线各阶段的默认进度权重（输出目录中没有上次运行的 TIMINGS_JSON 时使用；
+# 取自 100 个合成文件、进程池已启动时的实测比例：分析约 36%，报告约 64%）
+PIPELINE_STAGES = {"prepare": 1, "scan": 1, "files": 36, "commit": 1, "rename": 1, "report": 60}
+
+
+@dataclass
+class PipelineResult:
+    """单次流水线运行的结果
+
+    Attributes:
+        result_dir: 最终结果目录（重命名失败时为未重命名的版本目录）
+        test_date: 解析出的测试日期（YYYYMMDD）
+        battery_count: 成功分析的电池数
+        analysis_error: 分析阶段的错误信息，为空表示成功
+        report_error: 报告阶段的错误信息，为空表示成功
+        report_timings: 报告各阶段耗时（秒），见 ReportCoordinator.write
+    """
+    result_dir: str = ""
+    test_date: str = ""
+    battery_count: int = 0
+    analysis_error: str = ""
+    report_error: str = ""
+    report_timings: dict = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.analysis_error and not self.report_error
+
+
+def run_analysis_pipeline(input_dir: str, output_dir: str, test_info, *,
+                          executor=None, incremental: bool = True,
+                          formats=REPORT_FORMATS, equipment_info: dict | None = None,
+                          svg_mode: str = "eager", progress_callback=None, on_renamed=None,
+                          trace: bool | None = None) -> PipelineResult:
+    """分析 input_dir 下的全部 xlsx 并在 output_dir 下生成结果与报告
+
+    Args:
+        input_dir: 输入数据目录
+        output_dir: 输出根目录（不存在时创建）
+        test_info: TestInfo 实例或位置列表
+        executor: 单文件分析与报告渲染所用的 TaskExecutor；None 表示共享进程池
+        incremental: 是否复用上次结果清单中未变化文件的结果
+        formats: 要生成的报告格式，取值见 REPORT_FORMATS
+        equipment_info: 测试设备信息（写入 Word 报告）
+        svg_mode: SVG 的生成方式，取值见 SVG_MODES
+        progress_callback: 回调 (进度 0-100, 状态文本)；回调抛出的异常会中止流水线
+        on_renamed: 回调 (测试日期)，在结果目录重命名前调用
+        trace: 是否写出 TRACE_JSON；None 表示由环境变量 BATTERY_ANALYSIS_TRACE 决定
+
+    Returns:
+        PipelineResult；分析或报告失败记录在结果中，不抛出
+    """
+    if isinstance(test_info, TestInfo):
+        test_info = test_info.to_list()
+
+    profiler = Profiler()
+    progress = StageProgress(progress_callback, PIPELINE_STAGES,
+                             load_stage_weights(_find_previous_timings(output_dir)))
+    with profiling(profiler):
+        progress.start("prepare", "Preparing analysis...")
+        with span("prepare"):
+            previous_manifest, version_dir = prepare_output_dir(output_dir, test_info[16], incremental)
+
+        info_battery = BatteryAnalysis(
+            strInDataXlsxDir=input_dir,
+            strResultPath=output_dir,
+            listTestInfo=test_info,
+            incremental=incremental,
+            previous_manifest=previous_manifest,
+            executor=executor,
+            progress=progress,
+        )
+        result = finish_pipeline(info_battery, output_dir, test_info, version_dir,
+                                 formats=formats, equipment_info=equipment_info, executor=executor,
+                                 svg_mode=svg_mode, progress=progress, on_renamed=on_renamed)
+    _write_instrumentation(profiler, result.result_dir, trace)
+    return result
+
+
+def _find_previous_timings(output_dir: str) -> str | None:
+    """输出根目录下最近一次运行留下的 TIMINGS_JSON"""
+    candidates = glob.glob(os.path.join(glob.escape(output_dir), "*", TIMINGS_JSON))
+    return max(candidates, key=os.path.getmtime) if candidates else None
+
+
+def _write_instrumentation(profiler: Profiler, result_dir: str, trace: bool | None) -> None:
+    """把埋点写入结果目录；写入失败只记录警告"""
+    if trace is None:
+        trace = os.environ.get("BATTERY_ANALYSIS_TRACE", "").lower() in ("1", "true", "yes", "on")
+    if not os.path.isdir(result_dir):
+        return
+    try:
+        profiler.write_timings(os.path.join(result_dir, TIMINGS_JSON))
+        if trace:
+            profiler.write_trace(os.path.join(result_dir, TRACE_JSON))
+    except OSError as e:
+        logger.warning("Failed to write timings to %s: %s", result_dir, e)
+
+
+def prepare_output_dir(output_dir: str, version: str, incremental: bool) -> tuple:
+    """创建输出根目录、读取上次的结果清单并重建 V<版本> 目录
+
+    Returns:
+        (上次的清单 dict 或 None, 版本目录路径)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    # 增量分析：清理旧目录前读取上次的结果清单
+    previous_manifest = None
+    if incremental:
+        previous_manifest = read_manifest_file(find_previous_manifest(output_dir, version))
+
+    # 释放对旧 Info_Image.npz 的内存映射，否则 Windows 下无法删除 / 重命名结果目录
+    clear_info_image_cache()
+
+    # BatteryAnalysis 写入 V<版本> 目录，分析完成后按测试日期重命名
+    version_dir = os.path.join(output_dir, f"V{version}")
+    if os.path.exists(version_dir):
+        shutil.rmtree(version_dir)
+    os.mkdir(version_dir)
+    return previous_manifest, version_dir
+
+
+def finish_pipeline(info_battery: BatteryAnalysis, output_dir: str, test_info: list, version_dir: str, *,
+                    formats=REPORT_FORMATS, equipment_info: dict | None = None, executor=None,
+                    svg_mode: str = "eager", progress: StageProgress | None = None,
+                    on_renamed=None) -> PipelineResult:
+    """分析完成后：按测试日期重命名结果目录并生成报告
+
+    Args:
+        info_battery: 已完成分析的 BatteryAnalysis
+        version_dir: prepare_output_dir 返回的版本目录
+        progress: 整体进度（含 "rename" / "report" 阶段）；None 表示不报告
+        其余参数同 run_analysis_pipeline
+
+    Returns:
+        PipelineResult
+    """
+    result = PipelineResult(result_dir=version_dir, analysis_error=info_battery.UBA_GetErrorLog())
+    if result.analysis_error:
+        return result
+
+    list_battery_info = info_battery.UBA_GetBatteryInfo()
+    result.battery_count = len(list_battery_info[1])
+    test_date, original_cycle_date = list_battery_info[3], list_battery_info[4]
+    logger.info("Retrieved Test Date: %s, original cycle date: %s", test_date, original_cycle_date)
+    fallback = list_battery_info[2][0] if len(list_battery_info) > 2 and list_battery_info[2] else ""
+    result.test_date = parse_test_date(test_date, original_cycle_date, fallback)
+    logger.info("Final test date determined: %s", result.test_date)
+
+    progress = progress or StageProgress(None, PIPELINE_STAGES)
+    progress.start("rename", "Processing output directory...")
+    try:
+        with span("rename"):
+            final_dir = os.path.join(output_dir, f"{result.test_date}_v{test_info[16]}")
+            if os.path.exists(final_dir):
+                clear_info_image_cache()
+                shutil.rmtree(final_dir)
+            if on_renamed:
+                on_renamed(result.test_date)
+            os.rename(version_dir, final_dir)
+            result.result_dir = final_dir
+    except OSError as e:
+        # 重命名失败时，使用默认目录名继续执行
+        logger.error("Failed to rename directory: %s", e)
+
+    progress.start("report", "Generating reports...")
+    # 进度回调抛出的异常（如 GUI 取消）不是报告错误，原样交给调用方
+    callback_errors = []
+
+    def report_progress(fraction, name):
+        try:
+            progress.update("report", fraction, f"Generating reports... ({name})")
+        except BaseException as e:
+            callback_errors.append(e)
+            raise
+
+    try:
+        with span("report"):
+            result.report_timings = write_all(
+                output_dir, test_info, list_battery_info, equipment_info,
+                formats=formats, executor=executor, svg_mode=svg_mode,
+                on_progress=report_progress)
+    except Exception as e:  # 报告写入涉及多个第三方库，任何失败都记录为报告错误
+        if callback_errors:
+            raise callback_errors[0] from None
+        logger.exception("Failed to write report")
+        result.report_error = str(e)
+        return result
+
+    progress.finish("Analysis complete!")
+    return result
@@ -0,0 +1,336 @@
+"""
+批量调度模块
+
+一次分析多个测试批次（每个批次 = 一个输入目录 + 一份 TestInfo + 输出根目录）。
+所有批次的单文件分析任务按批次先后依次提交到同一个执行器（默认共享进程池），
+批次之间不等待：前一批次的最后几个文件仍在分析时，后一批次的文件已填满进程池。
+结果到达后路由回所属批次的 BatteryAnalysis；某个批次的文件全部完成后立即
+在单独的完成线程中完成该批次（提交 Info_Image、重命名结果目录、生成报告），
+调用线程继续向执行器供给其余批次的文件，不因报告生成而让进程池空闲。
+
+每个批次独立输出与失败：单个批次出错只记录在该批次的结果中。单文件任务抛出
+BatteryAnalysis.SKIPPED_FILE_ERRORS 之外的异常（含子进程被杀导致的
+BrokenProcessPool）时，只有该文件所属的批次失败。指定状态文件后，
+成功完成的批次及其输入指纹（TestInfo、报告格式、各输入文件的大小与 mtime）
+会原子写入其中；中断后重新运行时跳过指纹未变的已完成批次。分析中的批次
+定期把增量清单写入 V<版本> 目录（见 BatteryAnalysis.MANIFEST_CHECKPOINT_FILES），
+启用增量分析时重新运行会复用中断前已分析完的文件。
+"""
+
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass, field
+
+from battery_analysis.domain.entities.test_info import TestInfo
+from battery_analysis.utils.analysis_pipeline import PipelineResult, finish_pipeline, prepare_output_dir
+from battery_analysis.utils.constants import REPORT_FORMATS
+from battery_analysis.utils.file_finder import scan_sorted_xlsx
+from battery_analysis.utils.processors.battery_analysis import BatteryAnalysis
+from battery_analysis.utils.task_executor import TaskExecutor
+
+logger = logging.getLogger(__name__)
+
+# 状态文件格式版本
+BATCH_STATE_FORMAT = 1
+
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_SKIPPED = "skipped"
+
+
+@dataclass
+class Campaign:
+    """一个测试批次
+
+    Attributes:
+        input_dir: 输入数据目录
+        output_dir: 输出根目录
+        test_info: TestInfo 实例或位置列表
+        name: 显示名称；为空时取输入目录名
+        equipment_info: 测试设备信息（写入 Word 报告）
+        formats: 报告格式，取值见 REPORT_FORMATS
+        svg_mode: SVG 的生成方式，取值见 SVG_MODES
+    """
+    input_dir: str
+    output_dir: str
+    test_info: object
+    name: str = ""
+    equipment_info: dict = field(default_factory=dict)
+    formats: tuple = REPORT_FORMATS
+    svg_mode: str = "eager"
+
+    def __post_init__(self):
+        if isinstance(self.test_info, TestInfo):
+            self.test_info = self.test_info.to_list()
+        self.name = self.name or os.path.basename(os.path.normpath(self.input_dir))
+
+    @property
+    def version(self) -> str:
+        return str(self.test_info[16])
+
+    @property
+    def key(self) -> str:
+        """状态文件中的键：同一输入目录输出到同一位置的同一版本视为同一批次"""
+        return "|".join((os.path.abspath(self.input_dir), os.path.abspath(self.output_dir), self.version))
+
+    def fingerprint(self) -> str:
+        """TestInfo、报告格式、SVG 生成方式与各输入文件 (名称, 大小, mtime_ns) 的摘要"""
+        files = []
+        for path in scan_sorted_xlsx(f"{self.input_dir}/"):
+            stat = os.stat(path)
+            files.append([os.path.basename(path), stat.st_size, stat.st_mtime_ns])
+        payload = json.dumps([self.test_info, sorted(self.formats), self.svg_mode, files],
+                             default=str, sort_keys=True)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CampaignResult:
+    """单个批次的结果
+
+    Attributes:
+        campaign: 对应的批次
+        status: STATUS_DONE / STATUS_FAILED / STATUS_SKIPPED（状态文件表明已完成且输入未变）
+        pipeline: 分析与报告结果；跳过的批次只有 result_dir
+        files_total: 需要分析的文件数（不含增量复用的文件）
+        files_done: 已完成（含失败跳过）的文件数
+    """
+    campaign: Campaign
+    status: str = ""
+    pipeline: PipelineResult = field(default_factory=PipelineResult)
+    files_total: int = 0
+    files_done: int = 0
+
+    @property
+    def error(self) -> str:
+        return self.pipeline.analysis_error or self.pipeline.report_error
+
+
+class _CampaignRun:
+    """调度期间单个批次的可变状态"""
+
+    def __init__(self, campaign: Campaign, result: CampaignResult):
+        self.campaign = campaign
+        self.result = result
+        self.analysis = None
+        self.version_dir = ""
+        self.process_args = []
+        self.fingerprint = ""
+
+
+class BatchScheduler:
+    """多批次调度器
+
+    Args:
+        campaigns: Campaign 列表（同一输出根目录下的版本号不可重复）
+        executor: 单文件分析所用的 TaskExecutor；None 表示共享进程池
+        incremental: 是否复用各批次上次结果清单中未变化文件的结果
+        state_path: 状态文件路径；None 表示不记录、不跳过
+        progress_callback: 回调 (CampaignResult, 状态文本)，在调用线程中执行
+
+    Raises:
+        ValueError: 两个批次会写入同一个结果目录
+    """
+
+    def __init__(self, campaigns, executor: TaskExecutor | None = None, incremental: bool = True,
+                 state_path: str | None = None, progress_callback=None):
+        self.campaigns = list(campaigns)
+        seen = {}
+        for campaign in self.campaigns:
+            target = (os.path.abspath(campaign.output_dir), campaign.version)
+            if target in seen:
+                raise ValueError(f"Campaigns '{seen[target]}' and '{campaign.name}' both write "
+                                 f"version {campaign.version} to {campaign.output_dir}")
+            seen[target] = campaign.name
+        self.executor = executor or TaskExecutor()
+        self.incremental = incremental
+        self.state_path = state_path
+        self._progress_callback = progress_callback
+        self._state = self._load_state()
+
+    # ── 状态文件 ──
+
+    def _load_state(self) -> dict:
+        if not self.state_path or not os.path.isfile(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable batch state %s: %s", self.state_path, e)
+            return {}
+        if not isinstance(data, dict) or data.get("format") != BATCH_STATE_FORMAT:
+            return {}
+        return data.get("campaigns", {})
+
+    def _save_state(self) -> None:
+        if not self.state_path:
+            return
+        state_dir = os.path.dirname(os.path.abspath(self.state_path))
+        try:
+            os.makedirs(state_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(suffix=".json.tmp", dir=state_dir)
+        except OSError as e:
+            logger.warning("Failed to write batch state %s: %s", self.state_path, e)
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"format": BATCH_STATE_FORMAT, "campaigns": self._state}, f,
+                          ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            logger.warning("Failed to write batch state %s: %s", self.state_path, e)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    # ── 调度 ──
+
+    def _report(self, run: _CampaignRun, status: str) -> None:
+        if self._progress_callback:
+            self._progress_callback(run.result, status)
+
+    def _fail(self, run: _CampaignRun, message: str) -> None:
+        if run.analysis is not None:
+            run.analysis.abort_run()
+        run.result.status = STATUS_FAILED
+        if not run.result.error:
+            run.result.pipeline.analysis_error = message
+        logger.error("Campaign %s failed: %s", run.campaign.name, run.result.error)
+        self._report(run, f"Failed: {run.result.error}")
+
+    def _start(self, run: _CampaignRun) -> None:
+        """准备输出目录并扫描文件，得到该批次待分析的任务"""
+        campaign = run.campaign
+        previous_manifest, run.version_dir = prepare_output_dir(
+            campaign.output_dir, campaign.version, self.incremental)
+        run.analysis = BatteryAnalysis(
+            strInDataXlsxDir=campaign.input_dir,
+            strResultPath=campaign.output_dir,
+            listTestInfo=campaign.test_info,
+            incremental=self.incremental,
+            previous_manifest=previous_manifest,
+            auto_run=False,
+        )
+        run.process_args = run.analysis.begin_run(campaign.output_dir)
+        run.result.files_total = len(run.process_args)
+
+    def _complete(self, run: _CampaignRun) -> None:
+        """该批次的文件全部完成：提交分析结果并生成报告（在完成线程中执行，不回调进度）"""
+        campaign = run.campaign
+        run.analysis.finish_run()
+        run.result.pipeline = finish_pipeline(
+            run.analysis, campaign.output_dir, campaign.test_info, run.version_dir,
+            formats=campaign.formats, equipment_info=campaign.equipment_info, executor=self.executor,
+            svg_mode=campaign.svg_mode)
+
+    def _finish(self, run: _CampaignRun, future: concurrent.futures.Future) -> None:
+        """在调用线程中记录完成线程的结果并报告批次状态"""
+        try:
+            future.result()
+        except Exception as e:  # 单个批次的任何失败都不影响其他批次
+            self._fail(run, str(e))
+            return
+        if run.result.error:
+            self._fail(run, run.result.error)
+            return
+        run.result.status = STATUS_DONE
+        self._state[run.campaign.key] = {
+            "fingerprint": run.fingerprint,
+            "result_dir": run.result.pipeline.result_dir,
+            "battery_count": run.result.pipeline.battery_count,
+        }
+        self._save_state()
+        self._report(run, "Done")
+
+    def _collect_finished(self, finishing: dict, wait: bool = False) -> None:
+        """处理已完成的批次；wait 为 True 时等待全部批次完成"""
+        if wait:
+            done = concurrent.futures.as_completed(list(finishing))
+        else:
+            done = [future for future in finishing if future.done()]
+        for future in done:
+            self._finish(finishing.pop(future), future)
+
+    def run(self) -> list:
+        """分析全部批次
+
+        Returns:
+            与 campaigns 同序的 CampaignResult 列表
+        """
+        runs = [_CampaignRun(campaign, CampaignResult(campaign)) for campaign in self.campaigns]
+        active = []
+        for run in runs:
+            try:
+                run.fingerprint = run.campaign.fingerprint()
+                previous = self._state.get(run.campaign.key)
+                if (previous and previous.get("fingerprint") == run.fingerprint
+                        and os.path.isdir(previous.get("result_dir", ""))):
+                    run.result.status = STATUS_SKIPPED
+                    run.result.pipeline = PipelineResult(result_dir=previous["result_dir"],
+                                                         battery_count=previous.get("battery_count", 0))
+                    self._report(run, "Skipped (already complete)")
+                    continue
+                self._start(run)
+            except Exception as e:  # 单个批次的任何失败都不影响其他批次
+                self._fail(run, str(e))
+                continue
+            self._report(run, f"Queued {run.result.files_total} files")
+            active.append(run)
+
+        # 按批次先后排列任务，使批次逐个完成，中断时已完成的批次不必重跑
+        tasks = [(idx, run) for run in active for idx in range(len(run.process_args))]
+        # 批次完成（提交结果、生成报告）在单独线程中依次执行；进度与状态仍在调用线程中报告
+        finisher = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="batch-finish")
+        finishing = {}
+
+        def _start_finish(run):
+            self._report(run, "Writing reports...")
+            finishing[finisher.submit(self._complete, run)] = run
+
+        try:
+            for run in active:
+                if not run.process_args:
+                    _start_finish(run)
+
+            def _on_error(task_idx, error):
+                idx, run = tasks[task_idx]
+                file_path = run.process_args[idx][0]
+                if isinstance(error, BatteryAnalysis.SKIPPED_FILE_ERRORS):
+                    BatteryAnalysis.log_file_error(file_path, error)
+                elif not run.result.status:
+                    # 其余异常（含 BrokenProcessPool）只终止该文件所属的批次
+                    self._fail(run, f"{os.path.basename(file_path)}: {type(error).__name__}: {error}")
+
+            completed_results = self.executor.imap_unordered(
+                BatteryAnalysis._parallel_process_file,
+                [run.process_args[idx] for idx, run in tasks],
+                skip_exceptions=(Exception,),
+                on_error=_on_error)
+            for task_idx, file_result in completed_results:
+                self._collect_finished(finishing)
+                idx, run = tasks[task_idx]
+                if run.result.status:
+                    continue
+                run.result.files_done += 1
+                try:
+                    run.analysis.accept_result(idx, file_result)
+                except Exception as e:  # 写入失败只终止该批次
+                    self._fail(run, str(e))
+                    continue
+                self._report(run, f"Analyzed {run.result.files_done}/{run.result.files_total} files")
+                if run.result.files_done == run.result.files_total:
+                    _start_finish(run)
+            self._collect_finished(finishing, wait=True)
+        except BaseException:
+            # 等正在完成的批次结束后再丢弃未完成批次的临时文件，避免与完成线程同时操作
+            finisher.shutdown(wait=True, cancel_futures=True)
+            for run in active:
+                if not run.result.status and run.analysis is not None:
+                    run.analysis.abort_run()
+            raise
+        finisher.shutdown()
+        return [run.result for run in runs]
@@ -0,0 +1,18 @@
+"""持久化缓存目录
+
+与 sheet_cache 等重量级模块分开，供启动路径（i18n、资源管理）使用时不导入 pandas。
+"""
+import os
+from pathlib import Path
+
+
+def default_cache_root() -> Path:
+    """持久化缓存根目录：与日志目录同级（Windows 为 LOCALAPPDATA，其余为 ~/.cache），
+    可用环境变量 BATTERY_ANALYSIS_CACHE_DIR 覆盖"""
+    override = os.environ.get("BATTERY_ANALYSIS_CACHE_DIR")
+    if override:
+        return Path(override)
+    if os.name == 'nt':
+        app_data = os.environ.get('LOCALAPPDATA', os.path.join(os.environ['USERPROFILE'], 'AppData', 'Local'))
+        return Path(app_data) / 'BatteryAnalysis' / 'cache'
+    return Path.home() / '.cache' / 'battery_analysis'
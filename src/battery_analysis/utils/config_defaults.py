@@ -184,6 +184,18 @@ DEFAULT_CONFIG = {
             }
         }
     },
+    "analysis": {
+        # 增量分析：只重新处理新增/修改的 xlsx，其余复用 Info_Manifest.json 中的结果
+        "incremental": True,
+        # 单文件分析的执行方式：process / thread / serial / inline
+        "executor": "process"
+    },
+    "worker_pool": {
+        # 主窗口空闲时预先启动进程池并导入分析模块
+        "warm_up": True,
+        # 进程池大小，0 表示按 CPU 与内存自动决定
+        "max_workers": 0
+    },
     "window": {
         "width": 1200,
         "height": 800,
@@ -26,3 +26,24 @@ COLOR_NAME = ["red = ", "blue = ", "yellow = ",
 
 # 文件名常量
 INFO_IMAGE_CSV = "Info_Image.csv"
+# Info_Image.csv 的二进制副本（扁平数组 + 偏移，可内存映射）
+INFO_IMAGE_NPZ = "Info_Image.npz"
+
+# 增量分析结果清单（与 Info_Image.csv 同目录）
+INFO_MANIFEST_JSON = "Info_Manifest.json"
+
+# ReportCoordinator.write 可生成的报告格式。docx 必须插入 PNG 图片，请求 docx 时总会绘制 PNG；
+# xlsx 仅在 PNG 存在时嵌入图片
+REPORT_FORMATS = ("csv", "xlsx", "docx", "png", "svg")
+
+# 请求 svg 时的生成方式：eager 随报告绘制；lazy 只写入 SVG_SPEC_JSON，
+# 之后由 report_coordinator.render_deferred_svgs 按需生成
+SVG_MODES = ("eager", "lazy")
+
+# lazy 模式下记录待生成 SVG 的图形描述（与 Info_Image.csv 同目录）
+SVG_SPEC_JSON = "Image_SvgSpec.json"
+
+# 分析流水线各阶段的耗时 / CPU / 峰值内存汇总（与 Info_Image.csv 同目录）
+TIMINGS_JSON = "timings.json"
+# Chrome trace-event 格式的详细埋点（chrome://tracing 或 Perfetto 打开），按需生成
+TRACE_JSON = "trace.json"
@@ -1,19 +1,29 @@
 import logging
 
-from battery_analysis.utils.report_coordinator import ReportCoordinator
+from battery_analysis.utils.instrumentation import span
+from battery_analysis.utils.report_coordinator import REPORT_FORMATS, ReportCoordinator
 from battery_analysis.utils.json_writer import JsonWriter
 
 
 def write_all(strResultPath: str, listTestInfo: list, listBatteryInfo: list,
-              equipment_info: dict | None = None) -> None:
-    """写入 Excel/Word/CSV/JSON 报告（FileWriter 的简化替代）"""
+              equipment_info: dict | None = None, formats=REPORT_FORMATS, executor=None,
+              svg_mode: str = "eager", on_progress=None) -> dict:
+    """写入 Excel/Word/CSV/JSON 报告（FileWriter 的简化替代）
+
+    formats 选择 ReportCoordinator 生成的格式（见 REPORT_FORMATS），JSON 总会写入；
+    executor 为渲染任务所用的 TaskExecutor（None 表示共享进程池），svg_mode 见 SVG_MODES，
+    on_progress 见 ReportCoordinator.write。返回 ReportCoordinator.write 的各阶段耗时。
+    """
     # ── 后向兼容：接受 TestInfo 实例 ──────────────────────────
     from battery_analysis.domain.entities.test_info import TestInfo
     if isinstance(listTestInfo, TestInfo):
         listTestInfo = listTestInfo.to_list()
 
-    ReportCoordinator(strResultPath, listTestInfo, listBatteryInfo, equipment_info).write()
-    JsonWriter(strResultPath, listTestInfo, listBatteryInfo)
+    timings = ReportCoordinator(strResultPath, listTestInfo, listBatteryInfo, equipment_info).write(
+        formats, executor=executor, svg_mode=svg_mode, on_progress=on_progress)
+    with span("report.json"):
+        JsonWriter(strResultPath, listTestInfo, listBatteryInfo)
+    return timings
 
 
 class FileWriter:
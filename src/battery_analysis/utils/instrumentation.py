@@ -0,0 +1,275 @@
+"""
+性能埋点模块
+
+span(name) 是记录一段代码耗时的上下文管理器：墙钟时间、所在线程的 CPU 时间
+以及结束时的进程峰值常驻内存。只有在 profiling(profiler) 范围内才会记录，
+否则几乎没有开销，因此可以常驻在热路径中。
+
+子进程中的埋点由 TaskExecutor 通过 collect() 收集并随结果返回，合并到主进程
+的 Profiler 中（同名 span 跨进程累计）。Profiler 可写出阶段汇总（TIMINGS_JSON）
+与 Chrome trace-event 格式的明细（TRACE_JSON）。
+
+StageProgress 按各阶段的实测耗时（通常取自上一次运行的 TIMINGS_JSON）分配
+0-100 的进度区间，替代固定的进度百分比。
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+
+logger = logging.getLogger(__name__)
+
+# TIMINGS_JSON 格式版本
+TIMINGS_FORMAT = 1
+
+# 当前进程启用的 Profiler（None 表示不记录）
+_active = None
+_local = threading.local()
+
+
+def peak_rss() -> int:
+    """当前进程的峰值常驻内存（字节），平台不支持时为 0"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        try:
+            import psutil
+            return int(psutil.Process().memory_info().peak_wset)
+        except (ImportError, AttributeError, OSError):
+            return 0
+    # Linux 的 ru_maxrss 单位为 KB，macOS 为字节
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+
+@dataclass
+class SpanRecord:
+    """一次 span 的测量结果
+
+    Attributes:
+        name: 名称（"阶段.子阶段"）
+        parent: 同一线程中外层 span 的名称
+        start: 开始时刻（time.time()，跨进程可比）
+        wall: 墙钟耗时（秒）
+        cpu: 所在线程的 CPU 耗时（秒）
+        peak_rss: 结束时的进程峰值常驻内存（字节）
+        pid: 进程号
+        tid: 线程号
+        input_bytes: 调用方附带的输入大小（字节），未提供时为 0
+    """
+    name: str
+    parent: str
+    start: float
+    wall: float
+    cpu: float
+    peak_rss: int
+    pid: int
+    tid: int
+    input_bytes: int = 0
+
+
+class Profiler:
+    """收集 SpanRecord 并生成汇总 / trace（线程安全）"""
+
+    def __init__(self):
+        self.origin = time.time()
+        self.records = []
+        self._lock = threading.Lock()
+        # 创建者所在的进程 / 线程：其顶层 span 即流水线阶段
+        self._owner = (os.getpid(), threading.get_ident())
+
+    def add(self, record: SpanRecord) -> None:
+        with self._lock:
+            self.records.append(record)
+
+    def extend(self, records) -> None:
+        with self._lock:
+            self.records.extend(records)
+
+    def summary(self) -> dict:
+        """按名称聚合：{名称: {"count", "wall", "cpu", "peak_rss"}}，按首次出现排序
+
+        同名 span 的 wall / cpu 为累计值（多个工作进程并行时可大于实际经过时间），
+        peak_rss 为最大值。
+        """
+        result = {}
+        with self._lock:
+            records = sorted(self.records, key=lambda record: record.start)
+        for record in records:
+            entry = result.setdefault(record.name, {"count": 0, "wall": 0.0, "cpu": 0.0, "peak_rss": 0})
+            entry["count"] += 1
+            entry["wall"] += record.wall
+            entry["cpu"] += record.cpu
+            entry["peak_rss"] = max(entry["peak_rss"], record.peak_rss)
+        return result
+
+    def stage_weights(self) -> dict:
+        """创建者线程中顶层 span 的名称 → 墙钟耗时，供 StageProgress 使用"""
+        weights = {}
+        with self._lock:
+            for record in self.records:
+                if not record.parent and (record.pid, record.tid) == self._owner:
+                    weights[record.name] = weights.get(record.name, 0.0) + record.wall
+        return weights
+
+    def to_dict(self) -> dict:
+        return {
+            "format": TIMINGS_FORMAT,
+            "stages": self.stage_weights(),
+            "spans": self.summary(),
+            "peak_rss": max((record.peak_rss for record in self.records), default=0),
+        }
+
+    def write_timings(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def write_trace(self, path: str) -> None:
+        """写出 Chrome trace-event 格式（每个 span 一个完整事件 "X"，时间单位微秒）"""
+        with self._lock:
+            records = list(self.records)
+        main_pid = self._owner[0]
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                   "args": {"name": "main" if pid == main_pid else f"worker {pid}"}}
+                  for pid in sorted({record.pid for record in records})]
+        for record in records:
+            events.append({
+                "name": record.name, "cat": record.name.split(".", 1)[0], "ph": "X",
+                "ts": round((record.start - self.origin) * 1e6, 1), "dur": round(record.wall * 1e6, 1),
+                "pid": record.pid, "tid": record.tid,
+                "args": {"cpu_ms": round(record.cpu * 1e3, 3), "peak_rss_mb": round(record.peak_rss / 2 ** 20, 1)},
+            })
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+@contextmanager
+def span(name: str, input_bytes: int = 0):
+    """记录 with 范围内代码的耗时；当前进程未启用 Profiler 时不做任何事
+
+    Args:
+        name: 名称，约定为 "阶段.子阶段"（如 "file.read"）
+        input_bytes: 随记录保存的输入大小（字节），供按数据量估计资源使用
+    """
+    profiler = _active
+    if profiler is None:
+        yield
+        return
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    parent = stack[-1] if stack else ""
+    stack.append(name)
+    start, cpu, wall = time.time(), time.thread_time(), time.perf_counter()
+    try:
+        yield
+    finally:
+        wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+        stack.pop()
+        profiler.add(SpanRecord(name, parent, start, wall, cpu, peak_rss(), os.getpid(), threading.get_ident(),
+                                input_bytes))
+
+
+def active_profiler():
+    """当前进程启用的 Profiler，未启用时为 None"""
+    return _active
+
+
+@contextmanager
+def profiling(profiler: Profiler):
+    """在 with 范围内启用 profiler（可嵌套，退出时恢复外层）"""
+    global _active  # pylint: disable=global-statement
+    previous, _active = _active, profiler
+    try:
+        yield profiler
+    finally:
+        _active = previous
+
+
+def collect(fn, *args):
+    """在临时 Profiler 下调用 fn(*args)，返回 (结果, [SpanRecord 字典, ...])
+
+    供子进程中的任务使用：埋点以字典形式随结果返回，主进程用 merge_collected 合并。
+    """
+    with profiling(Profiler()) as profiler:
+        value = fn(*args)
+    return value, [asdict(record) for record in profiler.records]
+
+
+def merge_collected(records) -> None:
+    """把 collect 返回的埋点并入当前进程的 Profiler（未启用时丢弃）"""
+    if _active is not None and records:
+        _active.extend(SpanRecord(**record) for record in records)
+
+
+def load_stage_weights(path: str | None) -> dict:
+    """读取 TIMINGS_JSON 中的阶段耗时；文件不存在或无效时返回空字典"""
+    if not path or not os.path.isfile(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.debug("Ignoring unreadable timings %s: %s", path, e)
+        return {}
+    if not isinstance(data, dict) or data.get("format") != TIMINGS_FORMAT:
+        return {}
+    stages = data.get("stages")
+    return {name: float(seconds) for name, seconds in stages.items()
+            if isinstance(seconds, (int, float)) and seconds >= 0} if isinstance(stages, dict) else {}
+
+
+class StageProgress:
+    """把各阶段内的完成比例映射为 0-100 的总体进度
+
+    各阶段占用的区间与其权重（耗时）成正比；阶段内用 update 报告完成比例。
+    回调收到的进度单调不减。
+
+    Args:
+        callback: 回调 (进度 0-100, 状态文本)；为 None 时不报告
+        stages: 有序的 {阶段名: 默认权重}
+        measured: 实测的 {阶段名: 耗时}（如上一次运行的记录）；覆盖全部阶段时替代默认权重，
+            否则（如上次运行中途失败）忽略，避免实测秒数与默认权重混用
+    """
+
+    def __init__(self, callback, stages: dict, measured: dict | None = None):
+        self._callback = callback
+        if measured and all(name in measured for name in stages):
+            weights = {name: measured[name] for name in stages}
+        else:
+            weights = dict(stages)
+        # 实测为 0 的阶段保留最小区间，避免进度条在该阶段停滞时看不出变化
+        total = sum(weights.values()) or 1.0
+        weights = {name: max(weight / total, 0.005) for name, weight in weights.items()}
+        total = sum(weights.values())
+        self._start, position = {}, 0.0
+        for name, weight in weights.items():
+            self._start[name] = position / total * 100
+            position += weight
+        self._span = {name: weights[name] / total * 100 for name in weights}
+        self._value = 0
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def start(self, stage: str, status: str) -> None:
+        """进入阶段（进度为该阶段区间的起点）"""
+        self.update(stage, 0.0, status)
+
+    def update(self, stage: str, fraction: float, status: str) -> None:
+        """报告阶段内的完成比例（0-1）"""
+        value = int(self._start[stage] + self._span[stage] * min(max(fraction, 0.0), 1.0))
+        self._emit(max(value, self._value), status)
+
+    def finish(self, status: str) -> None:
+        self._emit(100, status)
+
+    def _emit(self, value: int, status: str) -> None:
+        self._value = value
+        if self._callback:
+            self._callback(value, status)
@@ -6,17 +6,112 @@
 - 文件日志输出（带轮转功能）
 - 环境信息记录
 - 统一的日志获取接口
+
+日志记录经 QueueHandler 放入队列，由 QueueListener 的后台线程写入控制台与文件，
+GUI 线程和分析线程不等待磁盘 I/O。进程池的工作进程通过 configure_worker_logging
+把日志经 multiprocessing 队列转发给主进程的监听器，写入同一个日志文件。
+INFO/DEBUG 日志按调用位置限流（RateLimitFilter），逐文件日志在大批量分析时不会刷屏。
 """
 
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 import sys
 import datetime
 import platform
+import threading
+import time
 import psutil
 from pathlib import Path
 
+# 工作进程转发给主进程的最低日志级别（DEBUG 记录量大，在工作进程内丢弃）
+WORKER_LOG_LEVEL = logging.INFO
+
+# 同一调用位置的 INFO/DEBUG 日志在每个时间窗口（秒）内最多放行的条数
+RATE_LIMIT_BURST = 20
+RATE_LIMIT_WINDOW = 1.0
+
+# 运行中的 QueueListener 及其处理器，重新配置或退出时停止并关闭
+_active_listeners = []
+
+
+class RateLimitFilter(logging.Filter):
+    """限制同一调用位置的 INFO/DEBUG 日志频率，WARNING 及以上不受限制
+
+    每个 (logger 名, 源文件, 行号) 在 window 秒内最多放行 burst 条；
+    下一个窗口放行的第一条记录附带被抑制的条数。
+
+    Args:
+        burst: 每个窗口放行的条数
+        window: 窗口长度（秒）
+    """
+
+    def __init__(self, burst: int = RATE_LIMIT_BURST, window: float = RATE_LIMIT_WINDOW):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        # 调用位置 → [窗口起点, 已放行条数, 已抑制条数]
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            state = self._windows.get(key)
+            if state is None or now - state[0] >= self.window:
+                suppressed = state[2] if state else 0
+                self._windows[key] = [now, 1, 0]
+                if suppressed:
+                    record.msg = f"{record.getMessage()} ({suppressed} similar messages suppressed)"
+                    record.args = None
+                return True
+            if state[1] < self.burst:
+                state[1] += 1
+                return True
+            state[2] += 1
+            return False
+
+
+def _start_listener(log_queue, handlers) -> logging.handlers.QueueListener:
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _active_listeners.append((listener, handlers))
+    return listener
+
+
+def _stop_listeners() -> None:
+    """停止全部监听器（写完队列中剩余的记录）并关闭其处理器"""
+    while _active_listeners:
+        listener, handlers = _active_listeners.pop()
+        listener.stop()
+        for handler in handlers:
+            handler.close()
+
+
+atexit.register(_stop_listeners)
+
+
+def configure_worker_logging(log_queue, level: int = WORKER_LOG_LEVEL) -> None:
+    """工作进程初始化函数：把根日志记录器的输出全部经 log_queue 转发给主进程
+
+    Args:
+        log_queue: LogManager.worker_log_queue() 返回的 multiprocessing 队列
+        level: 转发的最低级别
+    """
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    handler = logging.handlers.QueueHandler(log_queue)
+    handler.addFilter(RateLimitFilter())
+    root.addHandler(handler)
+    root.setLevel(level)
+
 
 class LogManager:
     """日志管理器类，负责配置和管理应用程序日志"""
@@ -26,6 +121,9 @@ class LogManager:
         self.log_dir = None
         self.logger = None
         self._current_log_file = None
+        self._handlers = []
+        self._worker_queue = None
+        self._lock = threading.Lock()
         self._configure_logging()
     
     def _get_log_directory(self):
@@ -71,10 +169,11 @@ class LogManager:
         self.logger.setLevel(logging.DEBUG)  # 捕获所有级别的日志
         self.logger.propagate = False
         
-        # 移除已有的处理器（避免重复配置）
+        # 移除已有的处理器并停止其监听线程（避免重复配置）
         for handler in self.logger.handlers[:]:
             self.logger.removeHandler(handler)
             handler.close()
+        _stop_listeners()
         
         # 创建格式化器
         formatter = logging.Formatter(
@@ -86,7 +185,6 @@ class LogManager:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.WARNING)  # 控制台只显示WARNING及以上级别
         console_handler.setFormatter(formatter)
-        self.logger.addHandler(console_handler)
         
         # 文件处理器 - 直接创建带时间戳的新日志文件
         file_handler = logging.FileHandler(
@@ -96,7 +194,14 @@ class LogManager:
         )
         file_handler.setLevel(logging.DEBUG)  # 文件记录所有级别
         file_handler.setFormatter(formatter)
-        self.logger.addHandler(file_handler)
+        self._handlers = [console_handler, file_handler]
+
+        # 记录入队后由监听线程写出，调用线程不等待控制台与磁盘 I/O
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.addFilter(RateLimitFilter())
+        self.logger.addHandler(queue_handler)
+        _start_listener(log_queue, self._handlers)
         
         # 清理旧日志文件，只保留10个
         self._cleanup_old_logs(10)
@@ -104,6 +209,20 @@ class LogManager:
         # 环境信息延后记录，不阻塞启动
         # self._log_environment_info() 改由外部在适当时机调用
 
+    def worker_log_queue(self):
+        """工作进程转发日志用的队列，首次调用时创建并启动对应的监听线程
+
+        Returns:
+            multiprocessing 队列，作为 configure_worker_logging 的参数传给进程池
+        """
+        from battery_analysis.utils.resource_manager import ResourceManager
+
+        with self._lock:
+            if self._worker_queue is None:
+                self._worker_queue = ResourceManager.get_processing_context().Queue()
+                _start_listener(self._worker_queue, self._handlers)
+            return self._worker_queue
+
     def log_environment_info(self):
         """对外暴露：记录环境信息，可在启动完成后调用"""
         self._log_environment_info()
@@ -257,6 +376,17 @@ def get_log_manager():
     return _log_manager
 
 
+def get_worker_log_queue():
+    """已创建 LogManager 时返回工作进程转发日志的队列
+
+    Returns:
+        multiprocessing 队列；未创建 LogManager（如命令行）时为 None，工作进程自行输出到 stderr
+    """
+    if _log_manager is None:
+        return None
+    return _log_manager.worker_log_queue()
+
+
 def get_log_directory():
     """获取日志目录的便捷函数
     
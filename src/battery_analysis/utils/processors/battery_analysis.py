@@ -8,40 +8,51 @@
   - processors.pulse_detector: 脉冲行检测
   - processors.pulse_matcher: 电流/电压等级匹配
   - processors.charge_calculator: 电荷量计算
+  - processors.pulse_curves: 单文件绘图曲线的紧凑表示（扁平数组 + 偏移）
   - writers.info_csv_writer: 绘图用 CSV/JSON 写入
+  - processors.result_manifest: 增量分析结果清单
 """
 
 import csv
-import concurrent.futures
 import datetime
 import json
 import logging
-import multiprocessing
 import os
 import re
-import sys
+import time
 import traceback
 
 from battery_analysis.utils.exceptions import BatteryAnalysisException
 from battery_analysis.utils.processors.data_utils import generate_current_type_string
 from battery_analysis.utils.file_finder import scan_sorted_xlsx
+from battery_analysis.utils.instrumentation import Profiler, StageProgress, active_profiler, profiling, span
+from battery_analysis.utils.resource_manager import ResourceManager, ResourceProfile
+from battery_analysis.utils.task_executor import TaskExecutor
+from battery_analysis.utils.readers.sheet_cache import file_fingerprint
 from battery_analysis.utils.readers.xlsx_reader import (
-    read_xlsx_sheets,
+    read_analysis_sheets,
     extract_test_date_from_xls,
 )
 from battery_analysis.utils.processors.pulse_detector import detect_pulse_rows
 from battery_analysis.utils.processors.pulse_matcher import match_pulse_levels
 from battery_analysis.utils.processors.charge_calculator import ChargeCalculator
+from battery_analysis.utils.processors.pulse_curves import PulseCurves
+from battery_analysis.utils.processors.result_manifest import (
+    ResultManifest,
+    find_previous_manifest,
+    read_manifest_file,
+)
 from battery_analysis.utils.writers.info_csv_writer import (
-    write_info_csv,
+    InfoImageWriter,
+    write_info_image,
     write_info_json,
 )
 
 if __name__ == '__main__':
     pass
 
-logging.basicConfig(level=logging.WARNING,
-                    format='%(asctime)s - %(levelname)s - %(message)s')
+# 单独运行时各阶段的默认进度权重（100 个合成文件实测：扫描与提交均不足 1%）
+ANALYSIS_STAGES = {"scan": 1, "files": 98, "commit": 1}
 
 
 class BatteryAnalysis:
@@ -51,8 +62,28 @@ class BatteryAnalysis:
     计算电荷量，输出 CSV/JSON 结果供图表工具使用。
     """
 
+    # 视为单个文件失败并跳过的异常
+    SKIPPED_FILE_ERRORS = (FileNotFoundError, PermissionError, ValueError, KeyError,
+                           IndexError, BatteryAnalysisException)
+
+    # 增量清单的检查点：每新增这么多个结果或间隔这么多秒写入一次 V<版本> 目录，
+    # 运行中断后重新分析时可复用已完成的文件
+    MANIFEST_CHECKPOINT_FILES = 20
+    MANIFEST_CHECKPOINT_SECONDS = 10.0
+
     def __init__(self, strInDataXlsxDir: str, strResultPath: str, listTestInfo: list,
-                 progress_callback=None) -> None:
+                 progress_callback=None, incremental: bool = False,
+                 previous_manifest=None, executor: TaskExecutor | None = None,
+                 auto_run: bool = True, progress: StageProgress | None = None) -> None:
+        """
+        Args:
+            progress_callback: 回调 (进度 0-100, 状态文本)，按 ANALYSIS_STAGES 分配进度
+            incremental: 为 True 时复用上次分析清单中指纹未变文件的结果
+            previous_manifest: 已读取的清单 dict；为 None 时在 strResultPath 下自动查找
+            executor: 单文件分析所用的执行器；为 None 时使用共享进程池
+            auto_run: 为 False 时不在构造时执行 run()，由调用方分阶段驱动
+            progress: 调用方的整体进度（须含 ANALYSIS_STAGES 中的阶段）；提供时忽略 progress_callback
+        """
         # ── 后向兼容：接受 TestInfo 实例 ──────────────────────────
         from battery_analysis.domain.entities.test_info import TestInfo
         if isinstance(listTestInfo, TestInfo):
@@ -97,9 +128,9 @@ class BatteryAnalysis:
         self.test_date = "00000000"
         self.original_cycle_date = "00000000"
 
-        self.listAllPosiForInfoImageCsv = []
-        self.listAllChargeForInfoImageCsv = []
-        self.listAllVoltageForInfoImageCsv = []
+        # 每个电池一个 PulseCurves（各电流等级的位置 / 电荷 / 电压曲线）；
+        # run() 边合并边写出，不在此保留，仅 UBA_AnalysisXlsx 逐文件分析时使用
+        self.listAllCurves = []
 
         self.strErrorLog = ""
 
@@ -108,152 +139,247 @@ class BatteryAnalysis:
         self._log_buffer_size = 0
         self._max_buffer_size = 1024 * 10
 
-        # 保存进度回调供 run() 使用
-        self._progress_callback = progress_callback
+        # 供 run() 报告进度
+        self._progress = progress or StageProgress(progress_callback, ANALYSIS_STAGES)
+
+        # 增量分析
+        self.bIncremental = incremental
+        self._previous_manifest = previous_manifest
+        self.listReusedXlsx = []
+
+        self._executor = executor
+
+        # 分阶段执行的状态（begin_run 中初始化）
+        self._manifest = None
+        self._writer = None
+        self._result_dir = ""
+        self._pending_idx = []
+        self._ready = {}
+        self._next_idx = 0
+        self._unsaved_results = 0
+        self._last_checkpoint = 0.0
 
         # 初始化后自动执行（保持向后兼容）
-        self.run(strResultPath)
+        if auto_run:
+            self.run(strResultPath)
 
     def run(self, strResultPath: str = "") -> None:
-        """执行分析流程：扫描文件 → 并行处理 → 合并 → 写入CSV。
+        """执行分析流程：扫描文件 → 并行处理 → 按文件顺序边合并边写入 CSV。
 
-        从 __init__ 中提取，支持独立调用和重入。
+        从 __init__ 中提取，支持独立调用和重入。批量调度器等需要自行调度
+        单文件任务的调用方可改用 begin_run / accept_result / finish_run 分阶段驱动。
         """
         if not strResultPath:
             return
 
-        progress_callback = self._progress_callback
+        progress = self._progress
         try:
-            # ── 扫描文件 ──────────────────────────────────────────
-            self.listAllInXlsx = scan_sorted_xlsx(self.strInDataXlsxDir)
+            progress.start("scan", "Reading Excel file...")
+            with span("scan"):
+                process_args = self.begin_run(strResultPath)
 
-            if not self.listAllInXlsx:
-                raise BatteryAnalysisException("[Input Path Error]: has no data file")
+            try:
+                if process_args:
+                    progress.start("files", "Analyzing battery data in parallel...")
+                    # 未启用埋点时也收集子进程的峰值内存，用于下次估计单文件内存
+                    profiler = active_profiler() or Profiler()
+                    with profiling(profiler), span("files"):
+                        executor = self._executor or TaskExecutor()
+                        profile = ResourceProfile()
+                        plan = ResourceManager.recommend([arg[0] for arg in process_args],
+                                                         executor.max_workers, profile)
+                        completed_results = executor.imap_unordered(
+                            self._parallel_process_file, process_args,
+                            skip_exceptions=self.SKIPPED_FILE_ERRORS,
+                            on_error=lambda idx, e: self.log_file_error(process_args[idx][0], e),
+                            chunk_size=executor.chunk_size or plan.chunk_size,
+                            max_concurrent=plan.workers)
+                        total = len(process_args)
+                        for completed, (idx, result) in enumerate(completed_results, start=1):
+                            self.accept_result(idx, result)
+                            progress.update("files", completed / total,
+                                            f"Analyzing battery data... ({completed}/{total})")
+                    self._record_worker_memory(profiler, profile)
+
+                progress.start("commit", "Writing CSV file...")
+                with span("commit"):
+                    self.finish_run()
+            except BaseException:
+                self.abort_run()
+                raise
+
+            progress.update("commit", 1.0, "Data processing complete")
 
-            # ── 获取测试日期 ──────────────────────────────────────
-            first_date = extract_test_date_from_xls(self.listAllInXlsx[0])
-            if first_date != "00000000":
-                self.test_date = first_date
+        except (IOError, OSError, ValueError,
+                BatteryAnalysisException, KeyError) as e:
+            self.strErrorLog = str(e)
+            if not isinstance(e, (BatteryAnalysisException, KeyError)):
+                traceback.print_exc()
 
-            # ── 并行处理 ──────────────────────────────────────────
-            process_args = [
-                (file_path, self.listCurrentLevel, self.listVoltageLevel)
-                for file_path in self.listAllInXlsx
-            ]
+    # ────────────────────────────────────────────────────────────
+    #  分阶段执行
+    # ────────────────────────────────────────────────────────────
+    def begin_run(self, strResultPath: str) -> list:
+        """扫描文件、加载增量清单并写出可复用的结果
 
-            results = []
-            is_frozen = getattr(sys, 'frozen', False)
-
-            if progress_callback:
-                progress_callback(12, "Reading Excel file...")
-
-            if is_frozen or sys.platform.startswith('win'):
-                from battery_analysis.utils.resource_manager import ResourceManager
-                max_processes = ResourceManager.get_optimal_process_count()
-                ctx = ResourceManager.get_processing_context()
-
-                with concurrent.futures.ProcessPoolExecutor(
-                    max_workers=max_processes, mp_context=ctx
-                ) as executor:
-                    future_to_idx = {
-                        executor.submit(self._parallel_process_file, args): idx
-                        for idx, args in enumerate(process_args)
-                    }
-
-                    if progress_callback:
-                        progress_callback(15, "Analyzing battery data in parallel...")
-
-                    results_map = {}
-                    completed = 0
-                    total = len(future_to_idx)
-                    for future in concurrent.futures.as_completed(future_to_idx):
-                        idx = future_to_idx[future]
-                        try:
-                            result = future.result()
-                            if result is not None:
-                                results_map[idx] = result
-                        except (FileNotFoundError, PermissionError,
-                                ValueError, KeyError, IndexError,
-                                BatteryAnalysisException) as e:
-                            file_name = (process_args[idx][0]
-                                         if idx < len(process_args)
-                                         else "unknown")
-                            logging.error("Error processing file (skipped): %s - %s",
-                                          file_name, e)
-                            # 跳过失败文件，继续处理其余文件
-
-                        completed += 1
-                        if progress_callback and total > 1:
-                            pct = 15 + int((completed / total) * 35)
-                            progress_callback(
-                                pct, f"Analyzing battery data... ({completed}/{total})")
-
-                    results = [results_map.get(i) for i in range(len(process_args))]
-                    results = [r for r in results if r is not None]
-
-                    if not results:
-                        raise BatteryAnalysisException(
-                            "[Analysis Error]: All files failed to process, please check the data format")
-
-            else:
-                cpu_count = min(multiprocessing.cpu_count(), 4)
-                if progress_callback:
-                    progress_callback(15, "Analyzing battery data in parallel...")
-                with multiprocessing.Pool(processes=cpu_count) as pool:
-                    try:
-                        results = pool.map(self._parallel_process_file, process_args)
-                    except (FileNotFoundError, PermissionError,
-                            ValueError, KeyError, IndexError,
-                            BatteryAnalysisException) as e:
-                        logging.error("Error while processing files in parallel: %s", e)
-                        pool.terminate()
-                        raise BatteryAnalysisException(f"Parallel processing failed: {str(e)}")
-                    finally:
-                        pool.close()
-                        pool.join()
-
-            # ── 合并结果 ──────────────────────────────────────────
-            for battery_name, battery_charge, posi_data, \
-                    voltage_data, charge_data, timestamp_info in results:
-                self.listBatteryName.append(battery_name)
-                self.listAllBatteryCharge.append(battery_charge)
-                self.listAllPosiForInfoImageCsv.append(posi_data)
-                self.listAllVoltageForInfoImageCsv.append(voltage_data)
-                self.listAllChargeForInfoImageCsv.append(charge_data)
-
-                if not self.listTimeStamp:
-                    self.listTimeStamp = timestamp_info
-                else:
-                    self.listTimeStamp[0] = self._str_compare_date(
-                        timestamp_info[0], self.listTimeStamp[0], True)
-                    self.listTimeStamp[1] = self._str_compare_date(
-                        timestamp_info[1], self.listTimeStamp[1], False)
+        Returns:
+            待分析文件的参数列表，元素交给 _parallel_process_file 执行；
+            完成后以其下标调用 accept_result
 
-            if progress_callback:
-                progress_callback(52, "Writing CSV file...")
+        Raises:
+            BatteryAnalysisException: 输入目录没有数据文件
+        """
+        # ── 扫描文件 ──────────────────────────────────────────────
+        self.listAllInXlsx = scan_sorted_xlsx(self.strInDataXlsxDir)
+
+        if not self.listAllInXlsx:
+            raise BatteryAnalysisException("[Input Path Error]: has no data file")
+
+        # ── 获取测试日期 ──────────────────────────────────────────
+        first_date = extract_test_date_from_xls(self.listAllInXlsx[0])
+        if first_date != "00000000":
+            self.test_date = first_date
+
+        # ── 增量：复用未变化文件的结果 ────────────────────────────
+        self._manifest = self._load_manifest(strResultPath) if self.bIncremental else None
+        cached_results = {}
+        if self._manifest is not None:
+            for idx, file_path in enumerate(self.listAllInXlsx):
+                cached = self._manifest.lookup(file_path)
+                if cached is not None:
+                    cached_results[idx] = cached
+            self.listReusedXlsx = [self.listAllInXlsx[idx] for idx in sorted(cached_results)]
+            logging.info("Incremental analysis: reusing %d of %d files",
+                         len(cached_results), len(self.listAllInXlsx))
+
+        # ── 结果按完成顺序到达，按文件顺序流式写出 ────────────────
+        self._result_dir = f"{strResultPath}/V{self.listTestInfo[16]}"
+        self._writer = None
+        self._unsaved_results = 0
+        self._last_checkpoint = time.monotonic()
+        self._pending_idx = [idx for idx in range(len(self.listAllInXlsx))
+                             if idx not in cached_results]
+        # 下标 → 结果（失败为 None）；排在前面的文件完成前，后续结果在此等待
+        self._ready = cached_results
+        self._next_idx = 0
+        self._drain_ready()
+        return [
+            (self.listAllInXlsx[idx], self.listCurrentLevel, self.listVoltageLevel)
+            for idx in self._pending_idx
+        ]
 
-            # ── 输出结果 ──────────────────────────────────────────
-            self.UBA_WriteCsv(f"{strResultPath}/V{self.listTestInfo[16]}")
+    def accept_result(self, idx: int, result) -> None:
+        """接收 begin_run 返回的第 idx 个任务的结果（失败为 None），可按任意顺序调用"""
+        file_idx = self._pending_idx[idx]
+        self._ready[file_idx] = result
+        if self._manifest is not None and result is not None:
+            self._manifest.record(self.listAllInXlsx[file_idx], result, fingerprint=result[4])
+            self._unsaved_results += 1
+            self._checkpoint_manifest()
+        self._drain_ready()
+
+    def _checkpoint_manifest(self) -> None:
+        """新增结果足够多或距上次写入足够久时，把增量清单写入 V<版本> 目录"""
+        if (self._unsaved_results < self.MANIFEST_CHECKPOINT_FILES
+                and time.monotonic() - self._last_checkpoint < self.MANIFEST_CHECKPOINT_SECONDS):
+            return
+        self._manifest.save(self._result_dir)
+        self._unsaved_results = 0
+        self._last_checkpoint = time.monotonic()
 
-            if progress_callback:
-                progress_callback(55, "Data processing complete")
+    def finish_run(self) -> None:
+        """提交 Info_Image、写入 Info_Plot.json 并保存增量清单
 
-        except (IOError, OSError, ValueError,
-                BatteryAnalysisException, KeyError) as e:
-            self.strErrorLog = str(e)
-            if not isinstance(e, (BatteryAnalysisException, KeyError)):
-                traceback.print_exc()
+        Raises:
+            BatteryAnalysisException: 所有文件都处理失败
+        """
+        if self._writer is None:
+            raise BatteryAnalysisException(
+                "[Analysis Error]: All files failed to process, please check the data format")
+        self._writer.commit()
+        write_info_json(self._result_dir, self.listTestInfo,
+                        current_levels=self.listCurrentLevel)
+
+        if self._manifest is not None:
+            self._manifest.retain(self.listAllInXlsx)
+            self._manifest.save(self._result_dir)
+
+    def abort_run(self) -> None:
+        """丢弃尚未提交的 Info_Image 临时文件"""
+        if self._writer is not None:
+            self._writer.abort()
+            self._writer = None
+
+    def _drain_ready(self) -> None:
+        while self._next_idx in self._ready:
+            result = self._ready.pop(self._next_idx)
+            if result is not None:
+                if self._writer is None:
+                    self._writer = InfoImageWriter(self._result_dir, len(self.listCurrentLevel))
+                self._merge_result(result, self._writer)
+            self._next_idx += 1
+
+    @staticmethod
+    def log_file_error(file_path: str, error: Exception) -> None:
+        """记录单个文件的失败（跳过该文件，继续处理其余文件）"""
+        logging.error("Error processing file (skipped): %s - %s", file_path, error)
+
+    def _merge_result(self, result: tuple, writer: InfoImageWriter) -> None:
+        """合并单个文件的分析结果：曲线直接写出，不在内存中保留"""
+        battery_name, battery_charge, curves, timestamp_info = result[:4]
+        self.listBatteryName.append(battery_name)
+        self.listAllBatteryCharge.append(battery_charge)
+        writer.add(battery_name, curves)
+
+        if not self.listTimeStamp:
+            self.listTimeStamp = list(timestamp_info)
+        else:
+            self.listTimeStamp[0] = self._str_compare_date(
+                timestamp_info[0], self.listTimeStamp[0], True)
+            self.listTimeStamp[1] = self._str_compare_date(
+                timestamp_info[1], self.listTimeStamp[1], False)
+
+    def _load_manifest(self, strResultPath: str) -> ResultManifest:
+        """加载上次分析的结果清单（参数不一致时为空清单）"""
+        data = self._previous_manifest
+        if data is None:
+            data = read_manifest_file(
+                find_previous_manifest(strResultPath, self.listTestInfo[16]))
+        return ResultManifest.from_dict(data, self.listCurrentLevel, self.listVoltageLevel)
 
     # ────────────────────────────────────────────────────────────
     #  文件级处理（pandas 主路径）
     # ────────────────────────────────────────────────────────────
+    @staticmethod
+    def _record_worker_memory(profiler: Profiler, profile: ResourceProfile) -> None:
+        """把各子进程的 (最大输入, 峰值内存) 写入内存记录；在本进程执行的任务不计入"""
+        per_worker = {}
+        for record in profiler.records:
+            if record.name == "file" and record.pid != os.getpid() and record.input_bytes:
+                size, rss = per_worker.get(record.pid, (0, 0))
+                per_worker[record.pid] = (max(size, record.input_bytes), max(rss, record.peak_rss))
+        for size, rss in per_worker.values():
+            profile.record(size, rss)
+
     @staticmethod
     def _parallel_process_file(args):
-        """pandas 主路径：读取并分析单个 xlsx 文件"""
-        strPath, listCurrentLevel, listVoltageLevel = args
+        """pandas 主路径：读取并分析单个 xlsx 文件（args 为 (路径, 电流等级, 电压等级)）
+
+        Returns:
+            (电池名, 各等级电荷, PulseCurves, 时间戳, 文件指纹)；文件指纹为读取前
+            计算的 file_fingerprint，供增量清单记录，与结果对应的是同一份文件内容
+        """
+        with span("file", input_bytes=ResourceManager.observe_input(args[0])):
+            return BatteryAnalysis._analyze_file(*args)
 
+    @staticmethod
+    def _analyze_file(strPath, listCurrentLevel, listVoltageLevel):
         try:
-            cycle_df, step_df, record_df = read_xlsx_sheets(strPath)
+            with span("file.read"):
+                # 指纹在读取前计算（与表格缓存共用一次哈希），分析期间文件被修改时
+                # 清单中记录的是旧内容的指纹，下次运行会重新分析
+                fingerprint = file_fingerprint(strPath)
+                cycle_df, step_df, record_df = read_analysis_sheets(strPath, fingerprint=fingerprint)
         except Exception as e:  # pylint: disable=broad-exception-caught
             # calamine 引擎异常类型随 pandas 版本变化，统一归一化为业务异常，
             # 由 worker 层的异常处理跳过该文件
@@ -291,50 +417,57 @@ class BatteryAnalysis:
         )
 
         # ── 脉冲检测 ────────────────────────────────────────────
-        pulse_mask = detect_pulse_rows(record_df)
+        with span("file.detect"):
+            pulse_mask = detect_pulse_rows(record_df)
         if pulse_mask.sum() == 0:
             raise BatteryAnalysisException(f"Pulse data not found: {strPath}")
 
         # ── 脉冲等级匹配 ────────────────────────────────────────
-        matched = match_pulse_levels(
-            record_current.tolist(),
-            record_voltage.tolist(),
-            pulse_mask.tolist(),
-            listCurrentLevel,
-            listVoltageLevel,
-            start_row=2,
-        )
+        with span("file.match"):
+            matched = match_pulse_levels(
+                record_current.to_numpy(),
+                record_voltage.to_numpy(),
+                pulse_mask.to_numpy(),
+                listCurrentLevel,
+                listVoltageLevel,
+                start_row=2,
+            )
         if matched is None:
             raise BatteryAnalysisException(f"Pulse data not found: {strPath}")
 
         listLevelToVoltage, listLevelToRow, listPosiForInfoImageCsv, listVoltageForInfoImageCsv = matched
 
-        # ── 电荷计算 ────────────────────────────────────────────
-        calculator = ChargeCalculator(cycle_df, step_df, record_df)
-
-        listOneBatteryCharge = []
-        for c in range(len(listCurrentLevel)):
-            for v in range(len(listVoltageLevel)):
-                charge = calculator.calculate(listLevelToRow[c][v])
-                listOneBatteryCharge.append(charge)
-
-        listChargeForInfoImageCsv = []
         for c, posi_list in enumerate(listPosiForInfoImageCsv):
-            charges = calculator.calculate(posi_list, is_single=False)
-            if len(charges) != len(listVoltageForInfoImageCsv[c]):
+            if len(posi_list) != len(listVoltageForInfoImageCsv[c]):
                 raise BatteryAnalysisException(
                     f"[Plt Data Error]: battery {battery_name} "
                     f"{listCurrentLevel[c]}mA pulse, "
                     f"charge is not equal to voltage")
-            listChargeForInfoImageCsv.append(charges)
+
+        # ── 电荷计算 ────────────────────────────────────────────
+        with span("file.charge"):
+            calculator = ChargeCalculator(cycle_df, step_df, record_df)
+
+            # 所有 (电流, 电压) 等级的行位置一次批量查询，按 c 主序展开
+            level_rows = [row for rows in listLevelToRow for row in rows]
+            level_charges, level_valid = calculator.calculate_batch(level_rows)
+            listOneBatteryCharge = [
+                round(charge) if valid else 0
+                for charge, valid in zip(level_charges.tolist(), level_valid.tolist())
+            ]
+
+            # 绘图曲线：所有电流等级的位置一次批量计算电荷，结果以扁平数组返回主进程
+            curve_charges, curve_valid = calculator.calculate_batch(
+                [posi for posi_list in listPosiForInfoImageCsv for posi in posi_list])
+            curves = PulseCurves.from_levels(
+                listPosiForInfoImageCsv, listVoltageForInfoImageCsv, curve_charges, curve_valid)
 
         return (
             battery_name,
             listOneBatteryCharge,
-            listPosiForInfoImageCsv,
-            listVoltageForInfoImageCsv,
-            listChargeForInfoImageCsv,
+            curves,
             listTimeStamp,
+            fingerprint,
         )
 
     # ────────────────────────────────────────────────────────────
@@ -381,13 +514,13 @@ class BatteryAnalysis:
         result = self._parallel_process_file(
             (strPath, self.listCurrentLevel, self.listVoltageLevel))
 
-        battery_name, battery_charge, posi_data, voltage_data, charge_data, timestamp_info = result
+        battery_name, battery_charge, curves, timestamp_info = result[:4]
 
         self.listBatteryName.append(battery_name)
         self.listAllBatteryCharge.append(battery_charge)
-        self.listAllPosiForInfoImageCsv.append(posi_data)
-        self.listAllVoltageForInfoImageCsv.append(voltage_data)
-        self.listAllChargeForInfoImageCsv.append(charge_data)
+        self.listAllCurves.append(curves)
+        posi_data = curves.posi_lists()
+        voltage_data = curves.voltage_lists()
 
         if not self.listTimeStamp:
             self.listTimeStamp = timestamp_info
@@ -438,17 +571,15 @@ class BatteryAnalysis:
     # ────────────────────────────────────────────────────────────
     def UBA_WriteCsv(self, _strResultPath: str) -> None:
         """写入 Info_Image.csv 和 Info_Plot.json"""
-        if not self.listAllPosiForInfoImageCsv:
+        if not self.listAllCurves:
             logging.error("No valid data to write to CSV file")
             return
 
-        write_info_csv(
+        write_info_image(
             _strResultPath,
             self.listBatteryName,
             self.listCurrentLevel,
-            self.listAllPosiForInfoImageCsv,
-            self.listAllChargeForInfoImageCsv,
-            self.listAllVoltageForInfoImageCsv,
+            self.listAllCurves,
         )
 
         write_info_json(
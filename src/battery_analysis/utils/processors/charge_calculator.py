@@ -1,13 +1,18 @@
 """充电量计算器"""
 import logging
 
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
 
 class ChargeCalculator:
-    """封装充电量计算逻辑，预计算累积数据以加速后续查询"""
+    """封装充电量计算逻辑，预计算累积数据以加速后续查询
+
+    所有查询所需数据在构造时转为连续的 NumPy 数组，批量位置查询通过
+    一次 ``np.searchsorted`` 加花式索引完成，不再逐行遍历 cycle 表。
+    """
 
     def __init__(self, cycle_df, step_df, record_df):
         """
@@ -16,80 +21,99 @@ class ChargeCalculator:
             step_df:  工作表1 (Step)  的 DataFrame，已用 pandas 读取
             record_df: 工作表2 (Record) 的 DataFrame，已用 pandas 读取
         """
-        self._cycle_cycle = cycle_df.iloc[:, 0]
-        self._record_cycle = record_df.iloc[:, 0]
         self._cycle_df_len = len(cycle_df)
         self._record_df_len = len(record_df)
 
         # 预计算 cycle 累积充电量
         cycle_charge = pd.to_numeric(cycle_df.iloc[:, 3], errors='coerce').fillna(0).abs()
-        self._cycle_cumsum = cycle_charge.cumsum().tolist()
+        self._cycle_cumsum = cycle_charge.cumsum().to_numpy(dtype=np.float64)
+
+        # cycle 号查找表：从第 2 行起取前缀最大值，使 searchsorted 结果与
+        # 原逐行 `cycle < row_cycle` 扫描的首个停止位置一致（容错 cycle 跳号/乱序）；
+        # NaN 在原比较中同样会终止扫描，故视为 +inf
+        cycle_numbers = pd.to_numeric(cycle_df.iloc[2:, 0], errors='coerce').to_numpy(dtype=np.float64)
+        cycle_numbers = np.where(np.isnan(cycle_numbers), np.inf, cycle_numbers)
+        self._cycle_lookup = np.maximum.accumulate(cycle_numbers) if len(cycle_numbers) else cycle_numbers
 
         # 预计算 step 数据（按 cycle 分组，排除脉冲步骤）
         step_data = step_df.iloc[2:].copy() if len(step_df) > 2 else step_df.iloc[0:0].copy()
         if len(step_data) > 0:
             step_data['_abs_charge'] = pd.to_numeric(step_data.iloc[:, 2], errors='coerce').fillna(0).abs()
             non_pulse = ~step_data.iloc[:, 1].astype(str).str.strip().isin(["脉冲", "Pulse"])
-            self._step_charge_by_cycle = step_data[non_pulse].groupby(step_data.iloc[:, 0])['_abs_charge'].sum()
+            step_charge_by_cycle = step_data[non_pulse].groupby(step_data.iloc[:, 0])['_abs_charge'].sum()
         else:
-            self._step_charge_by_cycle = pd.Series(dtype=float)
+            step_charge_by_cycle = pd.Series(dtype=float)
+
+        # step 分组结果转为有序 (cycle 号, 充电量) 数组，供 searchsorted 精确匹配
+        step_keys = pd.to_numeric(pd.Series(step_charge_by_cycle.index, dtype=object),
+                                  errors='coerce').to_numpy(dtype=np.float64)
+        step_values = step_charge_by_cycle.to_numpy(dtype=np.float64)
+        valid_keys = ~np.isnan(step_keys)
+        order = np.argsort(step_keys[valid_keys], kind='stable')
+        self._step_cycles = step_keys[valid_keys][order]
+        self._step_charges = step_values[valid_keys][order]
+
+        # 预计算 record 的 cycle 号与充电量绝对值
+        self._record_cycle_values = pd.to_numeric(
+            record_df.iloc[:, 0], errors='coerce').to_numpy(dtype=np.float64)
+        self._record_charge_values = pd.to_numeric(
+            record_df.iloc[:, 4], errors='coerce').fillna(0).abs().to_numpy(dtype=np.float64)
+
+    def calculate_batch(self, positions):
+        """批量计算多个行位置的累积充电量
+
+        Args:
+            positions: 行位置序列（Record 表 0 基行号）
 
-        # 预计算 record 充电量绝对值
-        self._record_charge_values = pd.to_numeric(record_df.iloc[:, 4], errors='coerce').fillna(0).abs()
+        Returns:
+            tuple[np.ndarray, np.ndarray]: (charges, valid)。charges 为未取整的
+            累积充电量（float64），valid 标记位置是否有效；无效位置（行号 < 2、
+            越界或 cycle 号缺失）的 charge 为 0。
+        """
+        pos = np.asarray(positions, dtype=np.int64).reshape(-1)
+        charges = np.zeros(len(pos), dtype=np.float64)
+
+        valid = (pos >= 2) & (pos < self._record_df_len)
+        row_cycle = np.full(len(pos), np.nan)
+        row_cycle[valid] = self._record_cycle_values[pos[valid]]
+        valid &= ~np.isnan(row_cycle)
+        if not valid.any():
+            return charges, valid
+
+        rows = pos[valid]
+        cycles = row_cycle[valid]
+
+        # 找 cycle 索引：第一个 cycle >= row_cycle 的行（与原 while 扫描等价）
+        cycle_idx = 2 + np.searchsorted(self._cycle_lookup, cycles, side='left')
+        charge = np.where(cycle_idx > 2, self._cycle_cumsum[np.maximum(cycle_idx - 1, 0)], 0.0)
+
+        # step 充电量：仅在 cycle 号精确命中时累加
+        if len(self._step_cycles):
+            step_idx = np.searchsorted(self._step_cycles, cycles, side='left')
+            step_idx_clipped = np.minimum(step_idx, len(self._step_cycles) - 1)
+            hit = (step_idx < len(self._step_cycles)) & (self._step_cycles[step_idx_clipped] == cycles)
+            charge = charge + np.where(hit, self._step_charges[step_idx_clipped], 0.0)
+
+        charge = charge + self._record_charge_values[rows]
+        charges[valid] = charge
+        return charges, valid
 
     def calculate(self, position_idx, is_single=True):
-        """计算指定行位置的累积充电量"""
+        """计算指定行位置的累积充电量
+
+        单点模式返回取整后的 int；批量模式返回与输入等长的列表，
+        无效位置填 0。
+        """
         if is_single:
-            positions = [position_idx]
-            single_result = True
-        else:
-            positions = position_idx
-            single_result = False
-
-        results = [0] * len(positions) if not single_result else [0]
-
-        for i, pos in enumerate(positions):
-            if not pos or pos < 2:
-                if single_result:
-                    return 0
-                continue
-            if pos >= self._record_df_len:
-                if single_result:
-                    return 0
-                continue
-
-            try:
-                row_cycle = self._record_cycle.iloc[pos]
-            except IndexError:
-                if single_result:
-                    return 0
-                continue
-
-            if pd.isna(row_cycle):
-                if single_result:
-                    return 0
-                continue
-
-            # 找 cycle 索引（用 < 而非 !=，容错 cycle 跳号）
-            cycle_idx = 2
-            while cycle_idx < self._cycle_df_len and self._cycle_cycle.iloc[cycle_idx] < row_cycle:
-                cycle_idx += 1
-
-            charge = self._cycle_cumsum[cycle_idx - 1] if cycle_idx > 2 else 0
-
-            try:
-                charge += self._step_charge_by_cycle.get(row_cycle, 0)
-            except (TypeError, KeyError):
-                pass
-
-            try:
-                charge += abs(self._record_charge_values.iloc[pos])
-            except (ValueError, TypeError):
-                pass
-
-            if single_result:
-                results[0] = round(charge)
-            else:
-                results[i] = charge
-
-        return results[0] if single_result else results
+            if not position_idx:
+                return 0
+            charges, valid = self.calculate_batch([position_idx])
+            return round(charges[0]) if valid[0] else 0
+
+        if len(position_idx) == 0:
+            return []
+        charges, valid = self.calculate_batch(position_idx)
+        results = charges.tolist()
+        for i in np.flatnonzero(~valid):
+            results[i] = 0
+        return results
@@ -53,18 +53,20 @@ def read_excel_file(file_path: str) -> dict:
         return {}
 
 
-def analyze_single_excel(file_path: str, filename: str) -> dict:
+def analyze_single_excel(file_path: str, filename: str | None = None) -> dict:
     """分析单个 Excel 文件，返回分析摘要
 
     Args:
         file_path: Excel 文件完整路径
-        filename: 文件名
+        filename: 文件名；None 表示取 file_path 的文件名部分
 
     Returns:
         包含分析结果的字典，失败时 error 键记录错误信息
     """
     import pandas as pd
 
+    if filename is None:
+        filename = os.path.basename(file_path)
     try:
         df = pd.read_excel(file_path, sheet_name=0, engine="calamine", header=0)
         df = optimize_dataframe_memory(df)
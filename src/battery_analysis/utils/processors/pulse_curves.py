@@ -0,0 +1,88 @@
+"""单个电池的脉冲绘图曲线（紧凑表示）
+
+每个电流等级一组 (位置, 电荷, 电压) 序列，三者等长，统一存放为扁平数组 +
+偏移：第 c 个电流等级的数据为 ``[offsets[c]:offsets[c + 1]]``。
+子进程把它作为单文件分析结果返回时，每个数组只序列化为一块连续缓冲区，
+不再逐元素 pickle 嵌套列表；主进程合并与写入 Info_Image 时也直接使用数组。
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True, eq=False)
+class PulseCurves:
+    """单个电池各电流等级的 (位置, 电荷, 电压) 曲线
+
+    Attributes:
+        offsets: int64，长度为电流等级数 + 1
+        posi: int64，Record 表行号
+        charge: float64，累积充电量；charge_valid 为 False 处为 0（原值为整数 0）
+        charge_valid: bool，该位置的充电量是否有效
+        voltage: float64，电压
+    """
+    offsets: np.ndarray
+    posi: np.ndarray
+    charge: np.ndarray
+    charge_valid: np.ndarray
+    voltage: np.ndarray
+
+    @classmethod
+    def from_levels(cls, posi_levels: list, voltage_levels: list,
+                    charge: np.ndarray, charge_valid: np.ndarray) -> "PulseCurves":
+        """由逐电流等级的位置 / 电压列表与按相同顺序展开的电荷数组构建"""
+        offsets = np.zeros(len(posi_levels) + 1, dtype=np.int64)
+        np.cumsum([len(level) for level in posi_levels], out=offsets[1:])
+        posi = np.fromiter((p for level in posi_levels for p in level), dtype=np.int64, count=int(offsets[-1]))
+        voltage = np.fromiter((v for level in voltage_levels for v in level), dtype=np.float64,
+                              count=sum(len(level) for level in voltage_levels))
+        return cls(offsets, posi, np.asarray(charge, dtype=np.float64),
+                   np.asarray(charge_valid, dtype=bool), voltage)
+
+    @property
+    def level_count(self) -> int:
+        return len(self.offsets) - 1
+
+    def _split(self, values: list) -> list:
+        return [values[self.offsets[c]:self.offsets[c + 1]] for c in range(self.level_count)]
+
+    def posi_lists(self) -> list:
+        """[电流等级] → 行号列表"""
+        return self._split(self.posi.tolist())
+
+    def charge_lists(self) -> list:
+        """[电流等级] → 电荷列表（无效位置为 int 0，与 ChargeCalculator.calculate 一致）"""
+        values = self.charge.tolist()
+        for i in np.flatnonzero(~self.charge_valid).tolist():
+            values[i] = 0
+        return self._split(values)
+
+    def voltage_lists(self) -> list:
+        """[电流等级] → 电压列表"""
+        return self._split(self.voltage.tolist())
+
+    def to_dict(self) -> dict:
+        """可 JSON 序列化的表示（供结果清单保存）"""
+        return {
+            "offsets": self.offsets.tolist(),
+            "posi": self.posi.tolist(),
+            "charge": self.charge.tolist(),
+            "charge_valid": self.charge_valid.tolist(),
+            "voltage": self.voltage.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PulseCurves":
+        return cls(
+            np.asarray(data["offsets"], dtype=np.int64),
+            np.asarray(data["posi"], dtype=np.int64),
+            np.asarray(data["charge"], dtype=np.float64),
+            np.asarray(data["charge_valid"], dtype=bool),
+            np.asarray(data["voltage"], dtype=np.float64),
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, PulseCurves):
+            return NotImplemented
+        return all(np.array_equal(getattr(self, name), getattr(other, name))
+                   for name in ("offsets", "posi", "charge", "charge_valid", "voltage"))
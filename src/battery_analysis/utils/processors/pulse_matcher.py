@@ -1,6 +1,9 @@
 """脉冲电流/电压等级匹配逻辑"""
 
-from typing import List, Tuple, Optional
+from typing import Sequence, Tuple, Optional
+
+import numpy as np
+import pandas as pd
 
 
 def b_is_in_range(current: float, standard: float) -> bool:
@@ -39,23 +42,50 @@ def _init_level_structures(
     )
 
 
+def _to_float_array(values) -> np.ndarray:
+    """转为 float64 数组；无法解析的单元格视为 NaN（不参与任何匹配）"""
+    array = np.asarray(values)
+    if array.dtype.kind in "biuf":
+        return array.astype(np.float64, copy=False)
+    return pd.to_numeric(pd.Series(array, dtype=object), errors='coerce').to_numpy(dtype=np.float64)
+
+
+def _first_row_at_or_below(
+    voltage: np.ndarray,
+    candidate: np.ndarray,
+    voltage_levels: np.ndarray,
+) -> np.ndarray:
+    """对每个电压等级，返回 candidate 行中首个 voltage <= 等级 的行下标（无则为 -1）
+
+    对候选行电压取前缀最小值（单调不增），首个满足条件的行即
+    前缀最小值首次 <= 等级的位置，可用一次 searchsorted 批量求出。
+    """
+    if len(voltage) == 0:
+        return np.full(len(voltage_levels), -1, dtype=np.int64)
+    usable = candidate & ~np.isnan(voltage)
+    running_min = np.minimum.accumulate(np.where(usable, voltage, np.inf))
+    idx = np.searchsorted(-running_min, -voltage_levels, side='left')
+    return np.where(idx < len(voltage), idx, -1)
+
+
 def match_pulse_levels(
-    record_current: List[float],
-    record_voltage: List[float],
-    pulse_mask: List[bool],
+    record_current: Sequence[float],
+    record_voltage: Sequence[float],
+    pulse_mask: Sequence[bool],
     listCurrentLevel: list,
     listVoltageLevel: list,
     start_row: int = 2,
 ) -> Optional[Tuple[list, list, list, list]]:
     """将脉冲行匹配到电流/电压等级
 
-    遍历脉冲数据行，对每个脉冲行匹配对应的电流等级和电压等级，
+    对所有电流等级一次性计算 ±5% 区间归属，通过与下一行的错位比较检测
+    脉冲结束点，并用前缀最小值定位每个电压等级的首个匹配行，
     返回用于后续电荷计算和绘图的四组数据结构。
 
     Args:
-        record_current: 电流数据列表（单位 A，函数内部转为 mA 比较）
-        record_voltage: 电压数据列表（单位 V）
-        pulse_mask: 布尔列表，标记哪些行是脉冲行
+        record_current: 电流数据（列表或 NumPy 数组，单位 A，函数内部转为 mA 比较）
+        record_voltage: 电压数据（列表或 NumPy 数组，单位 V）
+        pulse_mask: 布尔序列，标记哪些行是脉冲行
         listCurrentLevel: 电流等级列表（单位 mA）
         listVoltageLevel: 电压等级列表（单位 V）
         start_row: 有效数据起始行索引
@@ -67,42 +97,49 @@ def match_pulse_levels(
     structures = _init_level_structures(listCurrentLevel, listVoltageLevel)
     listLevelToVoltage, listLevelToRow, _, listPosiForInfoImageCsv, listVoltageForInfoImageCsv = structures
 
-    neg_current_levels = [-float(level) for level in listCurrentLevel]
     data_len = len(record_current)
-    has_pulse = False
-
-    for row in range(start_row, data_len):
-        if row >= len(pulse_mask) or not pulse_mask[row]:
-            continue
-        has_pulse = True
-
-        current_ma = float(record_current[row]) * 1000
-        voltage = float(record_voltage[row])
-
-        for c_idx, neg_level in enumerate(neg_current_levels):
-            if not b_is_in_range(current_ma, neg_level):
-                continue
-
-            # 检查是否是脉冲结束点
-            is_endpoint = True
-            if row + 1 < data_len:
-                next_current = float(record_current[row + 1]) * 1000
-                if b_is_in_range(next_current, neg_level):
-                    is_endpoint = False
-
-            if is_endpoint:
-                listPosiForInfoImageCsv[c_idx].append(row)
-                listVoltageForInfoImageCsv[c_idx].append(voltage)
-
-            # 匹配电压等级
-            for v_idx, v_level in enumerate(listVoltageLevel):
-                if voltage <= v_level and listLevelToRow[c_idx][v_idx] == 0:
-                    listLevelToVoltage[c_idx][v_idx] = voltage
-                    listLevelToRow[c_idx][v_idx] = row
-
-    if not has_pulse:
+    start_row = max(start_row, 0)
+    if start_row >= data_len:
         return None
 
+    # 只转换有效数据段，表头/元数据行不参与计算
+    current_ma = _to_float_array(record_current[start_row:]) * 1000
+    voltage = _to_float_array(record_voltage[start_row:])
+    pulse = np.zeros(data_len - start_row, dtype=bool)
+    mask = np.asarray(pulse_mask, dtype=bool)[start_row:data_len]
+    pulse[:len(mask)] = mask
+
+    if not pulse.any():
+        return None
+
+    rows = np.arange(start_row, data_len)
+    voltage_levels = np.asarray(listVoltageLevel, dtype=np.float64)
+
+    # 所有电流等级的区间归属矩阵 [c, row]
+    neg_levels = np.asarray([-float(level) for level in listCurrentLevel], dtype=np.float64)[:, None]
+    in_band = np.abs(current_ma[None, :] - neg_levels) <= np.abs(neg_levels * 0.05)
+
+    # 下一行仍在同一区间则不是结束点；最后一行总是结束点
+    next_in_band = np.zeros_like(in_band)
+    next_in_band[:, :-1] = in_band[:, 1:]
+
+    for c_idx in range(len(listCurrentLevel)):
+        matched = pulse & in_band[c_idx]
+        endpoints = np.flatnonzero(matched & ~next_in_band[c_idx])
+        listPosiForInfoImageCsv[c_idx].extend(rows[endpoints].tolist())
+        listVoltageForInfoImageCsv[c_idx].extend(voltage[endpoints].tolist())
+
+        # 原逐行逻辑以行号 0 作为"未匹配"哨兵，行 0 的匹配可被后续行覆盖
+        candidate = matched & (rows != 0)
+        first = _first_row_at_or_below(voltage, candidate, voltage_levels)
+        if start_row == 0 and matched[0]:
+            row0_hits = (first < 0) & (voltage[0] <= voltage_levels)
+            first = np.where(row0_hits, 0, first)
+
+        for v_idx in np.flatnonzero(first >= 0):
+            listLevelToVoltage[c_idx][v_idx] = float(voltage[first[v_idx]])
+            listLevelToRow[c_idx][v_idx] = int(rows[first[v_idx]])
+
     return (
         listLevelToVoltage,
         listLevelToRow,
@@ -0,0 +1,138 @@
+"""增量分析结果清单
+
+记录每个输入文件的指纹与单文件分析结果（即 ``_parallel_process_file`` 返回值的
+前四项，其中的 PulseCurves 以 to_dict 形式保存），
+保存为与 Info_Image.csv 同目录的 Info_Manifest.json。再次分析同一目录时，
+指纹未变的文件直接复用结果，只重新处理新增或修改的文件。
+
+指纹为 (大小, mtime_ns, 内容哈希)：大小与 mtime 一致即视为未变；
+仅 mtime 变化（如从测试机重新拷贝）时再比对内容哈希，避免对每个文件全量读取。
+"""
+import glob
+import json
+import logging
+import os
+import tempfile
+from typing import Optional
+
+from battery_analysis._version import __version__
+from battery_analysis.utils.constants import INFO_MANIFEST_JSON
+from battery_analysis.utils.processors.pulse_curves import PulseCurves
+from battery_analysis.utils.readers.sheet_cache import file_fingerprint
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FORMAT_VERSION = 2
+
+
+def find_previous_manifest(result_root: str, version: str) -> Optional[str]:
+    """在输出根目录下查找上次分析留下的清单
+
+    优先取最近修改的 ``<日期>_v<版本>`` 目录，其次为未重命名的 ``V<版本>`` 目录。
+    """
+    candidates = glob.glob(os.path.join(glob.escape(result_root), f"*_v{glob.escape(str(version))}",
+                                        INFO_MANIFEST_JSON))
+    candidates += [
+        os.path.join(result_root, f"{prefix}{version}", INFO_MANIFEST_JSON)
+        for prefix in ("V", "v")
+    ]
+    existing = [path for path in candidates if os.path.isfile(path)]
+    if not existing:
+        return None
+    return max(existing, key=os.path.getmtime)
+
+
+class ResultManifest:
+    """输入文件 → 分析结果的清单，绑定电流/电压等级与程序版本"""
+
+    def __init__(self, current_levels: list, voltage_levels: list, entries: Optional[dict] = None):
+        self.params = {
+            "format": MANIFEST_FORMAT_VERSION,
+            "app_version": __version__,
+            "current_levels": list(current_levels),
+            "voltage_levels": list(voltage_levels),
+        }
+        self.entries = entries or {}
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict], current_levels: list, voltage_levels: list) -> "ResultManifest":
+        """从已加载的 JSON 构建；参数或版本不一致时返回空清单"""
+        manifest = cls(current_levels, voltage_levels)
+        if not isinstance(data, dict):
+            return manifest
+        if data.get("params") != manifest.params:
+            logger.info("Analysis parameters changed, discarding previous result manifest")
+            return manifest
+        files = data.get("files")
+        if isinstance(files, dict):
+            manifest.entries = files
+        return manifest
+
+    @classmethod
+    def load(cls, path: Optional[str], current_levels: list, voltage_levels: list) -> "ResultManifest":
+        return cls.from_dict(read_manifest_file(path), current_levels, voltage_levels)
+
+    def lookup(self, file_path: str):
+        """返回文件未变化时缓存的单文件结果，否则返回 None"""
+        entry = self.entries.get(os.path.basename(file_path))
+        if not entry:
+            return None
+        try:
+            stat = os.stat(file_path)
+            size, mtime_ns, content_hash = entry["fingerprint"]
+            if stat.st_size != size:
+                return None
+            if stat.st_mtime_ns != mtime_ns and file_fingerprint(file_path)[3] != content_hash:
+                return None
+            battery_name, battery_charge, curves, timestamp = entry["result"]
+            return battery_name, battery_charge, PulseCurves.from_dict(curves), timestamp
+        except (OSError, KeyError, TypeError, ValueError):
+            return None
+
+    def record(self, file_path: str, result: tuple, fingerprint: Optional[tuple] = None) -> None:
+        """记录文件的分析结果与指纹
+
+        Args:
+            file_path: 输入文件路径
+            result: 单文件分析结果
+            fingerprint: 分析前计算的 file_fingerprint；None 时现在计算
+        """
+        try:
+            _, size, mtime_ns, content_hash = fingerprint or file_fingerprint(file_path)
+        except OSError as e:
+            logger.warning("Cannot fingerprint %s, not caching its result: %s", file_path, e)
+            return
+        self.entries[os.path.basename(file_path)] = {
+            "fingerprint": [size, mtime_ns, content_hash],
+            "result": [result[0], result[1], result[2].to_dict(), result[3]],
+        }
+
+    def retain(self, file_paths) -> None:
+        """只保留当前目录中仍存在的文件"""
+        names = {os.path.basename(path) for path in file_paths}
+        self.entries = {name: entry for name, entry in self.entries.items() if name in names}
+
+    def save(self, directory: str) -> None:
+        """原子写入 <directory>/Info_Manifest.json"""
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix=".json.tmp", dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"params": self.params, "files": self.entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, os.path.join(directory, INFO_MANIFEST_JSON))
+        except (OSError, TypeError, ValueError) as e:
+            logger.error("Failed to write result manifest: %s", e)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+def read_manifest_file(path: Optional[str]) -> Optional[dict]:
+    """读取清单 JSON，文件不存在或损坏时返回 None"""
+    if not path or not os.path.isfile(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable result manifest %s: %s", path, e)
+        return None
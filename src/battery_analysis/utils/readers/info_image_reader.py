@@ -0,0 +1,220 @@
+"""Info_Image.csv 读取器
+
+图表查看器（DataLoaderMixin.csv_read）与报告绘图（plot_writer）共用的解析入口。
+优先读取同目录下由写入器生成的 Info_Image.npz（扁平数组 + 偏移，较大时按内存映射
+读取）；副本缺失、过期（记录的 CSV 大小 / mtime 不一致）或损坏时回退到解析 CSV：
+文件一次读入，所有数值行合并后由 ``np.fromstring`` 一次解析，再按行长度切分为
+每个 (电流等级, 电池) 的 float64 数组。结果按 (路径, mtime_ns, 大小, 电流等级数) 缓存。
+
+文件布局见 writers.info_csv_writer.write_info_csv：每个电池占
+``1 + 电流等级数 * 3`` 行，依次为 ``BATTERY,名称`` 与每个电流等级的
+位置 / 电荷 / 电压行。
+"""
+import csv
+import logging
+import os
+import struct
+import threading
+import zipfile
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from battery_analysis.utils.constants import INFO_IMAGE_NPZ
+from battery_analysis.utils.writers.info_csv_writer import INFO_IMAGE_NPZ_FORMAT
+
+logger = logging.getLogger(__name__)
+
+# 进程内缓存的文件数
+MAX_CACHED_FILES = 8
+
+# mmap=None 时，副本达到该大小即按内存映射读取
+MMAP_THRESHOLD_BYTES = 64 * 1024 * 1024
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+@dataclass
+class InfoImageData:
+    """Info_Image.csv 的解析结果（数组只读，多个调用方共享同一实例）
+
+    Attributes:
+        battery_names: 各电池块表头中的名称（表头缺少名称的块不计入）
+        charge: [电流等级][电池块] → 电荷数组
+        voltage: [电流等级][电池块] → 电压数组
+        row_count: 文件总行数
+    """
+    battery_names: list = field(default_factory=list)
+    charge: list = field(default_factory=list)
+    voltage: list = field(default_factory=list)
+    row_count: int = 0
+
+
+def _parse_row(row: str) -> np.ndarray:
+    """逐单元格解析一行，跳过无法转换的单元格（与原 csv.reader + float() 行为一致）"""
+    values = []
+    for cell in row.split(","):
+        try:
+            values.append(float(cell))
+        except ValueError:
+            continue
+    return np.asarray(values, dtype=np.float64)
+
+
+def _parse_numeric_rows(rows: list) -> list:
+    """把多行逗号分隔数值解析为数组列表；整体解析失败时退回逐行解析"""
+    counts = [row.count(",") + 1 if row.strip() else 0 for row in rows]
+    joined = ",".join(row for row, count in zip(rows, counts) if count)
+    try:
+        values = np.fromstring(joined, dtype=np.float64, sep=",")
+    except ValueError:
+        values = None
+    if values is None or len(values) != sum(counts):
+        return [_parse_row(row) for row in rows]
+    return np.split(values, np.cumsum(counts)[:-1]) if rows else []
+
+
+def _parse(text: str, current_level_num: int) -> InfoImageData:
+    # 只按 \n / \r\n 分行（str.splitlines 还会切分名称中的 \x1c、\u2028 等字符）
+    lines = text.replace("\r\n", "\n").split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()
+    rows_per_battery = 1 + current_level_num * 3
+    data = InfoImageData(row_count=len(lines))
+
+    # 按行号归类：电荷行 / 电压行，位置行不参与绘图
+    charge_rows = [[] for _ in range(current_level_num)]
+    voltage_rows = [[] for _ in range(current_level_num)]
+    for index, line in enumerate(lines):
+        loop = index % rows_per_battery
+        if loop == 0:
+            header = next(csv.reader([line]), [])
+            if len(header) > 1:
+                data.battery_names.append(header[1].strip())
+        elif loop % 3 == 2:
+            charge_rows[(loop - 1) // 3].append(line)
+        elif loop % 3 == 0:
+            voltage_rows[(loop - 1) // 3].append(line)
+
+    for c in range(current_level_num):
+        data.charge.append(_parse_numeric_rows(charge_rows[c]))
+        data.voltage.append(_parse_numeric_rows(voltage_rows[c]))
+    for arrays in data.charge + data.voltage:
+        for array in arrays:
+            array.setflags(write=False)
+    return data
+
+
+def _memmap_member(npz_path: str, info: zipfile.ZipInfo) -> np.ndarray:
+    """把未压缩 .npz 中的一个 .npy 成员直接映射为只读 np.memmap"""
+    with open(npz_path, "rb") as f:
+        f.seek(info.header_offset)
+        local_header = f.read(30)
+        name_len, extra_len = struct.unpack("<HH", local_header[26:30])
+        f.seek(info.header_offset + 30 + name_len + extra_len)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+    if not shape or 0 in shape:
+        return np.zeros(shape, dtype=dtype)
+    return np.memmap(npz_path, dtype=dtype, mode="r", offset=offset, shape=shape,
+                     order="F" if fortran_order else "C")
+
+
+def _load_sidecar(npz_path: str, csv_stat: os.stat_result, current_level_num: int,
+                  mmap: bool | None) -> InfoImageData | None:
+    """读取 Info_Image.npz；不存在、过期或格式不符时返回 None"""
+    try:
+        npz_size = os.path.getsize(npz_path)
+    except OSError:
+        return None
+    use_mmap = npz_size >= MMAP_THRESHOLD_BYTES if mmap is None else mmap
+
+    try:
+        with np.load(npz_path, allow_pickle=False) as npz:
+            if (int(npz["format"]) != INFO_IMAGE_NPZ_FORMAT
+                    or int(npz["current_level_num"]) != current_level_num
+                    or int(npz["source_size"]) != csv_stat.st_size
+                    or int(npz["source_mtime_ns"]) != csv_stat.st_mtime_ns):
+                logger.debug("%s is stale, falling back to CSV", npz_path)
+                return None
+            battery_names = [str(name) for name in npz["battery_names"]]
+            names = [f"{kind}_{c}_{part}" for kind in ("charge", "voltage")
+                     for c in range(current_level_num) for part in ("values", "offsets")]
+            if use_mmap:
+                infos = {info.filename: info for info in npz.zip.infolist()}
+                if any(infos[f"{name}.npy"].compress_type != zipfile.ZIP_STORED
+                       for name in names if name.endswith("_values")):
+                    use_mmap = False
+            arrays = {}
+            for name in names:
+                if use_mmap and name.endswith("_values"):
+                    arrays[name] = _memmap_member(npz_path, infos[f"{name}.npy"])
+                else:
+                    arrays[name] = npz[name]
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+        logger.warning("Failed to read %s, falling back to CSV: %s", npz_path, e)
+        return None
+
+    battery_count = len(battery_names)
+    data = InfoImageData(battery_names=battery_names,
+                         row_count=battery_count * (1 + current_level_num * 3))
+    for kind, target in (("charge", data.charge), ("voltage", data.voltage)):
+        for c in range(current_level_num):
+            values = arrays[f"{kind}_{c}_values"]
+            offsets = arrays[f"{kind}_{c}_offsets"]
+            if len(offsets) != battery_count + 1:
+                logger.warning("%s has inconsistent offsets, falling back to CSV", npz_path)
+                return None
+            per_battery = [values[offsets[b]:offsets[b + 1]] for b in range(battery_count)]
+            for array in per_battery:
+                array.setflags(write=False)
+            target.append(per_battery)
+    return data
+
+
+def load_info_image(csv_path: str, current_level_num: int, mmap: bool | None = None) -> InfoImageData:
+    """读取 Info_Image.csv（优先使用 Info_Image.npz 副本），文件未变化时返回缓存的同一结果
+
+    Args:
+        csv_path: Info_Image.csv 路径
+        current_level_num: 电流等级数（决定每个电池块的行数）
+        mmap: 副本是否按内存映射读取；None 表示副本不小于 MMAP_THRESHOLD_BYTES 时映射
+
+    Returns:
+        InfoImageData
+
+    Raises:
+        OSError / UnicodeDecodeError: 文件无法读取
+    """
+    stat = os.stat(csv_path)
+    key = (os.path.abspath(csv_path), stat.st_mtime_ns, stat.st_size, current_level_num, mmap)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached
+
+    npz_path = os.path.join(os.path.dirname(csv_path), INFO_IMAGE_NPZ)
+    data = _load_sidecar(npz_path, stat, current_level_num, mmap)
+    if data is None:
+        with open(csv_path, "r", encoding="utf-8", newline="") as f:
+            data = _parse(f.read(), current_level_num)
+
+    with _cache_lock:
+        _cache[key] = data
+        while len(_cache) > MAX_CACHED_FILES:
+            _cache.popitem(last=False)
+    logger.debug("Parsed %s: %d batteries, %d rows", csv_path, len(data.battery_names), data.row_count)
+    return data
+
+
+def clear_info_image_cache() -> None:
+    """清空缓存（同时释放内存映射，Windows 下删除或覆盖结果目录前需调用）"""
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,206 @@
+"""xlsx 解析结果的持久化列式缓存
+
+把分析实际使用的 Cycle/Step/Record 列保存为未压缩的 ``.npz``，
+下次分析同一文件（路径、大小、mtime、内容哈希均未变）时直接加载，
+完全跳过 Excel 解码。
+
+每列编码为以下数组：
+  - ``values``: float64 数值（非数值单元格为 NaN）
+  - ``int_mask``: 原值为整数的单元格（还原为 int）
+  - ``text_idx`` / ``text_val``: 非数值单元格（表头、步骤名、时间戳）的下标与字符串
+"""
+import hashlib
+import logging
+import os
+import tempfile
+from numbers import Integral, Real
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from battery_analysis.utils.cache_paths import default_cache_root
+
+logger = logging.getLogger(__name__)
+
+SHEET_NAMES = ("cycle", "step", "record")
+CACHE_FORMAT_VERSION = 1
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+_HASH_CHUNK_SIZE = 1024 * 1024
+_HEADER_ROWS = 2
+
+_default_caches = {}
+
+
+def _default_cache_dir() -> Path:
+    return default_cache_root() / "sheets"
+
+
+def get_default_sheet_cache():
+    """返回当前进程的默认缓存实例；设置 BATTERY_ANALYSIS_SHEET_CACHE=0 可禁用"""
+    if os.environ.get("BATTERY_ANALYSIS_SHEET_CACHE", "").lower() in ("0", "false", "no", "off"):
+        return None
+    cache_dir = _default_cache_dir()
+    cache = _default_caches.get(cache_dir)
+    if cache is None:
+        cache = SheetCache(cache_dir)
+        _default_caches[cache_dir] = cache
+    return cache
+
+
+def file_fingerprint(filepath: str) -> tuple:
+    """返回 (绝对路径, 大小, mtime_ns, 内容哈希)"""
+    stat = os.stat(filepath)
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return os.path.abspath(filepath), stat.st_size, stat.st_mtime_ns, digest.hexdigest()
+
+
+def _encode_cells(raw: np.ndarray, offset: int, values, int_mask, text_idx, text_val) -> None:
+    """逐单元格分类（仅用于表头行与混合类型列）"""
+    for i, value in enumerate(raw, start=offset):
+        if isinstance(value, bool) or not isinstance(value, Real):
+            if not pd.isna(value):
+                text_idx.append(i)
+                text_val.append(str(value))
+            continue
+        values[i] = value
+        int_mask[i] = isinstance(value, Integral)
+
+
+def _encode_column(column: pd.Series) -> dict:
+    """把 object 列拆成数值数组 + 整数标记 + 稀疏文本"""
+    raw = column.to_numpy(dtype=object)
+    values = np.full(len(raw), np.nan)
+    int_mask = np.zeros(len(raw), dtype=bool)
+    text_idx = []
+    text_val = []
+
+    # 表头行（列名、电池名）逐个处理；数据行按整列类型走向量化路径
+    _encode_cells(raw[:_HEADER_ROWS], 0, values, int_mask, text_idx, text_val)
+    body = raw[_HEADER_ROWS:]
+    kind = pd.api.types.infer_dtype(body, skipna=True)
+    if kind in ("integer", "floating", "mixed-integer-float", "empty"):
+        body_values = pd.to_numeric(pd.Series(body, dtype=object)).to_numpy(dtype=np.float64)
+        values[_HEADER_ROWS:] = body_values
+        if kind == "integer":
+            int_mask[_HEADER_ROWS:] = ~np.isnan(body_values)
+        elif kind == "mixed-integer-float":
+            # calamine 对整数值单元格返回 int，按值判断即可还原
+            int_mask[_HEADER_ROWS:] = np.isfinite(body_values) & (np.mod(body_values, 1) == 0)
+    elif kind == "string":
+        present = np.flatnonzero(~pd.isna(body))
+        text_idx.extend((present + _HEADER_ROWS).tolist())
+        text_val.extend(body[present].tolist())
+    else:
+        _encode_cells(body, _HEADER_ROWS, values, int_mask, text_idx, text_val)
+
+    return {
+        "values": values,
+        "int_mask": int_mask,
+        "text_idx": np.asarray(text_idx, dtype=np.int64),
+        "text_val": np.asarray(text_val, dtype=str),
+    }
+
+
+def _decode_column(values, int_mask, text_idx, text_val) -> np.ndarray:
+    # 纯浮点列（投影读取得到的数值列）直接返回 float64，无需装箱
+    if not len(text_idx) and not int_mask.any():
+        return values
+    column = values.astype(object)
+    if int_mask.any():
+        column[int_mask] = values[int_mask].astype(np.int64).tolist()
+    if len(text_idx):
+        column[text_idx] = text_val.tolist()
+    return column
+
+
+class SheetCache:
+    """以文件指纹为键的 .npz 缓存，总大小超过上限时按最近访问时间淘汰"""
+
+    def __init__(self, cache_dir, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, fingerprint: tuple) -> Path:
+        key = hashlib.blake2b(
+            repr((CACHE_FORMAT_VERSION,) + tuple(fingerprint)).encode("utf-8"),
+            digest_size=20).hexdigest()
+        return self.cache_dir / f"{key}.npz"
+
+    def get(self, fingerprint: tuple):
+        """命中返回 (cycle_df, step_df, record_df)，未命中或条目损坏返回 None"""
+        entry = self._entry_path(fingerprint)
+        if not entry.exists():
+            return None
+        try:
+            with np.load(entry, allow_pickle=False) as data:
+                sheets = tuple(self._decode_sheet(data, name) for name in SHEET_NAMES)
+            # 刷新访问时间，供 LRU 淘汰使用
+            os.utime(entry)
+            return sheets
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Discarding unreadable sheet cache entry %s: %s", entry, e)
+            entry.unlink(missing_ok=True)
+            return None
+
+    def put(self, fingerprint: tuple, sheets) -> None:
+        """写入缓存条目（原子替换），随后按大小上限淘汰旧条目"""
+        arrays = {}
+        for name, df in zip(SHEET_NAMES, sheets):
+            arrays[f"{name}__ncols"] = np.asarray(df.shape[1], dtype=np.int64)
+            for col in range(df.shape[1]):
+                for part, array in _encode_column(df.iloc[:, col]).items():
+                    arrays[f"{name}__{col}__{part}"] = array
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(suffix=".npz.tmp", dir=self.cache_dir)
+        except OSError as e:
+            logger.warning("Failed to create sheet cache directory: %s", e)
+            return
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, self._entry_path(fingerprint))
+        except OSError as e:
+            logger.warning("Failed to write sheet cache entry: %s", e)
+            Path(tmp_path).unlink(missing_ok=True)
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """总大小超过 max_bytes 时，从最久未访问的条目开始删除"""
+        try:
+            entries = [(p.stat(), p) for p in self.cache_dir.glob("*.npz")]
+        except OSError:
+            return
+        total = sum(stat.st_size for stat, _ in entries)
+        for stat, path in sorted(entries, key=lambda item: item[0].st_mtime_ns):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= stat.st_size
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        for path in self.cache_dir.glob("*.npz"):
+            path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _decode_sheet(data, name: str) -> pd.DataFrame:
+        ncols = int(data[f"{name}__ncols"])
+        columns = {
+            col: _decode_column(
+                data[f"{name}__{col}__values"],
+                data[f"{name}__{col}__int_mask"],
+                data[f"{name}__{col}__text_idx"],
+                data[f"{name}__{col}__text_val"],
+            )
+            for col in range(ncols)
+        }
+        return pd.DataFrame(columns, columns=range(ncols))
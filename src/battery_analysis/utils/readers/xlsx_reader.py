@@ -1,12 +1,34 @@
 """xlsx 文件读取器，封装 pandas/calamine 读取逻辑"""
+import datetime
 import os
 import re
 import logging
+from typing import Iterator
 
+import numpy as np
 import pandas as pd
+from python_calamine import CalamineWorkbook
+
+from battery_analysis.utils.readers.sheet_cache import file_fingerprint, get_default_sheet_cache
 
 logger = logging.getLogger(__name__)
 
+# 分析流程实际使用的列数：Cycle 0-3、Step 0-2、Record 0-4
+ANALYSIS_COLUMNS = (4, 3, 5)
+# 直接物化为 float64 的列（其余列保留单元格原值）。Cycle 表很小且第 0 列
+# 含电池名、第 1/2 列为时间戳，全部保留原值
+NUMERIC_COLUMNS = ((), (0, 2), (0, 2, 3, 4))
+DEFAULT_CHUNK_ROWS = 65536
+# probe_xlsx 读取的数据行数（不含表头）
+PROBE_PREVIEW_ROWS = 20
+# 表头行数（列名 + 电池名），逐单元格转换，不参与整块数值转换
+_HEADER_ROWS = 2
+# 与 pandas read_excel 默认 na_values 一致
+_NA_STRINGS = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+})
+
 
 def read_xlsx_sheets(filepath: str) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     """用 calamine 引擎一次性读取 xlsx 的三个工作表，返回 (cycle_df, step_df, record_df)"""
@@ -14,6 +36,192 @@ def read_xlsx_sheets(filepath: str) -> tuple[pd.DataFrame, pd.DataFrame, pd.Data
     return sheets[0], sheets[1], sheets[2]
 
 
+def read_analysis_sheets(filepath: str, use_cache: bool = True,
+                         fingerprint: tuple | None = None) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """读取分析所需的列投影 (cycle_df, step_df, record_df)
+
+    命中持久化缓存时直接加载列式数据，不解析 Excel；
+    未命中时用 read_projected_sheets 读取并写回缓存。
+    fingerprint 为调用方已算好的 file_fingerprint 结果，传入时不再重复哈希。
+    """
+    cache = get_default_sheet_cache() if use_cache else None
+    if cache is not None:
+        fingerprint = fingerprint or file_fingerprint(filepath)
+        cached = cache.get(fingerprint)
+        if cached is not None:
+            logger.debug("Sheet cache hit: %s", filepath)
+            return cached
+
+    sheets = read_projected_sheets(filepath)
+    if cache is not None:
+        cache.put(fingerprint, sheets)
+    return sheets
+
+
+def _convert_cell(value):
+    """单元格转换，与 pandas calamine 引擎的结果一致（空串/NA 字符串为 NaN，整数值 float 转 int）"""
+    if isinstance(value, str):
+        return np.nan if value in _NA_STRINGS else value
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return pd.Timestamp(value)
+    if isinstance(value, datetime.timedelta):
+        return pd.Timedelta(value)
+    return value
+
+
+def _convert_numeric_cell(value) -> float:
+    """数值列单元格转换，语义同 pd.to_numeric(errors='coerce')"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str) and value not in _NA_STRINGS:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    return np.nan
+
+
+def _column_to_array(cells, numeric: bool, interned: dict) -> np.ndarray:
+    if numeric:
+        try:
+            return np.asarray(cells, dtype=np.float64)
+        except (TypeError, ValueError):
+            return np.fromiter(map(_convert_numeric_cell, cells), dtype=np.float64, count=len(cells))
+    # 文本列（步骤名等）重复度极高，复用同一字符串对象以降低内存
+    column = np.empty(len(cells), dtype=object)
+    column[:] = [interned.setdefault(v, v) if isinstance(v, str) and v not in _NA_STRINGS
+                 else _convert_cell(v) for v in cells]
+    return column
+
+
+def iter_sheet_chunks(sheet, ncols: int, numeric_cols=(),
+                      chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[list[np.ndarray]]:
+    """按行块流式读取工作表的前 ncols 列
+
+    每块最多 chunk_rows 行，以列数组列表的形式产出：numeric_cols 中的列为 float64，
+    其余为 object。Python 侧内存只与块大小相关，与工作表总行数无关。
+    行号与 read_xlsx_sheets（header=None）一致：从第 1 行开始计数，
+    开头空行补 NaN 行；首个非空列之前的空列同样保留。
+    """
+    if sheet.start is None:
+        return
+    # iter_rows 从首个非空列开始产出单元格，之前的空列需补 NaN
+    col_offset = sheet.start[1]
+    width = min(ncols, col_offset + sheet.width)
+    take = slice(0, max(0, width - col_offset))
+    pad = min(col_offset, width)
+    interned = {}
+
+    buffer = []
+    for row_idx, row in enumerate(sheet.iter_rows()):
+        buffer.append(row[take])
+        if len(buffer) >= chunk_rows or row_idx + 1 == _HEADER_ROWS:
+            yield _build_chunk(buffer, pad, width, numeric_cols, interned, row_idx < _HEADER_ROWS)
+            buffer = []
+    if buffer:
+        yield _build_chunk(buffer, pad, width, numeric_cols, interned, False)
+
+
+def _build_chunk(rows, pad, width, numeric_cols, interned, is_header) -> list[np.ndarray]:
+    columns = list(zip(*rows)) if rows and rows[0] else []
+    arrays = []
+    for col in range(width):
+        numeric = col in numeric_cols
+        if col < pad:
+            arrays.append(np.full(len(rows), np.nan) if numeric
+                          else np.full(len(rows), np.nan, dtype=object))
+            continue
+        cells = columns[col - pad]
+        if is_header:
+            # 表头行逐单元格转换，保持列名/电池名等文本
+            arrays.append(np.array([_convert_numeric_cell(v) if numeric else _convert_cell(v)
+                                    for v in cells], dtype=np.float64 if numeric else object))
+        else:
+            arrays.append(_column_to_array(cells, numeric, interned))
+    return arrays
+
+
+def read_sheet_columns(sheet, ncols: int, numeric_cols=(),
+                       chunk_rows: int = DEFAULT_CHUNK_ROWS) -> pd.DataFrame:
+    """读取工作表前 ncols 列为 DataFrame（数值列为 float64）"""
+    chunks = list(iter_sheet_chunks(sheet, ncols, numeric_cols, chunk_rows))
+    if not chunks:
+        return pd.DataFrame()
+    width = len(chunks[0])
+    columns = {col: np.concatenate([chunk[col] for chunk in chunks]) for col in range(width)}
+    df = pd.DataFrame(columns, columns=range(width))
+    # iter_rows 若从首个非空行开始，补齐前导空行使行号与 read_xlsx_sheets 一致
+    missing = sheet.end[0] + 1 - len(df)
+    if missing > 0:
+        df = pd.concat([pd.DataFrame(np.nan, index=range(missing), columns=df.columns), df],
+                       ignore_index=True)
+    return df
+
+
+def read_projected_sheets(filepath: str, chunk_rows: int = DEFAULT_CHUNK_ROWS
+                          ) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """只读取分析所需列的 (cycle_df, step_df, record_df)
+
+    直接用 python-calamine 的行迭代器按块读取，只物化 ANALYSIS_COLUMNS 范围内的列，
+    Step/Record 的数值列直接构建为 float64 数组（表头单元格为 NaN），
+    避免为整表构建 object DataFrame。
+    """
+    workbook = CalamineWorkbook.from_path(filepath)
+    try:
+        return tuple(
+            read_sheet_columns(workbook.get_sheet_by_index(index), ncols, numeric_cols, chunk_rows)
+            for index, (ncols, numeric_cols) in enumerate(zip(ANALYSIS_COLUMNS, NUMERIC_COLUMNS))
+        )
+    finally:
+        workbook.close()
+
+
+def _header_names(cells) -> list:
+    """表头单元格 → 列名，与 pandas read_excel(header=0) 一致：空单元格为 Unnamed: i，重名追加 .n"""
+    names, seen = [], {}
+    for idx, cell in enumerate(cells):
+        name = _convert_cell(cell)
+        if not isinstance(name, str) and pd.isna(name):
+            name = f"Unnamed: {idx}"
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        names.append(name if count == 0 else f"{name}.{count}")
+    return names
+
+
+def probe_xlsx(filepath: str, preview_rows: int = PROBE_PREVIEW_ROWS) -> dict:
+    """轻量探测 xlsx：工作表名、首个工作表的行列数及前 preview_rows 行
+
+    不构建整表 DataFrame：行列数取自工作表范围，只有前 preview_rows 行被转换为
+    Python 对象。preview 的列名、单元格转换与 pd.read_excel(sheet_name=0, header=0) 一致。
+
+    Returns:
+        {'sheet_names', 'row_count'（不含表头）, 'column_count', 'preview': DataFrame}
+    """
+    workbook = CalamineWorkbook.from_path(filepath)
+    try:
+        sheet_names = list(workbook.sheet_names)
+        sheet = workbook.get_sheet_by_index(0)
+        if sheet.start is None:
+            return {'sheet_names': sheet_names, 'row_count': 0, 'column_count': 0,
+                    'preview': pd.DataFrame()}
+        rows = sheet.to_python(skip_empty_area=False, nrows=preview_rows + 1)
+    finally:
+        workbook.close()
+
+    columns = _header_names(rows[0])
+    preview = pd.DataFrame([[_convert_cell(v) for v in row] for row in rows[1:]],
+                           columns=columns).infer_objects()
+    return {
+        'sheet_names': sheet_names,
+        'row_count': sheet.end[0],
+        'column_count': len(columns),
+        'preview': preview,
+    }
+
+
 def extract_test_date_from_xls(filepath: str) -> str:
     """
     从 Excel 文件中提取 Test Date 字段
@@ -2,12 +2,25 @@
 
 主要功能是协调绘图和委托给专用的 ExcelReportWriter / WordReportWriter / CsvWriter。
 与新版 writer 的差异：生成插件标题、管理图片/ SVG 路径、处理旧式日期回退逻辑。
+
+各输出按依赖关系组成任务图（TaskExecutor.run_graph），默认在共享进程池中并行渲染：
+
+    boxplots ─┬─> xlsx（插入箱线图 PNG）
+              └─> docx <─ filtered_curves
+    unfiltered_curves    csv
+
+svg_mode="lazy" 时不绘制 SVG，只把重绘所需的参数写入 SVG_SPEC_JSON；
+需要时调用 render_deferred_svgs 生成（只请求 SVG 时可完全跳过绘图）。
 """
 
 import os
 import re
+import json
 import math
+import time
 import logging
+import threading
+import multiprocessing
 import importlib.resources
 from pathlib import Path
 
@@ -15,10 +28,14 @@ from battery_analysis.utils.processors.data_utils import (
     build_plot_title, generate_current_type_string,
 )
 from battery_analysis.utils.constants import (
-    CN_FONT_LIST, PLT_COLOR_TYPE, COLOR_NAME, BATTERY_TYPE_BASE,
+    CN_FONT_LIST, PLT_COLOR_TYPE, COLOR_NAME, BATTERY_TYPE_BASE, REPORT_FORMATS,
+    SVG_MODES, SVG_SPEC_JSON,
 )
 from battery_analysis.utils.writers import plot_writer
 from battery_analysis.utils.readers.date_parser import parse_test_date
+from battery_analysis.utils.readers.info_image_reader import clear_info_image_cache
+from battery_analysis.utils.instrumentation import span
+from battery_analysis.utils.task_executor import GraphTask, TaskExecutor
 from battery_analysis import __version__
 
 import matplotlib
@@ -30,6 +47,12 @@ plt.rcParams['axes.unicode_minus'] = False
 
 logger = logging.getLogger(__name__)
 
+# pyplot 的全局状态不是线程安全的：thread 后端下绘图任务依次执行
+_PYPLOT_LOCK = threading.Lock()
+
+# SVG_SPEC_JSON 格式版本
+SVG_SPEC_FORMAT = 1
+
 # ── 共享常量 ──────────────────────────────────────────────────
 
 
@@ -380,40 +403,103 @@ class ReportCoordinator:
 
     # ── 公共方法 ──
 
-    def write(self) -> None:
-        """执行完整的写入流程：绘图 → Excel → Word → CSV"""
+    def write(self, formats=REPORT_FORMATS, executor: TaskExecutor | None = None,
+              svg_mode: str = "eager", on_progress=None) -> dict:
+        """执行写入流程：绘图、Excel、CSV 并行，Word 在所需图片完成后生成
+
+        Args:
+            formats: 要生成的格式，取值见 REPORT_FORMATS
+            executor: 渲染任务所用的 TaskExecutor；None 表示共享进程池
+            svg_mode: SVG 的生成方式，取值见 SVG_MODES
+            on_progress: 回调 (完成比例 0-1, 刚完成的任务名)，在调用线程中执行
+
+        Returns:
+            各阶段耗时（秒）：statistics、各渲染任务与 total
+
+        Raises:
+            ValueError: formats 含未知格式或 svg_mode 无效
+        """
         from battery_analysis.utils.writers.statistics_utils import (
             compute_list_cpt, compute_statistics,
         )
 
-        listCpt = compute_list_cpt(
-            self.listBatteryCharge, self.intBatteryNum,
-            self.intCurrentLevelNum, self.intVoltageLevelNum)
-        stats = compute_statistics(
-            listCpt, self.intCurrentLevelNum, self.intVoltageLevelNum)
-
-        # 绘制箱线图
-        plot_writer.draw_boxplot_and_curves(
-            self.intCurrentLevelNum, self.intVoltageLevelNum,
-            self.listVoltageLevel, self.listBoxplotTitle,
-            self.listPngPath, self.listSvgPath,
-            self.strInfoImageCsvPath, self.strPltName,
-            self.strUnfilteredPngPath, self.strUnfilteredSvgPath,
-            self.strFilteredPngPath, self.strFilteredSvgPath,
-            self.listTestInfo, self.listPltColorType,
-            self.intBatteryNum, listCpt,
-            int(self.listTestInfo[8]),
-        )
-
-        # 委托给专用写入器
-        from battery_analysis.utils.writers.excel_report_writer import ExcelReportWriter
-        from battery_analysis.utils.writers.word_report_writer import WordReportWriter
-        from battery_analysis.utils.writers.csv_writer import CsvWriter
-
-        ExcelReportWriter(self.strResultPath, self.listTestInfo, self.listBatteryInfo).write(listCpt, stats)
-        WordReportWriter(self.strResultPath, self.listTestInfo, self.listBatteryInfo,
-                         equipment_info=self._equipment_info).write(listCpt, stats)
-        CsvWriter(self.strResultPath, self.listTestInfo, self.listBatteryInfo).write(listCpt, stats)
+        formats = set(formats)
+        unknown = formats.difference(REPORT_FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown report formats: {', '.join(sorted(unknown))}")
+        if svg_mode not in SVG_MODES:
+            raise ValueError(f"Unknown SVG mode: {svg_mode!r}, expected one of {', '.join(SVG_MODES)}")
+
+        start = time.perf_counter()
+        with span("report.statistics"):
+            listCpt = compute_list_cpt(
+                self.listBatteryCharge, self.intBatteryNum,
+                self.intCurrentLevelNum, self.intVoltageLevelNum)
+            stats = compute_statistics(
+                listCpt, self.intCurrentLevelNum, self.intVoltageLevelNum)
+        timings = {"statistics": time.perf_counter() - start}
+
+        # Word 文档引用 PNG，因此生成 docx 时总是绘制 PNG
+        lazy_svg = "svg" in formats and svg_mode == "lazy"
+        image_formats = tuple(fmt for fmt in ("png", "svg")
+                              if (fmt in formats and not (fmt == "svg" and lazy_svg))
+                              or (fmt == "png" and "docx" in formats))
+        if lazy_svg:
+            with span("report.svg_spec"):
+                self._write_svg_spec(listCpt)
+        tasks = []
+        if image_formats:
+            tasks.append(GraphTask("boxplots", _draw_boxplots, (self, listCpt, image_formats)))
+            tasks.append(GraphTask("unfiltered_curves", _draw_curves, (self, False, image_formats)))
+            tasks.append(GraphTask("filtered_curves", _draw_curves, (self, True, image_formats)))
+        if "xlsx" in formats:
+            tasks.append(GraphTask("xlsx", _write_xlsx, (self, listCpt, stats),
+                                   deps=("boxplots",) if "png" in image_formats else ()))
+        if "csv" in formats:
+            tasks.append(GraphTask("csv", _write_csv, (self, listCpt, stats)))
+        if "docx" in formats:
+            tasks.append(GraphTask("docx", _write_docx, (self, listCpt, stats),
+                                   deps=("boxplots", "filtered_curves")))
+
+        def _task_done(name, done, total):
+            if on_progress is not None:
+                on_progress(done / total, name)
+
+        timings.update((executor or TaskExecutor()).run_graph(tasks, on_task_done=_task_done))
+        timings["total"] = time.perf_counter() - start
+        logger.info("Report stage timings: %s",
+                    ", ".join(f"{name}={seconds:.2f}s" for name, seconds in timings.items()))
+        return timings
+
+    def _write_svg_spec(self, listCpt) -> None:
+        """写入 render_deferred_svgs 重绘全部 SVG 所需的参数（路径相对于结果目录）"""
+        spec = {
+            "format": SVG_SPEC_FORMAT,
+            "boxplots": {
+                "int_current_level_num": self.intCurrentLevelNum,
+                "int_voltage_level_num": self.intVoltageLevelNum,
+                "list_voltage_level": self.listVoltageLevel,
+                "list_boxplot_title": self.listBoxplotTitle,
+                "list_svg_path": [os.path.basename(path) for path in self.listSvgPath],
+                "list_cpt": listCpt,
+            },
+            "curves": [
+                {"filtered": filtered, "str_svg_path": os.path.basename(svg_path)}
+                for filtered, svg_path in ((False, self.strUnfilteredSvgPath), (True, self.strFilteredSvgPath))
+            ],
+            "curve_args": {
+                "str_info_image_csv_path": os.path.basename(self.strInfoImageCsvPath),
+                "int_current_level_num": self.intCurrentLevelNum,
+                "str_plt_name": self.strPltName,
+                "list_test_info": self.listTestInfo,
+                "list_plt_color_type": self.listPltColorType,
+                "int_battery_num": self.intBatteryNum,
+                "max_xaxis": int(self.listTestInfo[8]),
+            },
+        }
+        with open(os.path.join(self.strResultPath, SVG_SPEC_JSON), "w", encoding="utf-8") as f:
+            # listCpt 中可能含 numpy 标量 / 数组
+            json.dump(spec, f, ensure_ascii=False, default=lambda value: value.tolist())
 
     # ── 静态工具 ──
 
@@ -433,6 +519,111 @@ class ReportCoordinator:
         return fallback
 
 
+# ── 渲染任务（模块级函数，可被 pickle 后在子进程执行） ──────────
+
+
+def _draw_boxplots(coordinator: ReportCoordinator, listCpt, image_formats) -> None:
+    with span("report.boxplots"), _PYPLOT_LOCK:
+        plot_writer.draw_boxplots(
+            coordinator.intCurrentLevelNum, coordinator.intVoltageLevelNum,
+            coordinator.listVoltageLevel, coordinator.listBoxplotTitle,
+            coordinator.listPngPath, coordinator.listSvgPath,
+            listCpt, image_formats)
+
+
+def _draw_curves(coordinator: ReportCoordinator, filtered: bool, image_formats) -> None:
+    if filtered:
+        png_path, svg_path = coordinator.strFilteredPngPath, coordinator.strFilteredSvgPath
+    else:
+        png_path, svg_path = coordinator.strUnfilteredPngPath, coordinator.strUnfilteredSvgPath
+    with span("report.filtered_curves" if filtered else "report.unfiltered_curves"), _PYPLOT_LOCK:
+        plot_writer.draw_load_voltage_curves(
+            coordinator.strInfoImageCsvPath, coordinator.intCurrentLevelNum,
+            coordinator.strPltName, png_path, svg_path,
+            coordinator.listTestInfo, coordinator.listPltColorType,
+            coordinator.intBatteryNum, int(coordinator.listTestInfo[8]),
+            filtered=filtered, image_formats=image_formats)
+    if multiprocessing.parent_process() is not None:
+        # 子进程不保留 Info_Image.npz 的内存映射，否则 Windows 下主进程无法重命名 / 删除结果目录
+        clear_info_image_cache()
+
+
+def _write_xlsx(coordinator: ReportCoordinator, listCpt, stats) -> None:
+    from battery_analysis.utils.writers.excel_report_writer import ExcelReportWriter
+    with span("report.xlsx"):
+        ExcelReportWriter(coordinator.strResultPath, coordinator.listTestInfo,
+                          coordinator.listBatteryInfo).write(listCpt, stats)
+
+
+def _write_docx(coordinator: ReportCoordinator, listCpt, stats) -> None:
+    from battery_analysis.utils.writers.word_report_writer import WordReportWriter
+    with span("report.docx"):
+        WordReportWriter(coordinator.strResultPath, coordinator.listTestInfo, coordinator.listBatteryInfo,
+                         equipment_info=coordinator._equipment_info).write(listCpt, stats)
+
+
+def _write_csv(coordinator: ReportCoordinator, listCpt, stats) -> None:
+    from battery_analysis.utils.writers.csv_writer import CsvWriter
+    with span("report.csv"):
+        CsvWriter(coordinator.strResultPath, coordinator.listTestInfo,
+                  coordinator.listBatteryInfo).write(listCpt, stats)
+
+
+def _draw_deferred_boxplots(result_dir: str, args: dict) -> None:
+    args = dict(args, list_svg_path=[os.path.join(result_dir, name) for name in args["list_svg_path"]])
+    with _PYPLOT_LOCK:
+        plot_writer.draw_boxplots(list_png_path=[""] * len(args["list_svg_path"]),
+                                  image_formats=("svg",), **args)
+
+
+def _draw_deferred_curves(result_dir: str, args: dict, filtered: bool, svg_name: str) -> None:
+    args = dict(args, str_info_image_csv_path=os.path.join(result_dir, args["str_info_image_csv_path"]))
+    with _PYPLOT_LOCK:
+        plot_writer.draw_load_voltage_curves(
+            str_png_path="", str_svg_path=os.path.join(result_dir, svg_name),
+            filtered=filtered, image_formats=("svg",), **args)
+    if multiprocessing.parent_process() is not None:
+        clear_info_image_cache()
+
+
+def render_deferred_svgs(result_dir: str, executor: TaskExecutor | None = None) -> list:
+    """按 svg_mode="lazy" 时写入的 SVG_SPEC_JSON 生成 SVG，完成后删除该文件
+
+    Args:
+        result_dir: 结果目录（<测试日期>_v<版本>）
+        executor: 渲染任务所用的 TaskExecutor；None 表示共享进程池
+
+    Returns:
+        生成的 SVG 路径列表；目录中没有待生成的 SVG 时为空列表
+
+    Raises:
+        ValueError: 描述文件格式无法识别
+        OSError: 文件无法读取或写入
+    """
+    spec_path = os.path.join(result_dir, SVG_SPEC_JSON)
+    if not os.path.isfile(spec_path):
+        return []
+    with open(spec_path, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+    if not isinstance(spec, dict) or spec.get("format") != SVG_SPEC_FORMAT:
+        raise ValueError(f"Unsupported SVG spec: {spec_path}")
+
+    boxplots = spec["boxplots"]
+    tasks = [GraphTask("boxplots", _draw_deferred_boxplots, (result_dir, boxplots))]
+    paths = [os.path.join(result_dir, name) for name in boxplots["list_svg_path"]]
+    for curve in spec["curves"]:
+        name = "filtered_curves" if curve["filtered"] else "unfiltered_curves"
+        tasks.append(GraphTask(name, _draw_deferred_curves,
+                               (result_dir, spec["curve_args"], curve["filtered"], curve["str_svg_path"])))
+        paths.append(os.path.join(result_dir, curve["str_svg_path"]))
+
+    timings = (executor or TaskExecutor()).run_graph(tasks)
+    logger.info("Rendered %d deferred SVGs in %s", len(paths), result_dir)
+    logger.debug("Deferred SVG timings: %s", timings)
+    os.remove(spec_path)
+    return paths
+
+
 # ── 向后兼容别名 ──────────────────────────────────────────────
 
 XlsxWordWriter = ReportCoordinator
@@ -3,9 +3,23 @@
 
 提供了获取最优进程数和处理上下文的功能，能够根据CPU使用率和内存情况
 动态调整并行处理的资源分配，以确保系统性能和稳定性。
+
+  - CPU 负载由两次 psutil.cpu_times() 的差值计算，不阻塞调用方；
+    模块导入时取第一次样本，距上次采样过近时沿用上一次的结果
+  - 单个子进程的峰值内存按输入 xlsx 大小估计，比例取自之前运行中子进程
+    实测的峰值常驻内存，持久化在缓存目录的 RESOURCE_PROFILE_FILE 中
+  - recommend() 给出同时处理的文件数与分块大小，供 BatteryAnalysis.run
+    与 DataProcessor 限制并发，避免多个大文件同时解析导致内存耗尽
 """
-import multiprocessing
+import json
 import logging
+import math
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
 
 try:
     import psutil
@@ -13,21 +27,172 @@ try:
 except ImportError:
     PSUTIL_AVAILABLE = False
 
+logger = logging.getLogger(__name__)
+
+# 两次 CPU 采样的最小间隔（秒），间隔过短时差值不可信，沿用上一次的结果
+MIN_CPU_SAMPLE_INTERVAL = 0.2
+
+# 子进程导入 pandas / calamine / battery_analysis 后的常驻内存
+WORKER_BASE_RSS = 150 * 1024 ** 2
+# 没有实测记录时，解析每字节 xlsx 所需内存（xlsx 为压缩格式，解析后约为文件大小的 10~30 倍）
+DEFAULT_RSS_PER_INPUT_BYTE = 20.0
+# 只把可用内存的这一比例分配给子进程
+MEMORY_HEADROOM = 0.8
+# 小于此大小的文件以常驻内存为主，不用于估计比例
+MIN_PROFILE_INPUT_BYTES = 1024 ** 2
+
+# 自动分块时每个子进程分到的块数（块越多进度越细，块越少往返越少）
+CHUNKS_PER_WORKER = 4
+# 每块的输入总量上限：大文件按单个文件提交，避免一个子进程领走多个大文件
+TARGET_CHUNK_BYTES = 32 * 1024 ** 2
+
+# 缓存目录中记录子进程实测内存的文件及其保留的样本数
+RESOURCE_PROFILE_FILE = "resource_profile.json"
+MAX_PROFILE_SAMPLES = 20
+
+
+class _CpuLoadSampler:
+    """以 cpu_times 差值计算系统 CPU 使用率（不与其他 psutil.cpu_percent 调用方共享状态）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last = None
+        self._load = None
+
+    def sample(self) -> float | None:
+        """距上次采样以来的 CPU 使用率（%）；尚无有效样本时为 None"""
+        now, times = time.monotonic(), psutil.cpu_times()
+        with self._lock:
+            if self._last is not None and now - self._last[0] >= MIN_CPU_SAMPLE_INTERVAL:
+                total = sum(times) - sum(self._last[1])
+                idle = _idle_time(times) - _idle_time(self._last[1])
+                if total > 0:
+                    self._load = min(max(100.0 * (1 - idle / total), 0.0), 100.0)
+            if self._last is None or now - self._last[0] >= MIN_CPU_SAMPLE_INTERVAL:
+                self._last = (now, times)
+            return self._load
+
+
+def _idle_time(times) -> float:
+    return times.idle + getattr(times, "iowait", 0.0)
+
+
+_cpu_sampler = _CpuLoadSampler() if PSUTIL_AVAILABLE else None
+if _cpu_sampler is not None:
+    try:
+        _cpu_sampler.sample()
+    except (psutil.Error, OSError):
+        pass
+
+
+def default_profile_path() -> str:
+    from battery_analysis.utils.cache_paths import default_cache_root
+    return str(default_cache_root() / RESOURCE_PROFILE_FILE)
+
+
+class ResourceProfile:
+    """子进程峰值内存的实测记录
+
+    每个样本为 (该子进程处理过的最大输入字节数, 该子进程的峰值常驻内存)：
+    峰值常驻内存是进程生命周期内的最大值，因此与之配对的也是生命周期内的最大输入。
+
+    Args:
+        path: 记录文件路径；None 表示缓存目录下的 RESOURCE_PROFILE_FILE
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or default_profile_path()
+        self.samples = self._load()
+
+    def _load(self) -> list:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return [(int(size), int(rss)) for size, rss in data["samples"]][-MAX_PROFILE_SAMPLES:]
+        except (OSError, ValueError, KeyError, TypeError):
+            return []
+
+    def bytes_per_input_byte(self) -> float:
+        """解析每字节输入所需内存：取近期样本中的最大值，没有可用样本时为默认值"""
+        ratios = [(rss - WORKER_BASE_RSS) / size for size, rss in self.samples
+                  if size >= MIN_PROFILE_INPUT_BYTES]
+        return max(max(ratios), 0.0) if ratios else DEFAULT_RSS_PER_INPUT_BYTE
+
+    def estimate_worker_bytes(self, input_bytes: int) -> int:
+        """处理 input_bytes 大小的文件时单个子进程的峰值内存估计"""
+        return int(WORKER_BASE_RSS + self.bytes_per_input_byte() * input_bytes)
+
+    def record(self, input_bytes: int, peak_rss: int) -> None:
+        """追加一个样本并写回文件（写入失败只记录日志）"""
+        if input_bytes <= 0 or peak_rss <= 0:
+            return
+        self.samples = (self.samples + [(int(input_bytes), int(peak_rss))])[-MAX_PROFILE_SAMPLES:]
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"samples": self.samples}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.debug("Failed to save resource profile %s: %s", self.path, e)
+
+
+@dataclass(frozen=True)
+class WorkerPlan:
+    """一批文件的并发建议
+
+    Attributes:
+        workers: 同时处理的文件数上限
+        chunk_size: 每次提交给子进程的文件数
+        worker_bytes: 单个子进程的峰值内存估计（字节）
+    """
+    workers: int
+    chunk_size: int
+    worker_bytes: int
+
+
+# 本进程中子进程处理过的最大输入（仅在子进程中有意义）
+_largest_input_bytes = 0
+
 
 class ResourceManager:
     """
     系统资源管理器，用于根据系统负载动态调整并行处理的资源使用
     """
 
+    @staticmethod
+    def cpu_load() -> float | None:
+        """系统 CPU 使用率（%，距上次采样的平均值），不阻塞；无法获取时为 None"""
+        if _cpu_sampler is None:
+            return None
+        try:
+            return _cpu_sampler.sample()
+        except (psutil.Error, OSError) as e:
+            logger.debug("Failed to sample CPU load: %s", e)
+            return None
+
+    @staticmethod
+    def available_memory() -> int | None:
+        """可用内存（字节）；无法获取时为 None"""
+        if not PSUTIL_AVAILABLE:
+            return None
+        try:
+            return int(psutil.virtual_memory().available)
+        except (psutil.Error, OSError) as e:
+            logger.debug("Failed to read available memory: %s", e)
+            return None
+
     @staticmethod
     def get_optimal_process_count(max_processes_default: int = 8,
-                                  min_processes: int = 1) -> int:
+                                  min_processes: int = 1,
+                                  worker_bytes: int | None = None) -> int:
         """
         根据系统CPU使用率和内存情况，获取最优的进程数
 
         Args:
             max_processes_default: 默认的最大进程数上限
             min_processes: 最小进程数
+            worker_bytes: 单个进程的内存估计；None 表示按实测记录估计空闲子进程的内存
 
         Returns:
             计算得到的最优进程数
@@ -38,43 +203,78 @@ class ResourceManager:
         max_processes = min(cpu_count, max_processes_default)
 
         if PSUTIL_AVAILABLE:
-            try:
-                # 检测系统CPU使用率（1秒平均值）
-                cpu_usage = psutil.cpu_percent(interval=1, percpu=False)
-                logging.info("Current system CPU usage: %.2f%%", cpu_usage)
-
-                # 根据CPU使用率动态调整进程数
-                if cpu_usage > 80:
-                    # 系统高负载：仅使用较少核心
-                    max_processes = min(max_processes_default, 2)
-                    logging.info("System under high load, adjusted process count to: %d", max_processes)
-                elif cpu_usage > 50:
-                    # 系统中负载：使用一半核心
-                    max_processes = min(max_processes_default,
-                                        max(2, cpu_count // 2))
-                    logging.info("System under medium load, adjusted process count to: %d", max_processes)
-                else:
-                    # 系统低负载：使用默认进程数
-                    max_processes = max_processes_default
-                    logging.info("System under low load, using process count: %d", max_processes)
-
-                # 考虑内存限制（每个进程约100MB内存）
-                available_memory_gb = psutil.virtual_memory().available / (1024 ** 3)
-                memory_based_processes = int(
-                    available_memory_gb * 10)  # 每100MB内存一个进程
-                max_processes = min(max_processes, memory_based_processes)
-                logging.info("After considering memory limits, adjusted process count to: %d", max_processes)
-            except (psutil.Error, OSError) as e:
-                # 捕获psutil相关的具体异常
-                logging.error("Error getting system resource info: %s", str(e))
+            cpu_usage = ResourceManager.cpu_load()
+            if cpu_usage is None:
+                logger.info("CPU usage not sampled yet, using process count: %d", max_processes)
+            elif cpu_usage > 80:
+                # 系统高负载：仅使用较少核心
+                max_processes = min(max_processes, 2)
+                logger.info("System under high load (%.2f%%), adjusted process count to: %d",
+                            cpu_usage, max_processes)
+            elif cpu_usage > 50:
+                # 系统中负载：使用一半核心
+                max_processes = min(max_processes, max(2, cpu_count // 2))
+                logger.info("System under medium load (%.2f%%), adjusted process count to: %d",
+                            cpu_usage, max_processes)
+            else:
+                logger.info("System under low load (%.2f%%), using process count: %d",
+                            cpu_usage, max_processes)
+
+            # 考虑内存限制
+            available = ResourceManager.available_memory()
+            if available is not None:
+                if worker_bytes is None:
+                    worker_bytes = ResourceProfile().estimate_worker_bytes(0)
+                max_processes = min(max_processes, int(available * MEMORY_HEADROOM // worker_bytes))
+                logger.info("After considering memory limits, adjusted process count to: %d", max_processes)
         else:
             # 如果psutil不可用，使用默认值
-            logging.warning("psutil library unavailable, using default process count")
+            logger.warning("psutil library unavailable, using default process count")
 
         # 确保进程数在合理范围内
-        max_processes = max(max_processes, min_processes)
+        return max(max_processes, min_processes)
+
+    @staticmethod
+    def recommend(file_paths, max_workers: int | None = None,
+                  profile: ResourceProfile | None = None) -> WorkerPlan:
+        """按 CPU 负载、可用内存与输入文件大小给出一批文件的并发建议
+
+        Args:
+            file_paths: 待处理的 xlsx 路径
+            max_workers: 并发上限（如进程池大小）；None 表示 CPU 核心数
+            profile: 内存实测记录；None 表示读取默认记录文件
 
-        return max_processes
+        Returns:
+            WorkerPlan
+        """
+        sizes = []
+        for path in file_paths:
+            try:
+                sizes.append(os.path.getsize(path))
+            except OSError:
+                sizes.append(0)
+        worker_bytes = (profile or ResourceProfile()).estimate_worker_bytes(max(sizes, default=0))
+        workers = ResourceManager.get_optimal_process_count(
+            max_workers or multiprocessing.cpu_count(), worker_bytes=worker_bytes)
+        workers = max(1, min(workers, len(sizes) or 1))
+
+        chunk_size = max(1, math.ceil(len(sizes) / (workers * CHUNKS_PER_WORKER)))
+        if sizes:
+            mean_size = sum(sizes) / len(sizes)
+            chunk_size = max(1, min(chunk_size, int(TARGET_CHUNK_BYTES // max(mean_size, 1))))
+        logger.info("Worker plan for %d files: %d concurrent, chunk size %d, ~%.0f MB per worker",
+                    len(sizes), workers, chunk_size, worker_bytes / 1024 ** 2)
+        return WorkerPlan(workers, chunk_size, worker_bytes)
+
+    @staticmethod
+    def observe_input(file_path: str) -> int:
+        """在子进程中记下即将处理的文件，返回本进程处理过的最大输入字节数"""
+        global _largest_input_bytes  # pylint: disable=global-statement
+        try:
+            _largest_input_bytes = max(_largest_input_bytes, os.path.getsize(file_path))
+        except OSError:
+            pass
+        return _largest_input_bytes
 
     @staticmethod
     def get_processing_context():
@@ -0,0 +1,298 @@
+"""
+任务执行器模块
+
+为"对一组输入逐个调用同一函数"的批处理提供统一入口，后端可选：
+
+  - process: 常驻进程池（默认，见 worker_pool）
+  - thread:  线程池，适合以 I/O 为主或已释放 GIL 的任务
+  - serial:  在调用线程中逐个执行，失败项同样跳过
+  - inline:  在调用线程中逐个执行且不捕获异常，供测试直接定位错误
+
+map 按提交顺序返回全部结果；imap_unordered 按完成顺序逐项产出，供调用方
+边计算边消费。所有后端的行为一致：属于 skip_exceptions 的失败项
+记为 None 并通过 on_error 回调（默认写日志）报告，每完成一项回调一次进度。
+任务较多时 process 后端按块提交，减少进程间往返次数；子进程异常退出
+（BrokenProcessPool）时，若其属于 skip_exceptions，在途块中的每项都记为失败，
+进程池在下次提交时自动重建。
+
+run_graph 执行一组带依赖的异构任务（如报告渲染）：依赖全部完成的任务立即
+提交，互不依赖的任务并行执行，返回各任务在执行端测得的耗时。
+
+调用方启用了 instrumentation 的 Profiler 时，process 后端在子进程中收集任务内的
+埋点并随结果返回、合并到调用方的 Profiler；其余后端直接记录在本进程中。
+"""
+import concurrent.futures
+import logging
+import math
+import time
+from dataclasses import dataclass
+
+from battery_analysis.utils.instrumentation import active_profiler, collect, merge_collected
+from battery_analysis.utils.resource_manager import CHUNKS_PER_WORKER
+from battery_analysis.utils.worker_pool import get_worker_pool
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_BACKENDS = ("process", "thread", "serial", "inline")
+DEFAULT_BACKEND = "process"
+
+# process 后端每个子进程同时在途的块数（其余块在前面的块完成后再提交）
+IN_FLIGHT_CHUNKS_PER_WORKER = 2
+
+
+@dataclass(frozen=True)
+class GraphTask:
+    """run_graph 中的一个任务
+
+    Attributes:
+        name: 任务名（同一图中唯一，也是耗时字典的键）
+        fn: 任务函数；process 后端要求可被 pickle（模块级函数或静态方法）
+        args: 位置参数
+        deps: 必须先完成的任务名，须在本任务之前加入图中
+    """
+    name: str
+    fn: object
+    args: tuple = ()
+    deps: tuple = ()
+
+
+def _run_timed(fn, args) -> float:
+    """执行 fn(*args)，返回耗时（秒）；返回值被丢弃，任务通过文件交换结果"""
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def _run_chunk(fn, chunk, skip_exceptions) -> list:
+    """在子进程中依次执行一块任务，返回 [(是否成功, 结果或异常), ...]"""
+    outcomes = []
+    for args in chunk:
+        try:
+            outcomes.append((True, fn(args)))
+        except skip_exceptions as e:
+            outcomes.append((False, e))
+    return outcomes
+
+
+class TaskExecutor:
+    """可切换后端的批量任务执行器
+
+    Args:
+        backend: EXECUTOR_BACKENDS 之一
+        max_workers: 并发数；None 表示由后端自行决定。process 后端只据此限制在途任务，
+            不改变共享进程池的大小（由 worker_pool.max_workers 或 CLI 的 --jobs 设定）
+        chunk_size: process 后端每次提交的任务数；None 表示按任务数自动计算
+    """
+
+    def __init__(self, backend: str = DEFAULT_BACKEND, max_workers: int | None = None,
+                 chunk_size: int | None = None):
+        if backend not in EXECUTOR_BACKENDS:
+            raise ValueError(f"Unknown executor backend: {backend!r}, "
+                             f"expected one of {', '.join(EXECUTOR_BACKENDS)}")
+        self.backend = backend
+        self.max_workers = max_workers or None
+        self.chunk_size = chunk_size or None
+
+    def imap_unordered(self, fn, args_list, skip_exceptions=(Exception,), on_error=None,
+                       chunk_size: int | None = None, max_concurrent: int | None = None):
+        """对每个参数调用 fn(args)，按完成顺序逐项产出 (下标, 结果)（失败项结果为 None）
+
+        调用方可在其余任务仍在执行时处理已完成的结果；process 后端只保持有限数量的
+        块在途，提前结束迭代时不再提交剩余任务。
+
+        Args:
+            fn: 单参数函数；process 后端要求可被 pickle（模块级函数或静态方法）
+            args_list: 参数序列
+            skip_exceptions: 视为单项失败并跳过的异常类型，其余异常直接抛出
+            on_error: 回调 (下标, 异常)；为 None 时写错误日志
+            chunk_size: 本次调用的分块大小；None 时使用构造参数或自动计算
+            max_concurrent: 同时执行的任务数上限（如 ResourceManager.recommend 的建议），
+                与 max_workers 取较小者；小于进程池大小时只减少在途的块，不重建进程池
+        """
+        args_list = list(args_list)
+        if not args_list:
+            return
+        skip_exceptions = tuple(skip_exceptions)
+
+        def _failed(idx, e):
+            if on_error is not None:
+                on_error(idx, e)
+            else:
+                logger.error("Task %d failed (skipped): %s", idx, e)
+            return idx, None
+
+        if self.backend in ("serial", "inline"):
+            for idx, args in enumerate(args_list):
+                if self.backend == "inline":
+                    yield idx, fn(args)
+                    continue
+                try:
+                    value = fn(args)
+                except skip_exceptions as e:
+                    yield _failed(idx, e)
+                    continue
+                yield idx, value
+        elif self.backend == "thread":
+            workers = min(filter(None, (self.max_workers, max_concurrent)), default=None)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                future_to_idx = {executor.submit(fn, args): idx for idx, args in enumerate(args_list)}
+                try:
+                    for future in concurrent.futures.as_completed(future_to_idx):
+                        try:
+                            value = future.result()
+                        except skip_exceptions as e:
+                            yield _failed(future_to_idx[future], e)
+                            continue
+                        yield future_to_idx[future], value
+                finally:
+                    for future in future_to_idx:
+                        future.cancel()
+        else:
+            pool = get_worker_pool()
+            workers = pool.start()
+            # 每块在一个子进程中顺序执行：在途块数不超过并发上限即限制了并发
+            limit = min(filter(None, (self.max_workers, max_concurrent)), default=None)
+            if limit and limit < workers:
+                workers = max_in_flight = limit
+            else:
+                max_in_flight = workers * IN_FLIGHT_CHUNKS_PER_WORKER
+            chunk_size = (chunk_size or self.chunk_size
+                          or max(1, math.ceil(len(args_list) / (workers * CHUNKS_PER_WORKER))))
+            collecting = active_profiler() is not None
+            starts = iter(range(0, len(args_list), chunk_size))
+            in_flight = {}
+            while True:
+                # 保持 max_in_flight 个块在途，其余块随完成逐步提交
+                while len(in_flight) < max_in_flight:
+                    start = next(starts, None)
+                    if start is None:
+                        break
+                    chunk = args_list[start:start + chunk_size]
+                    if collecting:
+                        future = pool.submit(collect, _run_chunk, fn, chunk, skip_exceptions)
+                    else:
+                        future = pool.submit(_run_chunk, fn, chunk, skip_exceptions)
+                    in_flight[future] = start
+                if not in_flight:
+                    break
+                done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    start = in_flight.pop(future)
+                    try:
+                        outcomes = future.result()
+                    except skip_exceptions as e:
+                        # 整块失败（如子进程被杀导致 BrokenProcessPool）：块内每项都记为失败
+                        for idx in range(start, min(start + chunk_size, len(args_list))):
+                            yield _failed(idx, e)
+                        continue
+                    if collecting:
+                        outcomes, records = outcomes
+                        merge_collected(records)
+                    for offset, (ok, value) in enumerate(outcomes):
+                        yield (start + offset, value) if ok else _failed(start + offset, value)
+
+    def map(self, fn, args_list, skip_exceptions=(Exception,), on_progress=None, on_error=None) -> list:
+        """对每个参数调用 fn(args)，按提交顺序返回结果（失败项为 None）
+
+        Args:
+            fn: 单参数函数；process 后端要求可被 pickle（模块级函数或静态方法）
+            args_list: 参数序列
+            skip_exceptions: 视为单项失败并跳过的异常类型，其余异常直接抛出
+            on_progress: 回调 (已完成数, 总数)，在调用线程中执行
+            on_error: 回调 (下标, 异常)；为 None 时写错误日志
+        """
+        args_list = list(args_list)
+        results = [None] * len(args_list)
+        for completed, (idx, value) in enumerate(
+                self.imap_unordered(fn, args_list, skip_exceptions, on_error), start=1):
+            results[idx] = value
+            if on_progress is not None:
+                on_progress(completed, len(args_list))
+        return results
+
+    def run_graph(self, tasks, on_task_done=None) -> dict:
+        """按依赖关系执行 GraphTask 列表，互不依赖的任务并发执行
+
+        任一任务失败后不再提交新任务，等待已提交的任务结束后抛出第一个异常；
+        依赖失败任务的任务不会执行。serial / inline 后端按列表顺序在调用线程中执行。
+
+        Args:
+            tasks: GraphTask 序列
+            on_task_done: 回调 (任务名, 已完成数, 总数)，在调用线程中执行
+
+        Returns:
+            {任务名: 耗时（秒）}，按完成顺序
+
+        Raises:
+            ValueError: 任务名重复，或依赖未在该任务之前声明
+        """
+        tasks = list(tasks)
+        declared = set()
+        for task in tasks:
+            if task.name in declared:
+                raise ValueError(f"Duplicate graph task: {task.name!r}")
+            missing = [dep for dep in task.deps if dep not in declared]
+            if missing:
+                raise ValueError(f"Graph task {task.name!r} depends on undeclared {', '.join(missing)}")
+            declared.add(task.name)
+
+        timings = {}
+
+        def _done(name, seconds):
+            timings[name] = seconds
+            if on_task_done is not None:
+                on_task_done(name, len(timings), len(tasks))
+
+        if self.backend in ("serial", "inline"):
+            for task in tasks:
+                _done(task.name, _run_timed(task.fn, task.args))
+            return timings
+
+        if self.backend == "thread":
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+            submit = executor.submit
+            max_running = len(tasks)
+        else:
+            executor = None
+            submit = get_worker_pool().submit
+            # 共享进程池的大小不变，max_workers 只限制本次同时执行的任务数
+            max_running = self.max_workers or len(tasks)
+        collecting = self.backend == "process" and active_profiler() is not None
+
+        pending, running, error = tasks, {}, None
+        try:
+            while pending or running:
+                if error is None:
+                    waiting = []
+                    for task in pending:
+                        if len(running) < max_running and all(dep in timings for dep in task.deps):
+                            if collecting:
+                                running[submit(collect, _run_timed, task.fn, task.args)] = task.name
+                            else:
+                                running[submit(_run_timed, task.fn, task.args)] = task.name
+                        else:
+                            waiting.append(task)
+                    pending = waiting
+                else:
+                    pending = []
+                if not running:
+                    break
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        seconds = future.result()
+                    except Exception as e:  # 等待其余已提交任务结束后再抛出
+                        logger.error("Graph task %s failed: %s", name, e)
+                        error = error or e
+                        continue
+                    if collecting:
+                        seconds, records = seconds
+                        merge_collected(records)
+                    _done(name, seconds)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+        if error is not None:
+            raise error
+        return timings
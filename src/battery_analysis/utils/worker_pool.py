@@ -0,0 +1,190 @@
+"""
+常驻进程池模块
+
+分析、目录验证与报告渲染共用同一个按需启动的 ProcessPoolExecutor，
+避免每次分析都重新 spawn 子进程并重复导入 pandas / calamine / battery_analysis
+（冻结版 Windows 程序每次约 2~4 秒）。
+
+  - 首次 submit 或 warm_up() 时才启动进程池
+  - warm_up() 在后台预导入分析模块，供主窗口空闲时调用
+  - 未完成任务数受信号量限制，超出时 submit 阻塞，避免任务队列无限增长
+  - 子进程异常退出（BrokenProcessPool）后自动重建
+  - 应用退出时 shutdown_worker_pool() 取消排队任务并回收子进程
+  - 已创建 LogManager 时，子进程日志经队列转发到主进程的日志文件
+"""
+import atexit
+import concurrent.futures
+import logging
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+from battery_analysis.utils.log_manager import configure_worker_logging, get_worker_log_queue
+from battery_analysis.utils.resource_manager import ResourceManager
+
+logger = logging.getLogger(__name__)
+
+# 每个子进程允许排队的任务数
+PENDING_TASKS_PER_WORKER = 4
+
+# 预热时在子进程中导入的模块
+_WARM_UP_MODULES = (
+    "battery_analysis.utils.processors.battery_analysis",
+    "battery_analysis.utils.report_coordinator",
+)
+
+
+def _warm_up_worker(modules) -> int:
+    """在子进程中导入分析模块（首次导入的耗时留在空闲期完成）"""
+    import importlib
+    import os
+
+    for name in modules:
+        importlib.import_module(name)
+    return os.getpid()
+
+
+class WorkerPool:
+    """按需启动、可复用的进程池
+
+    Args:
+        max_workers: 子进程数；为 None 时首次启动时由 ResourceManager 决定
+        max_pending: 最多未完成的任务数；为 None 时取 max_workers * PENDING_TASKS_PER_WORKER
+    """
+
+    def __init__(self, max_workers: int | None = None, max_pending: int | None = None):
+        self._requested_workers = max_workers
+        self._requested_pending = max_pending
+        self._executor = None
+        self._slots = None
+        self._retired = []
+        self.max_workers = 0
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._executor is not None
+
+    def _ensure_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._join_retired()
+                self.max_workers = self._requested_workers or ResourceManager.get_optimal_process_count()
+                max_pending = self._requested_pending or self.max_workers * PENDING_TASKS_PER_WORKER
+                self._slots = threading.BoundedSemaphore(max_pending)
+                log_queue = get_worker_log_queue()
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=ResourceManager.get_processing_context(),
+                    initializer=configure_worker_logging if log_queue is not None else None,
+                    initargs=(log_queue,) if log_queue is not None else ())
+                logger.info("Worker pool started: %d processes, %d pending tasks max",
+                            self.max_workers, max_pending)
+            return self._executor, self._slots
+
+    def _discard_broken(self, executor) -> None:
+        """子进程异常退出后丢弃该执行器，下次提交时重建
+
+        此处可能运行在其管理线程的回调中，不能调用 executor.shutdown()
+        （会等待管理线程自身而死锁）；也不能直接丢弃引用，执行器在管理线程
+        清理期间被回收同样会死锁。先放入 _retired，由下次启动或 shutdown() 回收。
+        已退役的执行器不再加锁，避免与持锁回收它的线程互相等待。
+        """
+        if self._executor is not executor:
+            return
+        with self._lock:
+            if self._executor is executor:
+                logger.warning("Worker pool is broken, it will be restarted on next use")
+                self._executor = None
+                self._slots = None
+                self._retired.append(executor)
+
+    def _join_retired(self) -> None:
+        retired, self._retired = self._retired, []
+        for executor in retired:
+            executor.shutdown(wait=True)
+
+    def submit(self, fn, *args, **kwargs) -> concurrent.futures.Future:
+        """提交任务；未完成任务数达到上限时阻塞等待
+
+        fn 与参数须可被 pickle（模块级函数或静态方法）。
+        """
+        for attempt in range(2):
+            executor, slots = self._ensure_executor()
+            slots.acquire()
+            try:
+                future = executor.submit(fn, *args, **kwargs)
+            except BrokenProcessPool:
+                slots.release()
+                self._discard_broken(executor)
+                if attempt:
+                    raise
+                continue
+            except BaseException:
+                slots.release()
+                raise
+
+            def _on_done(done, executor=executor, slots=slots):
+                slots.release()
+                if not done.cancelled() and isinstance(done.exception(), BrokenProcessPool):
+                    self._discard_broken(executor)
+
+            future.add_done_callback(_on_done)
+            return future
+        raise BrokenProcessPool("Worker pool could not be restarted")
+
+    def start(self) -> int:
+        """确保进程池已启动，返回子进程数"""
+        self._ensure_executor()
+        return self.max_workers
+
+    def resize(self, max_workers: int | None) -> None:
+        """修改子进程数；运行中的进程池在已提交任务完成后退役，下次提交按新大小启动"""
+        with self._lock:
+            if max_workers == self._requested_workers:
+                return
+            self._requested_workers = max_workers
+            if self._executor is not None and self.max_workers != max_workers:
+                self._executor.shutdown(wait=False)
+                self._retired.append(self._executor)
+                self._executor = None
+                self._slots = None
+
+    def warm_up(self) -> list:
+        """启动进程池并在每个子进程预导入分析模块，不等待完成"""
+        self.start()
+        return [self.submit(_warm_up_worker, _WARM_UP_MODULES) for _ in range(self.max_workers)]
+
+    def shutdown(self, wait: bool = True) -> None:
+        """取消排队任务并关闭子进程；之后再次 submit 会重新启动"""
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+            self._slots = None
+            self._join_retired()
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+            logger.info("Worker pool shut down")
+
+
+_default_pool: WorkerPool | None = None
+_default_pool_lock = threading.Lock()
+
+
+def get_worker_pool() -> WorkerPool:
+    """返回进程内共享的进程池实例"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = WorkerPool()
+        return _default_pool
+
+
+def shutdown_worker_pool(wait: bool = True) -> None:
+    """关闭共享进程池（应用退出时调用）"""
+    with _default_pool_lock:
+        pool = _default_pool
+    if pool is not None:
+        pool.shutdown(wait=wait)
+
+
+atexit.register(shutdown_worker_pool)
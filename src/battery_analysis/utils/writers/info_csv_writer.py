@@ -1,13 +1,24 @@
-"""Info_Image.csv 和 Info_Plot.json 写入器"""
+"""Info_Image.csv / Info_Image.npz 和 Info_Plot.json 写入器"""
 
 import csv
 import json
 import logging
 import os
+import shutil
+import tempfile
+import zipfile
 from typing import List, Optional
 
+import numpy as np
+
+from battery_analysis.utils.constants import INFO_IMAGE_CSV, INFO_IMAGE_NPZ
+from battery_analysis.utils.processors.pulse_curves import PulseCurves
+
 logger = logging.getLogger(__name__)
 
+# Info_Image.npz 格式版本
+INFO_IMAGE_NPZ_FORMAT = 1
+
 
 def write_info_csv(
     result_path: str,
@@ -35,7 +46,7 @@ def write_info_csv(
         list_all_charge: [b][c] = 电荷列表
         list_all_voltage: [b][c] = 电压列表
     """
-    file_path = os.path.join(result_path, "Info_Image.csv")
+    file_path = os.path.join(result_path, INFO_IMAGE_CSV)
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
     csv_data = []
@@ -50,6 +61,204 @@ def write_info_csv(
         writer = csv.writer(f)
         writer.writerows(csv_data)
 
+    write_info_npz(result_path, list_battery_name, len(list_current_level),
+                   list_all_posi, list_all_charge, list_all_voltage)
+
+
+def _flatten_rows(rows: list) -> tuple:
+    """[电池][值] → (扁平 float64 数组, 偏移数组)；含非数值时抛出 TypeError/ValueError"""
+    lengths = [len(row) for row in rows]
+    offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    values = np.fromiter((float(v) for row in rows for v in row), dtype=np.float64, count=int(offsets[-1]))
+    return values, offsets
+
+
+def write_info_npz(
+    result_path: str,
+    list_battery_name: List[str],
+    current_level_num: int,
+    list_all_posi: List[List[List[int]]],
+    list_all_charge: List[List[list]],
+    list_all_voltage: List[List[list]],
+) -> bool:
+    """写入 Info_Image.npz：与 Info_Image.csv 内容相同的二进制副本
+
+    每个电流等级 c 保存 ``{posi,charge,voltage}_{c}_values``（扁平 float64）与
+    ``..._offsets``（长度为电池数 + 1），未压缩，便于按内存映射读取。
+    同时记录 CSV 的大小与 mtime，读取时不一致即视为过期并回退到 CSV。
+
+    Returns:
+        是否写入成功；数据含非数值（CSV 读取时会跳过的单元格）时不写入
+    """
+    npz_path = os.path.join(result_path, INFO_IMAGE_NPZ)
+    try:
+        arrays = {}
+        for name, rows_by_battery in (("posi", list_all_posi), ("charge", list_all_charge),
+                                      ("voltage", list_all_voltage)):
+            for c in range(current_level_num):
+                values, offsets = _flatten_rows([rows_by_battery[b][c] for b in range(len(list_battery_name))])
+                arrays[f"{name}_{c}_values"] = values
+                arrays[f"{name}_{c}_offsets"] = offsets
+    except (TypeError, ValueError) as e:
+        logger.warning("Info_Image data is not purely numeric, skipping %s: %s", INFO_IMAGE_NPZ, e)
+        if os.path.exists(npz_path):
+            os.remove(npz_path)
+        return False
+    return _save_info_npz(result_path, list_battery_name, current_level_num, arrays)
+
+
+def _npz_metadata(result_path: str, list_battery_name: List[str], current_level_num: int) -> dict:
+    """Info_Image.npz 的元数据数组（CSV 须已写完，用于记录其大小与 mtime）"""
+    csv_stat = os.stat(os.path.join(result_path, INFO_IMAGE_CSV))
+    return {
+        "format": np.asarray(INFO_IMAGE_NPZ_FORMAT, dtype=np.int64),
+        "current_level_num": np.asarray(current_level_num, dtype=np.int64),
+        "source_size": np.asarray(csv_stat.st_size, dtype=np.int64),
+        "source_mtime_ns": np.asarray(csv_stat.st_mtime_ns, dtype=np.int64),
+        "battery_names": np.asarray(
+            ["" if name is None else str(name).strip() for name in list_battery_name], dtype=str),
+    }
+
+
+def _save_info_npz(result_path: str, list_battery_name: List[str], current_level_num: int,
+                   arrays: dict) -> bool:
+    """补充元数据后原子写入 Info_Image.npz"""
+    npz_path = os.path.join(result_path, INFO_IMAGE_NPZ)
+    arrays.update(_npz_metadata(result_path, list_battery_name, current_level_num))
+
+    fd, tmp_path = tempfile.mkstemp(suffix=".npz.tmp", dir=result_path)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, npz_path)
+    except OSError as e:
+        logger.warning("Failed to write %s: %s", npz_path, e)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+    return True
+
+
+class InfoImageWriter:
+    """逐个电池流式写入 Info_Image.csv 与 Info_Image.npz
+
+    CSV 行直接追加到同目录的临时文件；.npz 的各扁平数组同样逐电池追加到临时
+    数据文件，内存中只保留偏移。commit() 时先把 CSV 原子重命名为正式文件，
+    再把临时数据拼装为未压缩 .npz 并原子重命名；中途失败或调用 abort() 时删除
+    临时文件，已有的正式文件保持不变。输出与 write_info_image 逐字节一致。
+
+    Args:
+        result_path: 输出目录路径
+        current_level_num: 电流等级数
+    """
+
+    _ARRAY_NAMES = ("posi", "charge", "voltage")
+
+    def __init__(self, result_path: str, current_level_num: int):
+        self.result_path = result_path
+        self.current_level_num = current_level_num
+        self.battery_names = []
+        os.makedirs(result_path, exist_ok=True)
+
+        self._tmp_dir = tempfile.mkdtemp(prefix=".info_image_", dir=result_path)
+        self._csv_file = open(os.path.join(self._tmp_dir, INFO_IMAGE_CSV), 'w', newline='', encoding='utf-8')
+        self._csv_writer = csv.writer(self._csv_file)
+        self._offsets = {f"{name}_{c}": [0] for name in self._ARRAY_NAMES for c in range(current_level_num)}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
+
+    def __len__(self):
+        return len(self.battery_names)
+
+    def add(self, battery_name: str, curves: PulseCurves) -> None:
+        """追加一个电池（调用顺序即文件中的顺序）"""
+        self.battery_names.append(battery_name)
+        self._csv_writer.writerow(["BATTERY", battery_name])
+        for posi, charge, voltage in zip(curves.posi_lists(), curves.charge_lists(), curves.voltage_lists()):
+            self._csv_writer.writerows((posi, charge, voltage))
+
+        # 数据文件每次追加后即关闭，同时打开多个写入器（批量调度）时不占用大量文件句柄
+        for name in self._ARRAY_NAMES:
+            values = getattr(curves, name)
+            for c in range(self.current_level_num):
+                key = f"{name}_{c}"
+                part = values[curves.offsets[c]:curves.offsets[c + 1]]
+                with open(os.path.join(self._tmp_dir, f"{key}.bin"), 'ab') as f:
+                    f.write(part.astype('<f8', copy=False).tobytes())
+                self._offsets[key].append(self._offsets[key][-1] + len(part))
+
+    def _write_npz(self, npz_tmp: str) -> None:
+        with zipfile.ZipFile(npz_tmp, 'w', zipfile.ZIP_STORED, allowZip64=True) as zf:
+            for key, offsets in self._offsets.items():
+                with zf.open(f"{key}_values.npy", 'w', force_zip64=True) as out:
+                    np.lib.format.write_array_header_1_0(
+                        out, {"descr": "<f8", "fortran_order": False, "shape": (offsets[-1],)})
+                    if offsets[-1]:
+                        with open(os.path.join(self._tmp_dir, f"{key}.bin"), 'rb') as src:
+                            shutil.copyfileobj(src, out)
+                with zf.open(f"{key}_offsets.npy", 'w', force_zip64=True) as out:
+                    np.lib.format.write_array(out, np.asarray(offsets, dtype=np.int64), allow_pickle=False)
+            metadata = _npz_metadata(self.result_path, self.battery_names, self.current_level_num)
+            for key, array in metadata.items():
+                with zf.open(f"{key}.npy", 'w', force_zip64=True) as out:
+                    np.lib.format.write_array(out, array, allow_pickle=False)
+
+    def commit(self) -> None:
+        """把临时文件原子替换为正式的 Info_Image.csv / Info_Image.npz
+
+        Raises:
+            OSError: CSV 无法写入或重命名（.npz 写入失败只记录警告）
+        """
+        try:
+            self._csv_file.close()
+            os.replace(os.path.join(self._tmp_dir, INFO_IMAGE_CSV),
+                       os.path.join(self.result_path, INFO_IMAGE_CSV))
+            npz_path = os.path.join(self.result_path, INFO_IMAGE_NPZ)
+            npz_tmp = os.path.join(self._tmp_dir, INFO_IMAGE_NPZ)
+            try:
+                self._write_npz(npz_tmp)
+                os.replace(npz_tmp, npz_path)
+            except OSError as e:
+                logger.warning("Failed to write %s: %s", npz_path, e)
+        finally:
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+    def abort(self) -> None:
+        """丢弃已写入的内容，不改动正式文件"""
+        self._csv_file.close()
+        shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+
+def write_info_image(
+    result_path: str,
+    list_battery_name: List[str],
+    list_current_level: list,
+    list_curves: List[PulseCurves],
+) -> None:
+    """由各电池的 PulseCurves 直接写入 Info_Image.csv 与 Info_Image.npz
+
+    输出与 write_info_csv 逐字节一致（无效电荷写为 0），但 .npz 的各数组
+    由扁平曲线数组直接拼接，不再逐元素转换。
+
+    Args:
+        result_path: 输出目录路径
+        list_battery_name: 电池名称列表
+        list_current_level: 电流等级列表
+        list_curves: [b] = 该电池的 PulseCurves
+    """
+    with InfoImageWriter(result_path, len(list_current_level)) as writer:
+        for battery_name, curves in zip(list_battery_name, list_curves):
+            writer.add(battery_name, curves)
+
 
 def write_info_json(
     result_path: str,
@@ -5,6 +5,9 @@
 """
 
 import math
+import logging
+
+import numpy as np
 import matplotlib.pyplot as plt
 from battery_analysis.utils.exceptions import BatteryAnalysisException
 from battery_analysis.utils.constants import CN_FONT_LIST
@@ -13,6 +16,8 @@ from battery_analysis.utils.constants import CN_FONT_LIST
 plt.rcParams['font.sans-serif'] = CN_FONT_LIST
 plt.rcParams['axes.unicode_minus'] = False  # 解决负号显示问题
 
+logger = logging.getLogger(__name__)
+
 
 def set_plt_axis(battery_type, max_xaxis):
     """根据数据最大值动态设置坐标轴，对所有电池类型统一处理。"""
@@ -48,3 +53,23 @@ def set_plt_axis(battery_type, max_xaxis):
             break
 
     plt.xticks(x_ticks)
+
+
+def curve_segments(list_x, list_y) -> list:
+    """把逐电池的 x / y 序列组装为 LineCollection 的线段列表（每条为 N×2 数组）
+
+    两序列长度不一致时截断到较短者；无法转换为数值的曲线记为空线段，
+    保证返回列表与电池一一对应。
+    """
+    segments = []
+    for b, (x_data, y_data) in enumerate(zip(list_x, list_y)):
+        try:
+            x_data = np.asarray(x_data, dtype=np.float64)
+            y_data = np.asarray(y_data, dtype=np.float64)
+        except (TypeError, ValueError) as e:
+            logger.error("Invalid curve data for battery %s: %s", b, e)
+            segments.append(np.empty((0, 2)))
+            continue
+        count = min(len(x_data), len(y_data))
+        segments.append(np.column_stack((x_data[:count], y_data[:count])))
+    return segments
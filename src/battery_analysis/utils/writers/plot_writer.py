@@ -5,16 +5,32 @@
 """
 
 import logging
-import csv
 
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 from matplotlib.ticker import MultipleLocator
 
 from battery_analysis.utils.processors import data_utils
+from battery_analysis.utils.readers.info_image_reader import load_info_image
 from battery_analysis.utils.writers import plot_utils
 
 logger = logging.getLogger(__name__)
 
+# SVG 中栅格化部分（密集曲线层）的分辨率（PNG 默认 100 dpi）；矢量元素与 dpi 无关
+SVG_RASTER_DPI = 150
+
+# 曲线条数超过该值时，SVG 中的曲线层栅格化为一张图片（坐标轴、文字仍为矢量），
+# 避免数百条曲线写出数十 MB 的路径数据；PNG 不受影响
+RASTERIZE_SVG_LINES_ABOVE = 100
+
+
+def _save_figure(png_path, svg_path, image_formats):
+    """按 image_formats 保存当前图形"""
+    if "png" in image_formats:
+        plt.savefig(png_path)
+    if "svg" in image_formats:
+        plt.savefig(svg_path, dpi=SVG_RASTER_DPI)
+
 
 def draw_boxplot_and_curves(
     int_current_level_num,
@@ -34,11 +50,14 @@ def draw_boxplot_and_curves(
     int_battery_num,
     list_cpt,
     max_xaxis,
+    image_formats=("png", "svg"),
 ):
     """
     绘制箱线图和电压曲线
 
-    从参数读取配置，绘制箱线图和过滤/未过滤电压曲线并保存为PNG和SVG。
+    从参数读取配置，绘制箱线图和过滤/未过滤电压曲线并保存为PNG和/或SVG。
+    三组图相互独立，ReportCoordinator 会分别调用 draw_boxplots 与
+    draw_load_voltage_curves 以便并行渲染；本函数按顺序绘制全部图形。
 
     Args:
         int_current_level_num: 电流等级数量
@@ -58,6 +77,40 @@ def draw_boxplot_and_curves(
         int_battery_num: 电池数量
         list_cpt: 容量数据列表
         max_xaxis: X轴最大值
+        image_formats: 保存的图片格式（"png" / "svg"）
+    """
+    draw_boxplots(int_current_level_num, int_voltage_level_num, list_voltage_level,
+                  list_boxplot_title, list_png_path, list_svg_path, list_cpt, image_formats)
+    for filtered, png_path, svg_path in ((False, str_unfiltered_png_path, str_unfiltered_svg_path),
+                                         (True, str_filtered_png_path, str_filtered_svg_path)):
+        draw_load_voltage_curves(
+            str_info_image_csv_path, int_current_level_num, str_plt_name, png_path, svg_path,
+            list_test_info, list_plt_color_type, int_battery_num, max_xaxis,
+            filtered=filtered, image_formats=image_formats)
+
+
+def draw_boxplots(
+    int_current_level_num,
+    int_voltage_level_num,
+    list_voltage_level,
+    list_boxplot_title,
+    list_png_path,
+    list_svg_path,
+    list_cpt,
+    image_formats=("png", "svg"),
+):
+    """
+    绘制各电流等级的可用容量箱线图
+
+    Args:
+        int_current_level_num: 电流等级数量
+        int_voltage_level_num: 电压等级数量
+        list_voltage_level: 电压等级列表
+        list_boxplot_title: 箱线图标题列表
+        list_png_path: PNG输出路径列表
+        list_svg_path: SVG输出路径列表
+        list_cpt: 容量数据列表
+        image_formats: 保存的图片格式（"png" / "svg"）
     """
     fontdict_label = {
         'fontsize': 9,
@@ -74,37 +127,55 @@ def draw_boxplot_and_curves(
             list_box_plot.append(list_cpt[c][v])
             list_label.append(f"{list_voltage_level[v]}V")
         plt.cla()
-        plt.boxplot(list_box_plot, labels=list_label,
-                    medianprops=medianprofile)
+        # 刻度标签单独设置：boxplot 的 labels 参数在 matplotlib 3.9 起更名为 tick_labels
+        plt.boxplot(list_box_plot, medianprops=medianprofile)
+        plt.xticks(range(1, len(list_label) + 1), list_label)
         plt.title(list_boxplot_title[c], fontdict=fontdict_label)
         plt.xlabel("Cutoff Voltage [V]")
         plt.ylabel("Useable Capacity [mAh]")
         plt.grid(linestyle="--", alpha=0.3)
-        plt.savefig(list_png_path[c])
-        plt.savefig(list_svg_path[c], dpi=1200)
+        _save_figure(list_png_path[c], list_svg_path[c], image_formats)
+    plt.close()
 
-    # analysis Info_Image.csv
+
+def draw_load_voltage_curves(
+    str_info_image_csv_path,
+    int_current_level_num,
+    str_plt_name,
+    str_png_path,
+    str_svg_path,
+    list_test_info,
+    list_plt_color_type,
+    int_battery_num,
+    max_xaxis,
+    filtered,
+    image_formats=("png", "svg"),
+):
+    """
+    绘制全部电池的负载电压-电荷曲线（原始或过滤后）
+
+    Args:
+        str_info_image_csv_path: 图像信息CSV路径
+        int_current_level_num: 电流等级数量
+        str_plt_name: 图表名称
+        str_png_path: PNG输出路径
+        str_svg_path: SVG输出路径
+        list_test_info: 测试信息列表
+        list_plt_color_type: 绘图颜色类型列表
+        int_battery_num: 电池数量
+        max_xaxis: X轴最大值
+        filtered: True 绘制 data_utils.filter_data 过滤后的曲线
+        image_formats: 保存的图片格式（"png" / "svg"）；曲线条数超过
+            RASTERIZE_SVG_LINES_ABOVE 时 SVG 中的曲线栅格化
+    """
+    # analysis Info_Image.csv（与图表查看器共用解析结果）
+    info_image = load_info_image(str_info_image_csv_path, int_current_level_num)
     list_plt = []
     for c in range(int_current_level_num):
-        list_plt.append([])
-        for _ in range(4):
-            list_plt[c].append([])
-
-    with open(str_info_image_csv_path, mode='r', encoding='utf-8') as f:
-        csvreader_info_image = csv.reader(f)
-        int_per_battery_rows = 1 + int_current_level_num * 3
-        index = 0
-        for row in csvreader_info_image:
-            loop = index % int_per_battery_rows
-            if loop != 0 and (loop % 3) != 1:
-                list_plt[int((loop - 1) / 3)][((loop - 1) % 3) -
-                                               1].append([float(row[i]) for i in range(len(row))])
-            index += 1
-
-    # list_plt[c] 布局：[0]=原始 charge, [1]=原始 voltage, [2]=过滤 charge, [3]=过滤 voltage
-    for c in range(int_current_level_num):
-        list_plt[c][2], list_plt[c][3] = data_utils.filter_data(
-            list_plt[c][0], list_plt[c][1])
+        charge, voltage = list(info_image.charge[c]), list(info_image.voltage[c])
+        if filtered:
+            charge, voltage = data_utils.filter_data(charge, voltage)
+        list_plt.append((charge, voltage))
 
     title_fontdict = {
         'fontsize': 15,
@@ -113,6 +184,8 @@ def draw_boxplot_and_curves(
     axis_fontdict = {
         'fontsize': 15
     }
+    kind = "Filtered" if filtered else "Unfiltered"
+    rasterized = int_battery_num * int_current_level_num > RASTERIZE_SVG_LINES_ABOVE
 
     plt.figure(figsize=(15, 6))
 
@@ -121,29 +194,14 @@ def draw_boxplot_and_curves(
     y_major_locator = MultipleLocator(0.2)
     ax = plt.gca()
     ax.yaxis.set_major_locator(y_major_locator)
-    plt.title(f"Unfiltered {str_plt_name}", fontdict=title_fontdict)
+    plt.title(f"{kind} {str_plt_name}", fontdict=title_fontdict)
     plt.xlabel("Charge [mAh]", fontdict=axis_fontdict)
-    plt.ylabel("Unfiltered Battery Load Voltage [V]", fontdict=axis_fontdict)
-    for b in range(int_battery_num):
-        for c in range(int_current_level_num):
-            plt.plot(list_plt[c][0][b], list_plt[c][1][b],
-                     color=f"{list_plt_color_type[c]}", linewidth=0.5)
-    plt.grid(linestyle="--", alpha=0.3)
-    plt.savefig(str_unfiltered_png_path)
-    plt.savefig(str_unfiltered_svg_path, dpi=1200)
-
-    plt.clf()
-    plot_utils.set_plt_axis(list_test_info[0], max_xaxis)
-    y_major_locator = MultipleLocator(0.2)
-    ax = plt.gca()
-    ax.yaxis.set_major_locator(y_major_locator)
-    plt.title(f"Filtered {str_plt_name}", fontdict=title_fontdict)
-    plt.xlabel("Charge [mAh]", fontdict=axis_fontdict)
-    plt.ylabel("Filtered Battery Load Voltage [V]", fontdict=axis_fontdict)
-    for b in range(int_battery_num):
-        for c in range(int_current_level_num):
-            plt.plot(list_plt[c][2][b], list_plt[c][3][b],
-                     color=f"{list_plt_color_type[c]}", linewidth=0.5)
+    plt.ylabel(f"{kind} Battery Load Voltage [V]", fontdict=axis_fontdict)
+    # 每个电流等级一个 LineCollection，艺术家数量与电池数无关
+    for c in range(int_current_level_num):
+        segments = plot_utils.curve_segments(list_plt[c][0][:int_battery_num], list_plt[c][1][:int_battery_num])
+        ax.add_collection(LineCollection(segments, colors=f"{list_plt_color_type[c]}", linewidths=0.5,
+                                         rasterized=rasterized), autolim=False)
     plt.grid(linestyle="--", alpha=0.3)
-    plt.savefig(str_filtered_png_path)
-    plt.savefig(str_filtered_svg_path, dpi=1200)
+    _save_figure(str_png_path, str_svg_path, image_formats)
+    plt.close()
@@ -182,6 +182,88 @@ class TestRealCatalogRoundTrip:
         assert t.gettext(key) == expected
 
 
+# ---------------------------------------------------------------------------
+# TestCatalogCache — 编译后翻译目录缓存
+# ---------------------------------------------------------------------------
+
+class TestCatalogCache:
+    """translator.load_catalog caches parsed catalogs keyed by the .po file"""
+
+    @staticmethod
+    def _write_po(tmp_path, text=SAMPLE_PO) -> Path:
+        po = tmp_path / "locale" / "zh_CN" / "LC_MESSAGES" / "messages.po"
+        po.parent.mkdir(parents=True, exist_ok=True)
+        po.write_text(text, encoding="utf-8")
+        return tmp_path / "locale"
+
+    def test_second_load_uses_cache(self, tmp_path):
+        from battery_analysis.i18n.translator import SimplePOTranslator
+        localedir = self._write_po(tmp_path)
+        assert SimplePOTranslator().load_locale("zh_CN", localedir, tmp_path / "cache")
+        assert (tmp_path / "cache" / "zh_CN.marshal").exists()
+
+        t = SimplePOTranslator()
+        with patch.object(SimplePOTranslator, "_parse") as mock_parse:
+            assert t.load_locale("zh_CN", localedir, tmp_path / "cache") is True
+        mock_parse.assert_not_called()
+        assert t.gettext("hello") == "你好"
+
+    def test_stale_cache_is_reparsed(self, tmp_path):
+        import os
+        from battery_analysis.i18n.translator import SimplePOTranslator
+        localedir = self._write_po(tmp_path)
+        SimplePOTranslator().load_locale("zh_CN", localedir, tmp_path / "cache")
+
+        po = self._write_po(tmp_path, SAMPLE_PO.replace("你好", "您好"))
+        po_file = po / "zh_CN" / "LC_MESSAGES" / "messages.po"
+        stat = po_file.stat()
+        os.utime(po_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        t = SimplePOTranslator()
+        assert t.load_locale("zh_CN", localedir, tmp_path / "cache") is True
+        assert t.gettext("hello") == "您好"
+
+    def test_cached_catalog_keeps_plural_rules(self, tmp_path):
+        from battery_analysis.i18n.translator import SimplePOTranslator
+        localedir = self._write_po(tmp_path, r'''msgid ""
+msgstr ""
+"Plural-Forms: nplurals=2; plural=(n != 1);\n"
+
+msgid "file"
+msgid_plural "files"
+msgstr[0] "one file"
+msgstr[1] "many files"
+''')
+        SimplePOTranslator().load_locale("zh_CN", localedir, tmp_path / "cache")
+        t = SimplePOTranslator()
+        with patch.object(SimplePOTranslator, "_parse") as mock_parse:
+            t.load_locale("zh_CN", localedir, tmp_path / "cache")
+        mock_parse.assert_not_called()
+        assert t.ngettext("file", "files", 1) == "one file"
+        assert t.ngettext("file", "files", 3) == "many files"
+
+    def test_failed_cache_write_leaves_no_temp_file(self, tmp_path):
+        from battery_analysis.i18n.translator import SimplePOTranslator
+        localedir = self._write_po(tmp_path)
+        with patch("battery_analysis.i18n.translator.marshal.dump", side_effect=ValueError("unmarshallable")):
+            assert SimplePOTranslator().load_locale("zh_CN", localedir, tmp_path / "cache") is True
+        assert list((tmp_path / "cache").iterdir()) == []
+
+    def test_preloaded_catalog_used_by_set_locale(self, tmp_path):
+        import battery_analysis.i18n as i18n_module
+        localedir = self._write_po(tmp_path)
+        saved = i18n_module._current_locale
+        with patch.object(i18n_module, "LOCALEDIR", localedir):
+            i18n_module.preload_locale("zh_CN")
+            pending = i18n_module._preloaded["zh_CN"]
+            pending.result(timeout=10)
+            with patch.object(i18n_module._po_translator, "load_locale") as mock_load:
+                assert i18n_module.set_locale("zh_CN") is True
+            mock_load.assert_not_called()
+            assert "zh_CN" not in i18n_module._preloaded
+            assert i18n_module._("hello") == "你好"
+        i18n_module.set_locale(saved)
+
+
 # ---------------------------------------------------------------------------
 # TestLocaleUtils
 # ---------------------------------------------------------------------------
@@ -0,0 +1,70 @@
+"""StatKeyedCache 测试：按文件状态失效与持久层"""
+import os
+
+from battery_analysis.main.business_logic.cache import StatKeyedCache, file_stat_key
+
+
+def _touch(path, content, mtime_ns):
+    path.write_bytes(content)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestStatKeyedCache:
+    def test_overwritten_file_misses(self, tmp_path):
+        target = tmp_path / "a.xlsx"
+        _touch(target, b"one", 1_000_000_000)
+        cache = StatKeyedCache(10)
+        cache.put(target, "first")
+        assert cache.get(target) == "first"
+
+        # 大小相同但 mtime 不同：视为已覆盖
+        _touch(target, b"two", 2_000_000_000)
+        assert cache.get(target) is None
+
+    def test_missing_file_is_never_cached(self, tmp_path):
+        cache = StatKeyedCache(10)
+        cache.put(tmp_path / "missing.xlsx", "x")
+        assert cache.get(tmp_path / "missing.xlsx") is None
+        assert file_stat_key(tmp_path / "missing.xlsx") is None
+
+    def test_new_file_in_directory_misses_listing(self, tmp_path):
+        cache = StatKeyedCache(10)
+        cache.put(tmp_path, ["a.xlsx"])
+        stat = os.stat(tmp_path)
+        (tmp_path / "b.xlsx").write_bytes(b"b")
+        os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert cache.get(tmp_path) is None
+
+    def test_tags_and_remove(self, tmp_path):
+        cache = StatKeyedCache(10)
+        cache.put(tmp_path, ["a"], tag="*.xlsx")
+        cache.put(tmp_path, ["b"], tag=None)
+        assert cache.get(tmp_path, tag="*.xlsx") == ["a"]
+        assert cache.get(tmp_path) == ["b"]
+        cache.remove(tmp_path)
+        assert cache.get(tmp_path, tag="*.xlsx") is None and len(cache) == 0
+
+    def test_persisted_entries_survive_new_instance(self, tmp_path):
+        target = tmp_path / "a.xlsx"
+        target.write_bytes(b"data")
+        store = tmp_path / "cache" / "validation.json"
+
+        cache = StatKeyedCache(10, store)
+        cache.put(target, (True, "", {"row_count": 3}))
+        cache.flush()
+
+        reloaded = StatKeyedCache(10, store)
+        assert reloaded.get(target) == [True, "", {"row_count": 3}]
+
+        target.write_bytes(b"changed")
+        assert StatKeyedCache(10, store).get(target) is None
+
+    def test_persisted_store_is_bounded(self, tmp_path):
+        store = tmp_path / "store.json"
+        cache = StatKeyedCache(10, store, max_persisted=2)
+        for name in "abc":
+            (tmp_path / name).write_bytes(b"x")
+            cache.put(tmp_path / name, name)
+        cache.flush()
+        reloaded = StatKeyedCache(10, store)
+        assert [reloaded.get(tmp_path / name) for name in "abc"] == [None, "b", "c"]
@@ -6,9 +6,19 @@ import os
 import tempfile
 import pandas as pd
 from unittest.mock import Mock, patch, MagicMock
+from concurrent.futures import Future
 from battery_analysis.main.business_logic.data_processor import DataProcessor
 
 
+class _InlinePool:
+    """在当前进程内同步执行任务的进程池替身"""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
 class TestDataProcessor:
     """测试数据处理器类"""
     
@@ -91,11 +101,11 @@ class TestDataProcessor:
             # 验证结果
             assert result == []
     
-    @patch('battery_analysis.main.business_logic.data_processor.DataProcessor.process_excel_with_pandas')
-    def test_process_all_excel_files_success(self, mock_process_excel):
+    @patch('battery_analysis.main.business_logic.data_processor.read_excel_file')
+    def test_process_all_excel_files_success(self, mock_read_excel):
         """测试成功处理目录中所有Excel文件的情况"""
         # 设置模拟返回值
-        mock_process_excel.return_value = {
+        mock_read_excel.return_value = {
             'filename': 'test.xlsx',
             'row_count': 3
         }
@@ -108,12 +118,15 @@ class TestDataProcessor:
             with open(os.path.join(temp_dir, 'test2.xlsx'), 'w') as f:
                 f.write('')
             
-            # 调用处理方法
-            result = self.processor.process_all_excel_files(temp_dir)
+            # 调用处理方法（进程池替换为当前进程内执行，使 mock 生效）
+            with patch('battery_analysis.main.business_logic.data_processor.get_worker_pool',
+                       return_value=_InlinePool()):
+                result = self.processor.process_all_excel_files(temp_dir)
             
-            # 验证结果
+            # 验证结果：结果写回主进程缓存
             assert len(result) == 2
-            mock_process_excel.assert_called()
+            assert mock_read_excel.call_count == 2
+            assert self.processor.get_cache_stats()['excel_files'] == 2
     
     def test__set_specification_type(self):
         """测试设置规格类型的方法"""
@@ -182,6 +195,60 @@ class TestDataProcessor:
             # 验证结果
             self.mock_main_window.statusBar_BatteryAnalysis.showMessage.assert_called()
 
+    def test_scan_task_probes_files_and_reuses_cache(self, tmp_path):
+        """后台扫描任务列出 xlsx 并探测每个文件，已缓存的结果不再重复读取"""
+        from tests.fixtures.sample_data import create_sample_xlsx
+        sample_xlsx = create_sample_xlsx(tmp_path, "DC1,mA2.xlsx")
+        input_dir = str(tmp_path)
+        excel_files, probes = self.processor._scan_excel_files_task(input_dir)
+        assert excel_files == [sample_xlsx.name]
+        is_valid, _, info = probes[sample_xlsx.name]
+        assert is_valid and info['row_count'] == 3
+
+        self.processor._process_excel_files(input_dir, excel_files, probes)
+        with patch('battery_analysis.main.business_logic.excel_validator.probe_excel_file') as mock_probe:
+            _, cached = self.processor._scan_excel_files_task(input_dir, excel_files=excel_files)
+        mock_probe.assert_not_called()
+        assert cached == probes
+
+    def test_probe_results_persist_across_instances(self, tmp_path):
+        """探测结果写入磁盘缓存，新实例打开同一目录时不再读取工作簿"""
+        from tests.fixtures.sample_data import create_sample_xlsx
+        create_sample_xlsx(tmp_path, "DC1,mA2.xlsx")
+        input_dir = str(tmp_path)
+        excel_files, probes = self.processor._scan_excel_files_task(input_dir)
+        self.processor._process_excel_files(input_dir, excel_files, probes)
+
+        fresh = DataProcessor(self.mock_main_window)
+        with patch('battery_analysis.main.business_logic.excel_validator.probe_excel_file') as mock_probe:
+            _, cached = fresh._scan_excel_files_task(input_dir, excel_files=excel_files)
+        mock_probe.assert_not_called()
+        assert cached["DC1,mA2.xlsx"][2]["row_count"] == 3
+
+    def test_read_errors_are_not_cached(self, tmp_path):
+        """文件被锁定等读取失败可能是暂时的：不写入缓存，下次重新探测"""
+        from tests.fixtures.sample_data import create_sample_xlsx
+        create_sample_xlsx(tmp_path, "DC1,mA2.xlsx")
+        (tmp_path / "DC2,mA2.xlsx").write_bytes(b"not a real xlsx file")
+        input_dir = str(tmp_path)
+        with patch('battery_analysis.main.business_logic.excel_validator.probe_xlsx',
+                   side_effect=PermissionError("locked by another process")):
+            excel_files, probes = self.processor._scan_excel_files_task(input_dir)
+        assert all("Failed to read Excel file" in probes[f][1] for f in excel_files)
+        self.processor._process_excel_files(input_dir, excel_files, probes)
+
+        fresh = DataProcessor(self.mock_main_window)
+        _, probes = fresh._scan_excel_files_task(input_dir, excel_files=excel_files)
+        assert probes["DC1,mA2.xlsx"][0]
+        fresh._process_excel_files(input_dir, excel_files, probes)
+
+        # 格式错误与文件状态绑定，照常缓存
+        with patch('battery_analysis.main.business_logic.excel_validator.probe_excel_file') as mock_probe:
+            _, cached = DataProcessor(self.mock_main_window)._scan_excel_files_task(
+                input_dir, excel_files=excel_files)
+        mock_probe.assert_not_called()
+        assert not cached["DC2,mA2.xlsx"][0]
+
     def test_analyze_data_shows_error_dialog_on_failure(self):
         """analyze_data 失败时调用 PyQt6 存在的 QMessageBox.critical（而非不存在的 error）"""
         from battery_analysis.main.business_logic import data_processor as dp
@@ -189,8 +256,7 @@ class TestDataProcessor:
         self.mock_main_window.lineEdit_InputPath.text = Mock(return_value="C:/fake/input")
 
         with patch.object(dp.os, 'listdir', return_value=["a.xlsx", "b.xlsx"]), \
-             patch('battery_analysis.utils.resource_manager.ResourceManager.get_optimal_process_count', return_value=2), \
-             patch.object(dp, 'ProcessPoolExecutor', side_effect=RuntimeError("executor boom")), \
+             patch.object(dp, 'get_worker_pool', side_effect=RuntimeError("executor boom")), \
              patch.object(dp.QW.QMessageBox, 'critical') as mock_critical, \
              patch.object(dp.QW.QMessageBox, 'information') as mock_info:
             self.processor.analyze_data()
@@ -1,35 +1,27 @@
-"""excel_validator 引擎回归锁测试"""
-
-from unittest.mock import patch
+"""excel_validator 测试"""
 
 import pandas as pd
 
-from battery_analysis.main.business_logic.excel_validator import validate_excel_file
-from battery_analysis.utils.processors.excel_processor import optimize_dataframe_memory
-
-
-class _FakeCache:
-    """满足 validate_excel_file 缓存接口的最小内存实现"""
-
-    def __init__(self):
-        self._store = {}
-
-    def get(self, key):
-        return self._store.get(key)
-
-    def put(self, key, value):
-        self._store[key] = value
-
-
-class TestValidateExcelFileEngine:
-    def test_validate_excel_file_uses_calamine_engine(self, sample_xlsx):
-        """validate_excel_file 内部必须经 pandas.read_excel 以 engine='calamine' 读取"""
-        with patch("pandas.read_excel") as mock_read:
-            mock_read.return_value = pd.DataFrame({"Capacity": [1.0, 2.0]})
-            is_valid, error_msg, df = validate_excel_file(
-                str(sample_xlsx), "DC1,mA2.xlsx", _FakeCache(), optimize_dataframe_memory
-            )
-        assert mock_read.call_args.kwargs["engine"] == "calamine"
-        assert is_valid is True
-        assert error_msg == ""
-        assert df is not None
+from battery_analysis.main.business_logic.excel_validator import probe_excel_file
+from tests.fixtures.sample_data import create_sample_xlsx
+
+VALID_NAME = "DC1,mA2.xlsx"
+
+
+class TestProbeExcelFile:
+    def test_probe_matches_full_read(self, tmp_path):
+        sample_xlsx = create_sample_xlsx(tmp_path, VALID_NAME)
+        df = pd.read_excel(str(sample_xlsx), sheet_name=0, engine="calamine", header=0)
+        is_valid, error_msg, info = probe_excel_file(str(sample_xlsx), VALID_NAME)
+        assert (is_valid, error_msg) == (True, "")
+        assert info["sheet_name"] == df.columns.tolist()
+        assert (info["row_count"], info["column_count"]) == df.shape
+        assert info["sheet_names"] == ["Cycle", "Step", "Record"]
+        assert len(info["first_five_rows"]) == min(5, len(df))
+
+    def test_unreadable_file_reported(self, tmp_path):
+        broken = tmp_path / VALID_NAME
+        broken.write_bytes(b"not a real xlsx file")
+        is_valid, error_msg, info = probe_excel_file(str(broken), VALID_NAME)
+        assert not is_valid and info is None
+        assert "Failed to read Excel file" in error_msg
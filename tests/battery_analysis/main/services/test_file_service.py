@@ -22,4 +22,20 @@ class TestFileService:
             path = f.name
         size = self.service.get_file_size(path)
         assert size == 9
-        os.unlink(path)
\ No newline at end of file
+        os.unlink(path)
+
+    def test_cached_size_follows_file_changes(self, tmp_path):
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"1234")
+        assert self.service.get_file_size(path) == 4
+        path.write_bytes(b"123456789")
+        assert self.service.get_file_size(path) == 9
+
+    def test_list_files_sees_new_files(self, tmp_path):
+        import os
+        (tmp_path / "a.xlsx").write_bytes(b"a")
+        assert self.service.list_files(tmp_path, "*.xlsx") == ["a.xlsx"]
+        stat = os.stat(tmp_path)
+        (tmp_path / "b.xlsx").write_bytes(b"b")
+        os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert sorted(self.service.list_files(tmp_path, "*.xlsx")) == ["a.xlsx", "b.xlsx"]
@@ -0,0 +1,60 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from battery_analysis.main.visualization.curve_collection import BatteryCurveCollection
+from battery_analysis.main.visualization.hover_index import HoverPointIndex
+
+
+@pytest.fixture
+def curves():
+    fig, ax = plt.subplots(figsize=(6, 4), dpi=100)
+    ax.set_xlim(0, 100)
+    ax.set_ylim(0, 5)
+    x = [[np.arange(10.0) * (b + 1) for b in range(3)] for _ in range(2)]
+    y = [[np.full(10, 1.0 + c + b / 10) for b in range(3)] for c in range(2)]
+    # 第 3 个电池缺少第 2 个电流等级的数据
+    x[1], y[1] = x[1][:2], y[1][:2]
+    collection = BatteryCurveCollection(ax, x, y, ["red", "blue"], ["B1", "B2", "B3"], "Filtered")
+    yield ax, collection
+    plt.close(fig)
+
+
+class TestBatteryCurveCollection:
+    def test_one_collection_per_level_and_battery_major_handles(self, curves):
+        ax, collection = curves
+        assert len(ax.collections) == 2 and not ax.lines
+        assert len(collection.handles) == 6
+        handle = collection.handles[2 * 2 + 0]
+        assert (handle.battery, handle.level) == (2, 0)
+        assert handle.get_label() == ["B3", "Filtered"]
+        assert list(handle.get_xdata()[:3]) == [0.0, 3.0, 6.0]
+        assert len(collection.handles[5].get_xdata()) == 0
+
+    def test_visibility_updates_segment_alpha(self, curves):
+        _, collection = curves
+        collection.handles[1].set_visible(False)
+        assert not collection.handles[1].get_visible()
+        assert list(collection.collections[1].get_colors()[:, 3]) == [0.0, 1.0, 1.0]
+        assert collection.collections[1].get_visible()
+
+        for b in (1, 2):
+            collection.handles[b * 2 + 1].set_visible(False)
+        assert not collection.collections[1].get_visible()
+        assert collection.collections[0].get_visible()
+
+    def test_hover_index_accepts_handles(self, curves):
+        ax, collection = curves
+        ax.figure.canvas.draw()
+        target = collection.handles[1 * 2 + 1]  # B2、电流等级 1
+        x, y = ax.transData.transform((target.get_xdata()[4], target.get_ydata()[4]))
+        hit = HoverPointIndex(collection.handles, ax.transData, radius=3).query(x, y)
+        assert hit[0] is target and hit[1] == 4
+
+        target.set_visible(False)
+        hit = HoverPointIndex(collection.handles, ax.transData, radius=3).query(x, y)
+        assert hit is None or hit[0] is not target
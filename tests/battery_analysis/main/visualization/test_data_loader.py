@@ -1,4 +1,6 @@
-"""data_loader.csv_read 行为测试"""
+"""data_loader.csv_read / filter_data 行为测试"""
+import numpy as np
+
 from battery_analysis.main.visualization.data_loader import DataLoaderMixin
 
 
@@ -18,8 +20,8 @@ class _StubDataLoader(DataLoaderMixin):
     def _initialize_data_structures(self):
         self.listPlt = [[0, 1, True, 2, 3, 4]]
 
-    def _process_csv_data(self, csvreader):
-        self.processed_rows = sum(1 for _ in csvreader)
+    def _process_csv_data(self, info_image):
+        self.processed_rows = info_image.row_count
 
     def _parse_battery_names(self):
         pass
@@ -44,3 +46,46 @@ class TestCsvRead:
         loader = _StubDataLoader(csv_path)
         loader.csv_read()
         assert loader.intBatteryNum == 0
+
+
+def _reference_filter(list_plt_charge, list_plt_voltage, times=5, slope_max=0.2, difference_max=0.05):
+    """逐点实现的过滤算法（向量化前的 filter_data），作为等价性基准"""
+    filtered_charge, filtered_voltage = [], []
+    for charge_single, voltage_single in zip(list_plt_charge, list_plt_voltage):
+        for _ in range(times):
+            charge_temp, voltage_temp = [charge_single[0]], [voltage_single[0]]
+            for c in range(1, len(charge_single)):
+                try:
+                    charge_diff = float(charge_single[c]) - float(charge_single[c - 1])
+                    voltage_diff = float(voltage_single[c]) - float(voltage_single[c - 1])
+                except (ValueError, TypeError):
+                    continue
+                slope = slope_max if charge_diff == 0 else abs(voltage_diff / charge_diff)
+                if slope < slope_max and abs(voltage_diff) < difference_max:
+                    charge_temp.append(float(charge_single[c]))
+                    voltage_temp.append(float(voltage_single[c]))
+            charge_single, voltage_single = charge_temp, voltage_temp
+        filtered_charge.append(charge_single)
+        filtered_voltage.append(voltage_single)
+    return filtered_charge, filtered_voltage
+
+
+def _curves(count, points, seed=0):
+    rng = np.random.default_rng(seed)
+    charges, voltages = [], []
+    for _ in range(count):
+        charge = np.cumsum(rng.choice([0.0, 0.1, 0.2, 0.5], points))
+        voltage = 3.0 - 0.01 * np.arange(points) + rng.normal(0, 0.02, points)
+        voltage[rng.integers(0, points, points // 50)] += 1.0  # 尖峰
+        charges.append(charge)
+        voltages.append(voltage)
+    return charges, voltages
+
+
+class TestFilterData:
+    def test_matches_pointwise_filter(self):
+        charges, voltages = _curves(5, 2000)
+        charges.append(["0", "1", "x", "2", "2.1", None, "2.2"])
+        voltages.append(["3.0", "3.01", "3.0", "2.99", "2.98", "2.97", "2.96"])
+        loader = DataLoaderMixin()
+        assert loader.filter_data(charges, voltages) == _reference_filter(charges, voltages)
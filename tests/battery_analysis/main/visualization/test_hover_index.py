@@ -0,0 +1,67 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from battery_analysis.main.visualization.hover_index import HoverPointIndex
+
+
+@pytest.fixture
+def axes():
+    fig, ax = plt.subplots(figsize=(6, 4), dpi=100)
+    rng = np.random.default_rng(0)
+    lines = [ax.plot(np.sort(rng.random(200)) * 1000, rng.random(200) * 3 + 1)[0] for _ in range(5)]
+    ax.set_xlim(0, 1000)
+    ax.set_ylim(0, 5)
+    fig.canvas.draw()
+    yield ax, lines
+    plt.close(fig)
+
+
+def _brute_force(lines, transform, x, y, radius):
+    best = None
+    for line in lines:
+        if not line.get_visible():
+            continue
+        xy = transform.transform(np.column_stack((line.get_xdata(), line.get_ydata())))
+        dist = np.hypot(xy[:, 0] - x, xy[:, 1] - y)
+        i = int(np.argmin(dist))
+        if dist[i] <= radius and (best is None or dist[i] < best[0]):
+            best = (dist[i], line, i)
+    return best
+
+
+class TestHoverPointIndex:
+    def test_matches_brute_force_nearest_point(self, axes):
+        ax, lines = axes
+        index = HoverPointIndex(lines, ax.transData, radius=15)
+        rng = np.random.default_rng(1)
+        for x, y in rng.random((300, 2)) * (ax.bbox.width, ax.bbox.height) + (ax.bbox.x0, ax.bbox.y0):
+            expected = _brute_force(lines, ax.transData, x, y, 15)
+            hit = index.query(x, y)
+            if expected is None:
+                assert hit is None
+            else:
+                assert hit[:2] == (expected[1], expected[2])
+
+    def test_hidden_lines_are_ignored(self, axes):
+        ax, lines = axes
+        target = lines[2]
+        x, y = ax.transData.transform((target.get_xdata()[50], target.get_ydata()[50]))
+        for line in lines:
+            line.set_visible(line is target)
+        hit = HoverPointIndex(lines, ax.transData, radius=15).query(x, y)
+        assert hit[0] is target and hit[1] == 50
+        assert hit[2:] == (target.get_xdata()[50], target.get_ydata()[50])
+
+        target.set_visible(False)
+        assert HoverPointIndex(lines, ax.transData, radius=15).query(x, y) is None
+
+    def test_far_from_points_returns_none(self, axes):
+        ax, lines = axes
+        index = HoverPointIndex(lines, ax.transData, radius=5)
+        assert index.query(-1e6, -1e6) is None
+        assert index.query(1e6, 1e6) is None
@@ -0,0 +1,67 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from battery_analysis.main.visualization.curve_collection import BatteryCurveCollection
+from battery_analysis.main.visualization.lod import LOD_BASE_BINS, CurveLODPyramid, m4_decimate
+
+
+def _noisy_curves(count=4, points=40000):
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 600, points)
+    return [np.column_stack((x, 3 - x / 600 + rng.normal(0, 0.05, points))) for _ in range(count)]
+
+
+class TestM4Decimate:
+    def test_keeps_first_last_and_extremes_per_bin(self):
+        segments = _noisy_curves(count=2, points=5000)
+        decimated = m4_decimate(segments, 0, 600, 50)
+        for full, small in zip(segments, decimated):
+            assert len(small) <= 4 * 50
+            assert np.array_equal(small[0], full[0]) and np.array_equal(small[-1], full[-1])
+            assert small[:, 1].min() == full[:, 1].min() and small[:, 1].max() == full[:, 1].max()
+            assert np.all(np.diff(small[:, 0]) >= 0)
+
+    def test_unordered_x_matches_sorted_result(self):
+        segments = _noisy_curves(count=2, points=3000)
+        shuffled = [segment[::-1] for segment in segments]
+        for ordered, reverse in zip(m4_decimate(segments, 0, 600, 40), m4_decimate(shuffled, 0, 600, 40)):
+            assert {tuple(p) for p in ordered} == {tuple(p) for p in reverse}
+
+    def test_empty_segments_keep_their_slot(self):
+        segments = [np.empty((0, 2)), _noisy_curves(count=1, points=100)[0]]
+        decimated = m4_decimate(segments, 0, 600, 10)
+        assert len(decimated) == 2 and len(decimated[0]) == 0
+
+
+class TestCurveLODPyramid:
+    def test_level_follows_zoom(self):
+        pyramid = CurveLODPyramid(_noisy_curves())
+        assert pyramid.levels and pyramid.levels[0][0] == LOD_BASE_BINS
+        assert pyramid.select(0, 600, 500) == 0
+        assert pyramid.select(0, 6, 500) is None
+        assert pyramid.segments_for(None) is pyramid.segments
+
+    def test_small_curves_have_no_levels(self):
+        pyramid = CurveLODPyramid(_noisy_curves(points=200))
+        assert pyramid.levels == []
+        assert pyramid.select(0, 600, 500) is None
+
+
+def test_collection_swaps_segments_on_zoom():
+    fig, ax = plt.subplots(figsize=(6, 4), dpi=100)
+    segments = _noisy_curves()
+    collection = BatteryCurveCollection(ax, [[s[:, 0] for s in segments]], [[s[:, 1] for s in segments]],
+                                        ["red"], ["B1", "B2", "B3", "B4"], "Filtered")
+    drawn = collection.collections[0]
+
+    collection.update_detail(0, 600, ax.bbox.width)
+    assert sum(len(path.vertices) for path in drawn.get_paths()) < 4 * 40000 / 2
+    assert len(collection.handles[0].get_xdata()) == 40000
+
+    collection.update_detail(100, 101, ax.bbox.width)
+    assert sum(len(path.vertices) for path in drawn.get_paths()) == 4 * 40000
+    plt.close(fig)
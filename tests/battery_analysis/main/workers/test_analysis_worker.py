@@ -1,4 +1,9 @@
+from unittest.mock import patch
+
+from battery_analysis.domain.entities.test_info import TestInfo
 from battery_analysis.main.workers.analysis_worker import AnalysisWorker
+from battery_analysis.utils.task_executor import TaskExecutor
+from tests.fixtures.sample_data import create_sample_xlsx
 
 
 class TestAnalysisWorker:
@@ -12,3 +17,31 @@ class TestAnalysisWorker:
     def test_request_cancel(self):
         self.worker.request_cancel()
         assert self.worker.b_cancel_requested is True
+
+    def test_cancel_during_reports_does_not_start_visualizer(self, tmp_path):
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        create_sample_xlsx(input_dir, "cell_1.xlsx")
+        test_info = TestInfo(specification_type="CR2450", specification_method="1S1P",
+                             manufacturer="EVE", temperature_value="25:C",
+                             datasheet_nominal_capacity="600", calculation_nominal_capacity="600",
+                             required_usable_capacity="500", current_levels=[4000],
+                             voltage_levels=[3.0, 2.5], version="1")
+        self.worker.set_info("path", str(input_dir), str(tmp_path / "output"), test_info)
+        started, infos = [], []
+
+        def on_progress(value, status):
+            if status.startswith("Generating reports... ("):
+                self.worker.b_cancel_requested = True
+
+        self.worker.signals.progress_update.connect(on_progress)
+        self.worker.signals.start_visualizer.connect(lambda: started.append(True))
+        self.worker.signals.info.connect(lambda running, index, text: infos.append(text))
+        with patch.object(AnalysisWorker, "_build_task_executor", return_value=TaskExecutor("inline")), \
+                patch.object(AnalysisWorker, "_is_incremental_enabled", return_value=False), \
+                patch.object(AnalysisWorker, "_load_equipment_info", return_value={}):
+            self.worker.run()
+
+        assert started == []
+        assert infos[-1] == "status:cancelled"
+        assert self.worker.str_error_xlsx == ""
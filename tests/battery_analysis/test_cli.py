@@ -0,0 +1,103 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from battery_analysis.cli import _load_test_info, main
+from tests.fixtures.sample_data import create_sample_xlsx
+
+TEST_INFO = {
+    "specification_type": "CR2450", "specification_method": "1S1P", "manufacturer": "EVE",
+    "temperature_value": "25:C", "datasheet_nominal_capacity": "600",
+    "calculation_nominal_capacity": "600", "required_usable_capacity": "500",
+    "current_levels": [4000], "voltage_levels": [3.0, 2.5], "version": "1",
+    "equipment": {"testEquipment": "BTS-4000"},
+}
+
+
+@pytest.fixture
+def test_info_json(tmp_path):
+    path = tmp_path / "info.json"
+    path.write_text(json.dumps(TEST_INFO), encoding="utf-8")
+    return str(path)
+
+
+class TestLoadTestInfo:
+    def test_overrides_apply_on_top_of_json(self, test_info_json):
+        test_info, equipment = _load_test_info(test_info_json, ["version=2", "voltage_levels=3.1,2.4"])
+        assert test_info.version == "2"
+        assert test_info.voltage_levels == [3.1, 2.4]
+        assert test_info.current_levels == [4000]
+        assert equipment == {"testEquipment": "BTS-4000"}
+
+    def test_unknown_field_is_rejected(self, test_info_json):
+        with pytest.raises(ValueError, match="colour"):
+            _load_test_info(test_info_json, ["colour=red"])
+
+    def test_missing_levels_are_rejected(self):
+        with pytest.raises(ValueError, match="current_levels"):
+            _load_test_info(None, ["version=1"])
+
+
+class TestMain:
+    def test_runs_pipeline_with_selected_formats(self, tmp_path, test_info_json, capsys):
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        create_sample_xlsx(input_dir, "cell_1.xlsx")
+        output_dir = tmp_path / "output"
+
+        code = main([str(input_dir), "-o", str(output_dir), "-t", test_info_json,
+                     "-j", "1", "-q", "--formats", "csv,xlsx", "--no-plots"])
+
+        assert code == 0
+        result_dir = capsys.readouterr().out.strip()
+        files = os.listdir(result_dir)
+        assert "Info_Image.csv" in files
+        assert any(name.endswith(".csv") and name.startswith("EVE_") for name in files)
+        assert not [name for name in files if name.endswith((".png", ".svg"))]
+        assert not [name for name in os.listdir(output_dir) if name.endswith(".docx")]
+
+    def test_no_plots_conflicts_with_docx(self, tmp_path, test_info_json):
+        with pytest.raises(SystemExit) as exc:
+            main([str(tmp_path), "-o", str(tmp_path / "out"), "-t", test_info_json,
+                  "--formats", "docx", "--no-plots"])
+        assert exc.value.code == 2
+
+    def test_empty_input_reports_analysis_failure(self, tmp_path, test_info_json):
+        (tmp_path / "empty").mkdir()
+        assert main([str(tmp_path / "empty"), "-o", str(tmp_path / "out"), "-t", test_info_json,
+                     "-j", "1", "-q"]) == 1
+
+    def test_does_not_import_qt(self):
+        code = ("import sys, battery_analysis.cli, battery_analysis.utils.analysis_pipeline; "
+                "sys.exit(any(name.startswith('PyQt6') for name in sys.modules))")
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        assert subprocess.run([sys.executable, "-c", code], env=env, check=False).returncode == 0
+
+
+class TestBatch:
+    def test_batch_file_runs_each_campaign(self, tmp_path, test_info_json, capsys):
+        for name in ("a", "b"):
+            (tmp_path / name).mkdir()
+            create_sample_xlsx(tmp_path / name, "cell_1.xlsx")
+        batch = tmp_path / "batch.json"
+        batch.write_text(json.dumps([
+            {"input_dir": "a", "test_info": "info.json"},
+            {"input_dir": "b", "output_dir": "out_b", "test_info": TEST_INFO},
+        ]), encoding="utf-8")
+
+        code = main(["--batch", str(batch), "-o", "out_a", "-j", "1", "-q", "--formats", "csv"])
+
+        assert code == 0
+        lines = capsys.readouterr().out.strip().splitlines()
+        assert [line.split("\t")[:2] for line in lines] == [["done", "a"], ["done", "b"]]
+        assert (tmp_path / "batch.state.json").exists()
+        assert main(["--batch", str(batch), "-o", "out_a", "-j", "1", "-q", "--formats", "csv"]) == 0
+        assert capsys.readouterr().out.startswith("skipped\ta")
+
+    def test_input_dir_and_batch_are_exclusive(self, tmp_path):
+        with pytest.raises(SystemExit) as exc:
+            main([str(tmp_path), "--batch", str(tmp_path / "batch.json")])
+        assert exc.value.code == 2
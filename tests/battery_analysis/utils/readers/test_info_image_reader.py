@@ -0,0 +1,92 @@
+import os
+
+import numpy as np
+import pytest
+
+from battery_analysis.utils.readers.info_image_reader import _parse, clear_info_image_cache, load_info_image
+from battery_analysis.utils.writers.info_csv_writer import write_info_csv
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_info_image_cache()
+    yield
+    clear_info_image_cache()
+
+
+@pytest.fixture
+def info_image_csv(tmp_path):
+    """2 电池 × 2 电流档，由正式写入器生成"""
+    write_info_csv(
+        str(tmp_path), ["BTS_A", "BTS_B"], [10, 20],
+        list_all_posi=[[[1, 2], [3]], [[4], [5, 6]]],
+        list_all_charge=[[[0.1, 0.2], [0.3]], [[0.4], [0.5, 0.6]]],
+        list_all_voltage=[[[3.1, 3.0], [2.9]], [[2.8], [2.7, 2.6]]],
+    )
+    return tmp_path / "Info_Image.csv"
+
+
+class TestLoadInfoImage:
+    def test_parses_layout_per_current_and_battery(self, info_image_csv):
+        data = load_info_image(str(info_image_csv), 2)
+        assert data.battery_names == ["BTS_A", "BTS_B"]
+        assert data.row_count == 14
+        assert [a.tolist() for a in data.charge[0]] == [[0.1, 0.2], [0.4]]
+        assert [a.tolist() for a in data.voltage[1]] == [[2.9], [2.7, 2.6]]
+
+    def test_arrays_are_read_only(self, info_image_csv):
+        data = load_info_image(str(info_image_csv), 2)
+        with pytest.raises(ValueError):
+            data.charge[0][0][0] = 1.0
+
+    def test_unparseable_cells_are_skipped(self, tmp_path):
+        csv_path = tmp_path / "Info_Image.csv"
+        csv_path.write_text('BATTERY,"a,b"\n1,2\n1.5,x,2\n\n', encoding="utf-8")
+        data = load_info_image(str(csv_path), 1)
+        assert data.battery_names == ["a,b"]
+        assert data.charge[0][0].tolist() == [1.5, 2.0]
+        assert data.voltage[0][0].size == 0
+
+    def test_memoized_until_file_changes(self, info_image_csv):
+        first = load_info_image(str(info_image_csv), 2)
+        assert load_info_image(str(info_image_csv), 2) is first
+
+        stat = os.stat(info_image_csv)
+        os.utime(info_image_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        reloaded = load_info_image(str(info_image_csv), 2)
+        assert reloaded is not first
+        assert np.array_equal(reloaded.charge[0][0], first.charge[0][0])
+
+
+class TestInfoImageSidecar:
+    def test_writer_emits_sidecar_matching_csv(self, info_image_csv):
+        npz_path = info_image_csv.parent / "Info_Image.npz"
+        assert npz_path.exists()
+        from_sidecar = load_info_image(str(info_image_csv), 2)
+        csv_only = _parse(info_image_csv.read_text(encoding="utf-8"), 2)
+        assert from_sidecar.battery_names == csv_only.battery_names
+        assert from_sidecar.row_count == csv_only.row_count
+        for c in range(2):
+            for got, expected in zip(from_sidecar.charge[c] + from_sidecar.voltage[c],
+                                     csv_only.charge[c] + csv_only.voltage[c]):
+                assert np.array_equal(got, expected)
+
+    def test_stale_sidecar_falls_back_to_csv(self, info_image_csv):
+        # CSV 被外部修改后副本记录的大小不再匹配
+        with open(info_image_csv, "a", encoding="utf-8") as f:
+            f.write("BATTERY,BTS_C\n")
+        data = load_info_image(str(info_image_csv), 2)
+        assert data.battery_names == ["BTS_A", "BTS_B", "BTS_C"]
+
+    def test_mmap_mode_maps_values(self, info_image_csv):
+        data = load_info_image(str(info_image_csv), 2, mmap=True)
+        assert isinstance(data.charge[0][0], np.memmap)
+        assert data.charge[0][0].tolist() == [0.1, 0.2]
+        assert data.voltage[1][1].tolist() == [2.7, 2.6]
+        with pytest.raises(ValueError):
+            data.charge[0][0][0] = 1.0
+
+    def test_non_numeric_data_skips_sidecar(self, tmp_path):
+        write_info_csv(str(tmp_path), ["BTS_A"], [10], [[[1]]], [[["x"]]], [[[3.0]]])
+        assert not (tmp_path / "Info_Image.npz").exists()
+        assert load_info_image(str(tmp_path / "Info_Image.csv"), 1).charge[0][0].size == 0
@@ -0,0 +1,70 @@
+import os
+
+import pandas as pd
+
+from battery_analysis.utils.readers import xlsx_reader
+from battery_analysis.utils.readers.sheet_cache import SheetCache, file_fingerprint
+from battery_analysis.utils.readers.xlsx_reader import read_analysis_sheets, read_xlsx_sheets
+
+
+class TestSheetCache:
+    def test_roundtrip_matches_direct_read(self, sample_xlsx, tmp_path):
+        """缓存加载的列投影与直接解析的值（含 int/float/str/NaN）一致"""
+        cache = SheetCache(tmp_path / "sheets")
+        fingerprint = file_fingerprint(str(sample_xlsx))
+        sheets = tuple(df.iloc[:, :n] for df, n in zip(read_xlsx_sheets(str(sample_xlsx)), (4, 3, 5)))
+
+        cache.put(fingerprint, sheets)
+        cached = cache.get(fingerprint)
+
+        assert cached is not None
+        for expected, actual in zip(sheets, cached):
+            pd.testing.assert_frame_equal(
+                actual, expected.astype(object), check_dtype=False, check_column_type=False)
+            for col in range(expected.shape[1]):
+                assert [type(v) for v in actual.iloc[:, col]] == [type(v) for v in expected.iloc[:, col]]
+
+    def test_miss_for_changed_fingerprint(self, sample_xlsx, tmp_path):
+        cache = SheetCache(tmp_path / "sheets")
+        fingerprint = file_fingerprint(str(sample_xlsx))
+        cache.put(fingerprint, read_xlsx_sheets(str(sample_xlsx)))
+
+        changed = fingerprint[:3] + ("0" * 32,)
+        assert cache.get(changed) is None
+
+    def test_evicts_least_recently_used(self, sample_xlsx, tmp_path):
+        cache = SheetCache(tmp_path / "sheets")
+        sheets = read_xlsx_sheets(str(sample_xlsx))
+        cache.put(("a", 1, 1, "x"), sheets)
+        entry_size = next(cache.cache_dir.glob("*.npz")).stat().st_size
+        old = cache._entry_path(("a", 1, 1, "x"))
+        os.utime(old, ns=(0, 0))
+
+        cache.max_bytes = entry_size
+        cache.put(("b", 1, 1, "x"), sheets)
+
+        assert not old.exists()
+        assert cache.get(("b", 1, 1, "x")) is not None
+
+
+class TestReadAnalysisSheets:
+    def test_second_read_skips_excel_parsing(self, sample_xlsx, monkeypatch):
+        first = read_analysis_sheets(str(sample_xlsx))
+
+        def fail(_path):
+            raise AssertionError("Excel should not be parsed on a cache hit")
+
+        monkeypatch.setattr(xlsx_reader, "read_projected_sheets", fail)
+        second = read_analysis_sheets(str(sample_xlsx))
+
+        assert [df.shape for df in second] == [df.shape for df in first] == [(4, 4), (6, 3), (9, 5)]
+
+    def test_disabled_cache_always_parses(self, sample_xlsx, monkeypatch):
+        monkeypatch.setenv("BATTERY_ANALYSIS_SHEET_CACHE", "0")
+        read_analysis_sheets(str(sample_xlsx))
+        calls = []
+        original = xlsx_reader.read_projected_sheets
+        monkeypatch.setattr(xlsx_reader, "read_projected_sheets", lambda p: calls.append(p) or original(p))
+
+        read_analysis_sheets(str(sample_xlsx))
+        assert calls == [str(sample_xlsx)]
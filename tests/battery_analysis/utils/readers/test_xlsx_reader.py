@@ -1,7 +1,10 @@
 """xlsx_reader 读取器测试（calamine 引擎回归锁）"""
+import numpy as np
 import pandas as pd
 
 from battery_analysis.utils.readers.xlsx_reader import extract_test_date_from_xls
+from battery_analysis.utils.readers.xlsx_reader import probe_xlsx
+from battery_analysis.utils.readers.xlsx_reader import read_projected_sheets
 from battery_analysis.utils.readers.xlsx_reader import read_xlsx_sheets
 
 
@@ -60,3 +63,54 @@ class TestExtractTestDate:
         ws0.append([1, "2025-06-10 08:00:00"])
         wb.save(file_path)
         assert extract_test_date_from_xls(str(file_path)) == "00000000"
+
+
+class TestReadProjectedSheets:
+    def test_projects_analysis_columns(self, sample_xlsx):
+        cycle_df, step_df, record_df = read_projected_sheets(str(sample_xlsx))
+        assert [df.shape for df in (cycle_df, step_df, record_df)] == [(4, 4), (6, 3), (9, 5)]
+
+    def test_numeric_columns_are_float64(self, sample_xlsx):
+        _, step_df, record_df = read_projected_sheets(str(sample_xlsx))
+        assert all(record_df.iloc[:, col].dtype == np.float64 for col in (0, 2, 3, 4))
+        assert step_df.iloc[:, 0].dtype == np.float64
+        # 表头单元格在数值列中为 NaN，文本列保留原值
+        assert np.isnan(record_df.iloc[0, 2])
+        assert record_df.iloc[0, 1] == "Step#"
+
+    def test_matches_full_read_values(self, sample_xlsx):
+        """分块读取（chunk 小于行数）与 read_xlsx_sheets 的值一致"""
+        full = read_xlsx_sheets(str(sample_xlsx))
+        projected = read_projected_sheets(str(sample_xlsx), chunk_rows=3)
+
+        pd.testing.assert_frame_equal(projected[0], full[0], check_dtype=False)
+        record = full[2]
+        np.testing.assert_array_equal(
+            projected[2].iloc[2:, 3].to_numpy(),
+            pd.to_numeric(record.iloc[2:, 3]).to_numpy(dtype=float))
+        assert projected[2].iloc[:, 1].tolist() == record.iloc[:, 1].tolist()
+
+
+class TestProbeXlsx:
+    def test_matches_full_first_sheet_read(self, sample_xlsx):
+        full = pd.read_excel(sample_xlsx, sheet_name=0, engine="calamine", header=0)
+        probe = probe_xlsx(str(sample_xlsx))
+        assert probe["sheet_names"] == ["Cycle", "Step", "Record"]
+        assert (probe["row_count"], probe["column_count"]) == full.shape
+        pd.testing.assert_frame_equal(probe["preview"], full)
+
+    def test_preview_limited_to_requested_rows(self, sample_xlsx):
+        probe = probe_xlsx(str(sample_xlsx), preview_rows=1)
+        assert len(probe["preview"]) == 1
+        assert probe["row_count"] == 3
+
+    def test_blank_and_duplicate_headers_named_like_pandas(self, tmp_path):
+        import openpyxl
+
+        file_path = tmp_path / "headers.xlsx"
+        wb = openpyxl.Workbook()
+        wb.active.append(["Voltage", None, "Voltage"])
+        wb.active.append([1.0, 2.0, 3.0])
+        wb.save(file_path)
+        expected = pd.read_excel(file_path, sheet_name=0, engine="calamine", header=0)
+        assert list(probe_xlsx(str(file_path))["preview"].columns) == list(expected.columns)
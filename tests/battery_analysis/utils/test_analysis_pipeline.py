@@ -0,0 +1,103 @@
+import json
+import os
+
+import pytest
+
+from battery_analysis.domain.entities.test_info import TestInfo
+from battery_analysis.utils.analysis_pipeline import run_analysis_pipeline
+from battery_analysis.utils.constants import SVG_SPEC_JSON, TIMINGS_JSON, TRACE_JSON
+from battery_analysis.utils.report_coordinator import render_deferred_svgs
+from battery_analysis.utils.resource_manager import ResourceProfile
+from battery_analysis.utils.task_executor import TaskExecutor
+from tests.fixtures.sample_data import create_sample_xlsx
+
+
+def _test_info():
+    return TestInfo(specification_type="CR2450", specification_method="1S1P", manufacturer="EVE",
+                    temperature_value="25:C", datasheet_nominal_capacity="600",
+                    calculation_nominal_capacity="600", required_usable_capacity="500",
+                    current_levels=[4000], voltage_levels=[3.0, 2.5], version="1")
+
+
+class TestRunAnalysisPipeline:
+    def test_result_dir_renamed_by_test_date(self, tmp_path):
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        create_sample_xlsx(input_dir, "cell_1.xlsx")
+        renamed, progress = [], []
+
+        result = run_analysis_pipeline(
+            str(input_dir), str(tmp_path / "output"), _test_info(),
+            executor=TaskExecutor("inline"), formats=("csv",),
+            progress_callback=lambda value, status: progress.append(value),
+            on_renamed=renamed.append)
+
+        assert result.ok and result.battery_count == 1
+        assert renamed == [result.test_date]
+        assert result.result_dir == os.path.join(str(tmp_path / "output"), f"{result.test_date}_v1")
+        assert not os.path.exists(tmp_path / "output" / "V1")
+        assert "Info_Image.csv" in os.listdir(result.result_dir)
+        assert progress[0] == 0 and progress[-1] == 100
+        assert progress == sorted(progress)
+        assert {"statistics", "csv", "total"} <= set(result.report_timings)
+
+    def test_timings_written_next_to_results(self, tmp_path):
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        create_sample_xlsx(input_dir, "cell_1.xlsx")
+
+        result = run_analysis_pipeline(str(input_dir), str(tmp_path / "output"), _test_info(),
+                                       executor=TaskExecutor("process", max_workers=1),
+                                       formats=("csv",), trace=True)
+
+        with open(os.path.join(result.result_dir, TIMINGS_JSON), encoding="utf-8") as f:
+            timings = json.load(f)
+        assert list(timings["stages"]) == ["prepare", "scan", "files", "commit", "rename", "report"]
+        # 子进程中的单文件子阶段随结果合并回主进程
+        assert timings["spans"]["file"]["count"] == 1
+        assert {"file.read", "file.charge", "report.csv"} <= set(timings["spans"])
+        assert os.path.getsize(os.path.join(result.result_dir, TRACE_JSON))
+        # 子进程的峰值内存记入资源记录，供下次估计单文件内存
+        assert len(ResourceProfile().samples) == 1
+
+    def test_progress_callback_error_during_reports_propagates(self, tmp_path):
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        create_sample_xlsx(input_dir, "cell_1.xlsx")
+
+        class Cancelled(Exception):
+            pass
+
+        def on_progress(value, status):
+            if status.startswith("Generating reports... ("):
+                raise Cancelled
+
+        with pytest.raises(Cancelled):
+            run_analysis_pipeline(str(input_dir), str(tmp_path / "output"), _test_info(),
+                                  executor=TaskExecutor("inline"), formats=("csv", "xlsx"),
+                                  progress_callback=on_progress)
+
+    def test_analysis_error_skips_reports(self, tmp_path):
+        (tmp_path / "input").mkdir()
+        result = run_analysis_pipeline(str(tmp_path / "input"), str(tmp_path / "output"), _test_info(),
+                                       executor=TaskExecutor("inline"))
+        assert "has no data file" in result.analysis_error
+        assert not result.ok
+        assert result.result_dir.endswith("V1")
+
+    def test_lazy_svgs_are_rendered_on_demand(self, tmp_path):
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        create_sample_xlsx(input_dir, "cell_1.xlsx")
+
+        result = run_analysis_pipeline(str(input_dir), str(tmp_path / "output"), _test_info(),
+                                       executor=TaskExecutor("inline"), formats=("csv", "svg"),
+                                       svg_mode="lazy")
+
+        assert result.ok
+        assert "boxplots" not in result.report_timings
+        assert not [name for name in os.listdir(result.result_dir) if name.endswith(".svg")]
+        paths = render_deferred_svgs(result.result_dir, executor=TaskExecutor("serial"))
+        assert len(paths) == 3 and all(os.path.getsize(path) for path in paths)
+        assert not os.path.exists(os.path.join(result.result_dir, SVG_SPEC_JSON))
+        assert render_deferred_svgs(result.result_dir) == []
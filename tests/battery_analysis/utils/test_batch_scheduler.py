@@ -0,0 +1,142 @@
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from battery_analysis.domain.entities.test_info import TestInfo
+from battery_analysis.utils import batch_scheduler
+from battery_analysis.utils.batch_scheduler import (
+    STATUS_DONE, STATUS_FAILED, STATUS_SKIPPED, BatchScheduler, Campaign)
+from battery_analysis.utils.processors.battery_analysis import BatteryAnalysis
+from battery_analysis.utils.task_executor import TaskExecutor
+from tests.fixtures.sample_data import create_sample_xlsx
+
+
+def _test_info(version="1"):
+    return TestInfo(specification_type="CR2450", specification_method="1S1P", manufacturer="EVE",
+                    temperature_value="25:C", datasheet_nominal_capacity="600",
+                    calculation_nominal_capacity="600", required_usable_capacity="500",
+                    current_levels=[4000], voltage_levels=[3.0, 2.5], version=version)
+
+
+def _campaign(tmp_path, name, files=1, version="1"):
+    input_dir = tmp_path / name
+    input_dir.mkdir()
+    for i in range(files):
+        create_sample_xlsx(input_dir, f"cell_{i + 1}.xlsx")
+    return Campaign(str(input_dir), str(tmp_path / "out" / name), _test_info(version), formats=("csv",))
+
+
+class TestBatchScheduler:
+    def test_campaigns_share_executor_with_separate_outputs(self, tmp_path):
+        campaigns = [_campaign(tmp_path, "a", files=2), _campaign(tmp_path, "b")]
+        progress = []
+
+        results = BatchScheduler(campaigns, executor=TaskExecutor("thread", max_workers=2),
+                                 progress_callback=lambda r, status: progress.append((r.campaign.name, status))
+                                 ).run()
+
+        assert [r.status for r in results] == [STATUS_DONE, STATUS_DONE]
+        assert [r.pipeline.battery_count for r in results] == [2, 1]
+        assert results[0].pipeline.result_dir != results[1].pipeline.result_dir
+        for result in results:
+            assert "Info_Image.csv" in os.listdir(result.pipeline.result_dir)
+        assert ("a", "Analyzed 2/2 files") in progress and ("b", "Done") in progress
+
+    def test_campaign_completion_does_not_block_analysis(self, tmp_path):
+        campaigns = [_campaign(tmp_path, "a"), _campaign(tmp_path, "b", files=2)]
+        progress = []
+        b_analyzed = threading.Event()
+        finish_pipeline = batch_scheduler.finish_pipeline
+
+        def _finish_pipeline(analysis, output_dir, *args, **kwargs):
+            if os.path.basename(output_dir) == "a":
+                # a 的报告生成期间，调用线程应继续分析 b 的文件
+                assert b_analyzed.wait(timeout=10)
+            return finish_pipeline(analysis, output_dir, *args, **kwargs)
+
+        def _progress(result, status):
+            progress.append((result.campaign.name, status))
+            if (result.campaign.name, status) == ("b", "Analyzed 2/2 files"):
+                b_analyzed.set()
+
+        with patch.object(batch_scheduler, "finish_pipeline", _finish_pipeline):
+            results = BatchScheduler(campaigns, executor=TaskExecutor("serial"),
+                                     progress_callback=_progress).run()
+
+        assert [r.status for r in results] == [STATUS_DONE, STATUS_DONE]
+        assert progress.index(("a", "Writing reports...")) < progress.index(("b", "Analyzed 2/2 files"))
+        assert progress.index(("b", "Analyzed 2/2 files")) < progress.index(("a", "Done"))
+
+    def test_failed_campaign_is_isolated(self, tmp_path):
+        (tmp_path / "empty").mkdir()
+        campaigns = [Campaign(str(tmp_path / "empty"), str(tmp_path / "out" / "empty"), _test_info()),
+                     _campaign(tmp_path, "ok")]
+
+        results = BatchScheduler(campaigns, executor=TaskExecutor("serial")).run()
+
+        assert results[0].status == STATUS_FAILED and "has no data file" in results[0].error
+        assert results[1].status == STATUS_DONE
+
+    def test_unexpected_file_error_fails_only_its_campaign(self, tmp_path):
+        campaigns = [_campaign(tmp_path, "bad", files=2), _campaign(tmp_path, "ok", files=2)]
+        process_file = BatteryAnalysis._parallel_process_file
+
+        def _process(args):
+            if os.sep + "bad" + os.sep in args[0]:
+                raise TypeError("unexpected cell type")
+            return process_file(args)
+
+        with patch.object(BatteryAnalysis, "_parallel_process_file", staticmethod(_process)):
+            results = BatchScheduler(campaigns, executor=TaskExecutor("serial")).run()
+
+        assert results[0].status == STATUS_FAILED and "TypeError" in results[0].error
+        assert results[1].status == STATUS_DONE and results[1].pipeline.battery_count == 2
+
+    def test_state_file_skips_completed_campaigns_until_inputs_change(self, tmp_path):
+        campaigns = [_campaign(tmp_path, "a"), _campaign(tmp_path, "b")]
+        state_path = str(tmp_path / "batch.state.json")
+        BatchScheduler(campaigns, executor=TaskExecutor("serial"), state_path=state_path).run()
+
+        create_sample_xlsx(tmp_path / "b", "cell_2.xlsx")
+        results = BatchScheduler(campaigns, executor=TaskExecutor("serial"), state_path=state_path).run()
+
+        assert results[0].status == STATUS_SKIPPED
+        assert os.path.isdir(results[0].pipeline.result_dir)
+        assert results[1].status == STATUS_DONE and results[1].pipeline.battery_count == 2
+
+    def test_interrupted_batch_reuses_analyzed_files(self, tmp_path):
+        campaigns = [_campaign(tmp_path, "a", files=4), _campaign(tmp_path, "b", files=2)]
+        state_path = str(tmp_path / "batch.state.json")
+
+        def _interrupt(result, status):
+            if (result.campaign.name, status) == ("a", "Analyzed 3/4 files"):
+                raise KeyboardInterrupt
+
+        with patch.object(BatteryAnalysis, "MANIFEST_CHECKPOINT_FILES", 1), \
+                pytest.raises(KeyboardInterrupt):
+            BatchScheduler(campaigns, executor=TaskExecutor("serial"), state_path=state_path,
+                           progress_callback=_interrupt).run()
+
+        analyzed = []
+        process_file = BatteryAnalysis._parallel_process_file
+
+        def _process(args):
+            analyzed.append(os.path.relpath(args[0], tmp_path))
+            return process_file(args)
+
+        with patch.object(BatteryAnalysis, "_parallel_process_file", staticmethod(_process)):
+            results = BatchScheduler(campaigns, executor=TaskExecutor("serial"),
+                                     state_path=state_path).run()
+
+        assert [r.status for r in results] == [STATUS_DONE, STATUS_DONE]
+        assert [r.pipeline.battery_count for r in results] == [4, 2]
+        assert analyzed == [os.path.join("a", "cell_4.xlsx"),
+                            os.path.join("b", "cell_1.xlsx"), os.path.join("b", "cell_2.xlsx")]
+
+    def test_duplicate_target_is_rejected(self, tmp_path):
+        campaign = _campaign(tmp_path, "a")
+        other = Campaign(str(tmp_path / "a"), campaign.output_dir, _test_info(), name="again")
+        with pytest.raises(ValueError, match="again"):
+            BatchScheduler([campaign, other])
@@ -25,10 +25,10 @@ class TestBatteryAnalysis:
         assert result == date2
 
     def test_parallel_process_file_normalizes_read_failure(self, sample_xlsx):
-        """read_xlsx_sheets 失败时应归一化为 BatteryAnalysisException，而非走 xlrd 回退"""
+        """read_analysis_sheets 失败时应归一化为 BatteryAnalysisException，而非走 xlrd 回退"""
         args = (str(sample_xlsx), [500, 1000], [3.0, 4.0])
         with patch(
-            "battery_analysis.utils.processors.battery_analysis.read_xlsx_sheets",
+            "battery_analysis.utils.processors.battery_analysis.read_analysis_sheets",
             side_effect=ValueError("simulated corrupt file"),
         ):
             with pytest.raises(BatteryAnalysisException, match="Failed to read Excel file"):
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from battery_analysis.utils.processors.charge_calculator import ChargeCalculator
+from battery_analysis.utils.readers.xlsx_reader import read_xlsx_sheets
+
+
+@pytest.fixture
+def calculator(sample_xlsx):
+    return ChargeCalculator(*read_xlsx_sheets(str(sample_xlsx)))
+
+
+class TestChargeCalculator:
+    def test_single_position_rounds(self, calculator):
+        """单点查询：cycle 1 行 = step 0.4 + record 0.01，取整为 0"""
+        assert calculator.calculate(3) == 0
+        assert isinstance(calculator.calculate(3), int)
+
+    def test_batch_positions_match_expected(self, calculator):
+        """批量查询：cycle 2 行需累加前一 cycle 的累计充电量"""
+        charges = calculator.calculate([3, 7], is_single=False)
+        assert charges == pytest.approx([0.41, 0.76])
+
+    def test_invalid_positions_return_zero(self, calculator):
+        """行号 < 2 或越界的位置返回 0"""
+        assert calculator.calculate(0) == 0
+        assert calculator.calculate(1) == 0
+        assert calculator.calculate(999) == 0
+        assert calculator.calculate([1, 999], is_single=False) == [0, 0]
+
+    def test_calculate_batch_returns_arrays(self, calculator):
+        charges, valid = calculator.calculate_batch([1, 3, 7])
+        assert isinstance(charges, np.ndarray)
+        assert valid.tolist() == [False, True, True]
+        assert charges[0] == 0
+
+    def test_unsorted_cycles_match_linear_scan(self):
+        """cycle 号乱序时，结果与首个 cycle >= 目标的线性扫描一致"""
+        cycle_df = pd.DataFrame([
+            ["Cycle#", "b", "e", "Charge"], ["BAT", "", "", ""],
+            [1, "", "", 1.0], [5, "", "", 2.0], [3, "", "", 4.0],
+        ], dtype=object)
+        step_df = pd.DataFrame([["Cycle#", "Step", "Charge"], ["BAT", "", ""]], dtype=object)
+        record_df = pd.DataFrame([
+            ["Cycle#", "Step", "I", "V", "Charge"], ["BAT", "", "", "", ""],
+            [4, "脉冲", -4.0, 3.0, 0.0],
+        ], dtype=object)
+
+        calc = ChargeCalculator(cycle_df, step_df, record_df)
+        # 线性扫描在 cycle 5（第 3 行）处停止，累计 cycle 1 的 1.0
+        assert calc.calculate([2], is_single=False) == [1.0]
@@ -0,0 +1,74 @@
+import json
+import os
+
+from battery_analysis.utils.instrumentation import (
+    Profiler, StageProgress, collect, load_stage_weights, merge_collected, profiling, span,
+)
+
+
+def _nested():
+    with span("outer"):
+        with span("outer.inner"):
+            pass
+    return 42
+
+
+class TestSpans:
+    def test_nothing_recorded_without_profiler(self):
+        profiler = Profiler()
+        _nested()
+        assert not profiler.records
+
+    def test_nested_spans_record_parent(self):
+        with profiling(Profiler()) as profiler:
+            _nested()
+            _nested()
+        summary = profiler.summary()
+        assert list(summary) == ["outer", "outer.inner"]
+        assert summary["outer"]["count"] == 2
+        assert summary["outer"]["wall"] >= summary["outer.inner"]["wall"]
+        assert profiler.stage_weights().keys() == {"outer"}
+
+    def test_collected_records_merge_into_active_profiler(self):
+        value, records = collect(_nested)
+        assert value == 42 and len(records) == 2
+        with profiling(Profiler()) as profiler:
+            merge_collected(records)
+        assert profiler.summary()["outer.inner"]["count"] == 1
+
+    def test_timings_and_trace_files(self, tmp_path):
+        with profiling(Profiler()) as profiler:
+            _nested()
+        profiler.write_timings(str(tmp_path / "timings.json"))
+        profiler.write_trace(str(tmp_path / "trace.json"))
+
+        assert set(load_stage_weights(str(tmp_path / "timings.json"))) == {"outer"}
+        with open(tmp_path / "trace.json", encoding="utf-8") as f:
+            events = json.load(f)["traceEvents"]
+        assert [e["name"] for e in events if e["ph"] == "X"] == ["outer.inner", "outer"]
+        assert all(e["pid"] == os.getpid() for e in events)
+
+    def test_invalid_timings_ignored(self, tmp_path):
+        path = tmp_path / "timings.json"
+        path.write_text("{broken", encoding="utf-8")
+        assert load_stage_weights(str(path)) == {}
+        assert load_stage_weights(None) == {}
+
+
+class TestStageProgress:
+    def test_ranges_follow_weights_and_never_go_back(self):
+        values = []
+        progress = StageProgress(lambda value, status: values.append(value), {"a": 1, "b": 3})
+        progress.start("a", "")
+        progress.update("a", 1.0, "")
+        progress.update("b", 0.5, "")
+        progress.update("a", 0.5, "")
+        progress.finish("")
+        assert values == [0, 25, 62, 62, 100]
+
+    def test_measured_weights_used_only_when_complete(self):
+        values = []
+        stages = {"a": 1, "b": 1}
+        StageProgress(lambda v, s: values.append(v), stages, {"a": 3.0, "b": 1.0}).start("b", "")
+        StageProgress(lambda v, s: values.append(v), stages, {"a": 3.0}).start("b", "")
+        assert values == [75, 50]
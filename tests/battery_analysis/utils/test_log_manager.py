@@ -1,6 +1,11 @@
+import logging
+
 import pytest
 from unittest.mock import Mock, patch
-from battery_analysis.utils.log_manager import LogManager
+from battery_analysis.utils import log_manager
+from battery_analysis.utils.log_manager import LogManager, RateLimitFilter
+from battery_analysis.utils.resource_manager import ResourceManager
+from battery_analysis.utils.worker_pool import WorkerPool
 
 
 class TestLogManager:
@@ -22,3 +27,43 @@ class TestLogManager:
         log_dir = self.manager.get_log_directory()
         from pathlib import Path
         assert isinstance(log_dir, Path)
+
+    def test_records_written_by_listener(self):
+        self.manager.get_logger("test").info("queued record")
+        log_manager._stop_listeners()
+        with open(self.manager._current_log_file, encoding="utf-8") as f:
+            assert "queued record" in f.read()
+
+
+class TestRateLimitFilter:
+    def _record(self, level=logging.INFO, lineno=10):
+        return logging.LogRecord("battery_analysis.test", level, "mod.py", lineno, "file %s", ("a.xlsx",), None)
+
+    def test_bursts_are_limited_per_call_site(self):
+        f = RateLimitFilter(burst=2, window=60)
+        assert [f.filter(self._record()) for _ in range(4)] == [True, True, False, False]
+        assert f.filter(self._record(lineno=11))
+        assert f.filter(self._record(level=logging.WARNING))
+
+    def test_suppressed_count_reported_in_next_window(self):
+        f = RateLimitFilter(burst=1, window=1.0)
+        with patch.object(log_manager.time, "monotonic", side_effect=[0.0, 0.1, 0.2, 5.0]):
+            for _ in range(3):
+                f.filter(self._record())
+            record = self._record()
+            assert f.filter(record)
+        assert record.getMessage() == "file a.xlsx (2 similar messages suppressed)"
+
+
+class TestWorkerLogging:
+    def test_worker_records_reach_parent_queue(self):
+        log_queue = ResourceManager.get_processing_context().Queue()
+        with patch("battery_analysis.utils.worker_pool.get_worker_log_queue", return_value=log_queue):
+            pool = WorkerPool(max_workers=1)
+            try:
+                pool.submit(logging.getLogger("battery_analysis.worker").warning, "from %s", "worker").result()
+            finally:
+                pool.shutdown()
+        record = log_queue.get(timeout=10)
+        assert record.getMessage() == "from worker"
+        assert record.levelno == logging.WARNING
@@ -0,0 +1,69 @@
+import pickle
+
+import numpy as np
+
+from battery_analysis.utils.processors.pulse_curves import PulseCurves
+from battery_analysis.utils.writers.info_csv_writer import InfoImageWriter, write_info_csv, write_info_image
+
+POSI = [[4, 8, 9], [], [12]]
+VOLTAGE = [[2.9, 2.5, 2.4], [], [3.1]]
+CHARGE = [0.5, 1.25, 0.0, 7.0]
+VALID = [True, True, False, True]
+
+
+def _curves():
+    return PulseCurves.from_levels(POSI, VOLTAGE, CHARGE, VALID)
+
+
+class TestPulseCurves:
+    def test_lists_split_per_current_level(self):
+        curves = _curves()
+        assert curves.level_count == 3
+        assert curves.posi_lists() == POSI
+        assert curves.voltage_lists() == VOLTAGE
+        # 无效位置还原为整数 0，与 ChargeCalculator.calculate(is_single=False) 一致
+        charge = curves.charge_lists()
+        assert charge == [[0.5, 1.25, 0], [], [7.0]]
+        assert type(charge[0][2]) is int and type(charge[2][0]) is float
+
+    def test_dict_roundtrip(self):
+        assert PulseCurves.from_dict(_curves().to_dict()) == _curves()
+
+    def test_pickle_roundtrip_keeps_typed_arrays(self):
+        """跨进程传输后仍为定长数值数组，不含逐元素 Python 对象"""
+        restored = pickle.loads(pickle.dumps(_curves()))
+        assert restored == _curves()
+        assert [restored.posi.dtype, restored.charge.dtype, restored.voltage.dtype] == \
+            [np.int64, np.float64, np.float64]
+
+
+class TestWriteInfoImage:
+    def test_matches_nested_list_writer(self, tmp_path):
+        names = ["BTS_A", "BTS_B"]
+        currents = [30, 26, 15]
+        other = PulseCurves.from_levels([[1], [2, 3], [4]], [[3.0], [2.9, 2.8], [2.7]],
+                                        [0.25, 0.5, 0.75, 1.0], [True] * 4)
+        write_info_image(str(tmp_path / "packed"), names, currents, [_curves(), other])
+        write_info_csv(str(tmp_path / "nested"), names, currents,
+                       [c.posi_lists() for c in (_curves(), other)],
+                       [c.charge_lists() for c in (_curves(), other)],
+                       [c.voltage_lists() for c in (_curves(), other)])
+
+        assert ((tmp_path / "packed" / "Info_Image.csv").read_bytes()
+                == (tmp_path / "nested" / "Info_Image.csv").read_bytes())
+        with np.load(tmp_path / "packed" / "Info_Image.npz") as packed, \
+                np.load(tmp_path / "nested" / "Info_Image.npz") as nested:
+            for key in packed.files:
+                if not key.startswith("source_"):
+                    assert np.array_equal(packed[key], nested[key]), key
+
+    def test_aborted_writer_keeps_previous_output(self, tmp_path):
+        write_info_image(str(tmp_path), ["BTS_A"], [30, 26, 15], [_curves()])
+        before = (tmp_path / "Info_Image.csv").read_bytes()
+
+        writer = InfoImageWriter(str(tmp_path), 3)
+        writer.add("BTS_B", _curves())
+        writer.abort()
+
+        assert (tmp_path / "Info_Image.csv").read_bytes() == before
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["Info_Image.csv", "Info_Image.npz"]
@@ -0,0 +1,39 @@
+import numpy as np
+
+from battery_analysis.utils.processors.pulse_matcher import match_pulse_levels
+
+
+CURRENT = ["Current", "", -4.0, -4.0, -4.0, 1.0, -4.0, -4.0, -4.0]
+VOLTAGE = ["Voltage", "", 4.2, 3.8, 2.5, 3.0, 4.1, 3.7, 2.4]
+PULSE = [False, False, True, True, True, False, True, True, True]
+
+
+class TestMatchPulseLevels:
+    def test_endpoints_and_voltage_levels(self):
+        """脉冲结束点为下一行不在同一电流区间的行；电压等级取首个 <= 等级的行"""
+        level_voltage, level_row, posi, volts = match_pulse_levels(
+            CURRENT, VOLTAGE, PULSE, [4000], [4.0, 3.0])
+
+        assert posi == [[4, 8]]
+        assert volts == [[2.5, 2.4]]
+        assert level_row == [[3, 4]]
+        assert level_voltage == [[3.8, 2.5]]
+
+    def test_accepts_numpy_arrays(self):
+        expected = match_pulse_levels(CURRENT, VOLTAGE, PULSE, [4000, 500], [4.0, 3.0])
+        result = match_pulse_levels(
+            np.array(CURRENT, dtype=object), np.array(VOLTAGE, dtype=object),
+            np.array(PULSE), [4000, 500], [4.0, 3.0])
+        assert result == expected
+
+    def test_unmatched_levels_keep_defaults(self):
+        """未命中的电流等级保留默认电压值与行号 0"""
+        level_voltage, level_row, posi, volts = match_pulse_levels(
+            CURRENT, VOLTAGE, PULSE, [4000, 500], [4.0])
+
+        assert level_voltage[1] == [4.0]
+        assert level_row[1] == [0]
+        assert posi[1] == [] and volts[1] == []
+
+    def test_no_pulse_returns_none(self):
+        assert match_pulse_levels(CURRENT, VOLTAGE, [False] * len(PULSE), [4000], [3.0]) is None
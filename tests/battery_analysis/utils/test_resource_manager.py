@@ -1,6 +1,16 @@
+import time
+from collections import namedtuple
+
 import pytest
 from unittest.mock import Mock, patch
-from battery_analysis.utils.resource_manager import ResourceManager
+from battery_analysis.utils import resource_manager as rm
+from battery_analysis.utils.resource_manager import (
+    WORKER_BASE_RSS, ResourceManager, ResourceProfile,
+)
+
+MB = 1024 ** 2
+
+_CpuTimes = namedtuple("_CpuTimes", ["user", "idle"])
 
 
 class TestResourceManager:
@@ -12,7 +22,87 @@ class TestResourceManager:
         assert isinstance(result, int)
         assert result >= 1
 
+    def test_get_optimal_process_count_does_not_block(self):
+        start = time.perf_counter()
+        self.manager.get_optimal_process_count()
+        self.manager.get_optimal_process_count()
+        assert time.perf_counter() - start < 0.5
+
     def test_get_processing_context(self):
         result = self.manager.get_processing_context()
         ctx_name = result.get_start_method()
         assert ctx_name == 'spawn'
+
+    def test_memory_limits_recommended_workers(self, tmp_path):
+        big = tmp_path / "big.xlsx"
+        big.write_bytes(b"\0" * (2 * MB))
+        profile = ResourceProfile(str(tmp_path / "profile.json"))
+        profile.record(2 * MB, WORKER_BASE_RSS + 200 * MB)
+
+        with patch.object(rm.multiprocessing, "cpu_count", return_value=8), \
+             patch.object(ResourceManager, "cpu_load", return_value=10.0), \
+             patch.object(ResourceManager, "available_memory", return_value=1000 * MB):
+            plan = ResourceManager.recommend([str(big)] * 6, profile=profile)
+
+        assert plan.worker_bytes == WORKER_BASE_RSS + 200 * MB
+        assert plan.workers == int(1000 * MB * rm.MEMORY_HEADROOM // plan.worker_bytes) == 2
+        assert plan.chunk_size == 1
+
+    def test_small_files_are_chunked(self, tmp_path):
+        paths = []
+        for i in range(40):
+            (tmp_path / f"{i}.xlsx").write_bytes(b"\0" * 1024)
+            paths.append(str(tmp_path / f"{i}.xlsx"))
+        with patch.object(ResourceManager, "available_memory", return_value=None):
+            plan = ResourceManager.recommend(paths, max_workers=2,
+                                             profile=ResourceProfile(str(tmp_path / "p.json")))
+        assert plan.workers <= 2
+        assert plan.chunk_size == -(-40 // (plan.workers * rm.CHUNKS_PER_WORKER))
+
+
+class TestResourceProfile:
+    def test_measured_ratio_is_persisted(self, tmp_path):
+        path = str(tmp_path / "profile.json")
+        assert ResourceProfile(path).bytes_per_input_byte() == rm.DEFAULT_RSS_PER_INPUT_BYTE
+
+        ResourceProfile(path).record(10 * MB, WORKER_BASE_RSS + 50 * MB)
+        # 小文件以常驻内存为主，不参与比例估计
+        ResourceProfile(path).record(MB // 2, WORKER_BASE_RSS + 50 * MB)
+
+        profile = ResourceProfile(path)
+        assert len(profile.samples) == 2
+        assert profile.bytes_per_input_byte() == pytest.approx(5.0)
+        assert profile.estimate_worker_bytes(100 * MB) == WORKER_BASE_RSS + 500 * MB
+
+    def test_unreadable_profile_uses_defaults(self, tmp_path):
+        path = tmp_path / "profile.json"
+        path.write_text("not json", encoding="utf-8")
+        assert ResourceProfile(str(path)).samples == []
+
+    def test_observe_input_keeps_largest(self, tmp_path):
+        small, large = tmp_path / "s.xlsx", tmp_path / "l.xlsx"
+        small.write_bytes(b"\0" * 10)
+        large.write_bytes(b"\0" * 1000)
+        with patch.object(rm, "_largest_input_bytes", 0):
+            assert ResourceManager.observe_input(str(large)) == 1000
+            assert ResourceManager.observe_input(str(small)) == 1000
+
+
+@pytest.mark.skipif(not rm.PSUTIL_AVAILABLE, reason="psutil unavailable")
+class TestCpuLoadSampler:
+    def test_sample_needs_an_interval(self):
+        sampler = rm._CpuLoadSampler()
+        times = Mock(side_effect=[rm.psutil.cpu_times()] * 3)
+        with patch.object(rm.psutil, "cpu_times", times), \
+             patch.object(rm.time, "monotonic", side_effect=[0.0, 0.05, 1.0]):
+            assert sampler.sample() is None
+            assert sampler.sample() is None
+            assert sampler.sample() is None  # 两次样本相同：总时间差为 0
+
+    def test_sample_computes_busy_fraction(self):
+        sampler = rm._CpuLoadSampler()
+        first, second = _CpuTimes(user=10.0, idle=10.0), _CpuTimes(user=17.0, idle=13.0)
+        with patch.object(rm.psutil, "cpu_times", side_effect=[first, second]), \
+             patch.object(rm.time, "monotonic", side_effect=[0.0, 1.0]):
+            sampler.sample()
+            assert sampler.sample() == pytest.approx(70.0)
@@ -0,0 +1,129 @@
+import os
+from unittest.mock import patch
+
+from battery_analysis.utils.constants import INFO_MANIFEST_JSON
+from battery_analysis.utils.processors.battery_analysis import BatteryAnalysis
+from battery_analysis.utils.processors.pulse_curves import PulseCurves
+from battery_analysis.utils.processors.result_manifest import (
+    ResultManifest,
+    find_previous_manifest,
+    read_manifest_file,
+)
+from battery_analysis.utils.readers import xlsx_reader
+from battery_analysis.utils.readers.sheet_cache import file_fingerprint
+from battery_analysis.utils.task_executor import TaskExecutor
+from tests.fixtures.sample_data import create_sample_xlsx
+
+CURRENTS = [4000]
+VOLTAGES = [3.0, 2.5]
+RESULT = ("BAT", [1, 2], PulseCurves.from_levels([[4, 8]], [[2.5, 2.4]], [0.41, 0.0], [True, False]),
+          ["a", "b"])
+
+
+def _test_info():
+    return ["", "", "CR2450", "1S1P", "EVE", "B1", "", "25:C", "600",
+            "", "", "", "", "", CURRENTS, VOLTAGES, "1", "", ""]
+
+
+class TestResultManifest:
+    def test_roundtrip_reuses_unchanged_file(self, sample_xlsx, tmp_path):
+        manifest = ResultManifest(CURRENTS, VOLTAGES)
+        manifest.record(str(sample_xlsx), RESULT)
+        manifest.save(str(tmp_path / "out"))
+
+        loaded = ResultManifest.load(str(tmp_path / "out" / INFO_MANIFEST_JSON), CURRENTS, VOLTAGES)
+        assert loaded.lookup(str(sample_xlsx)) == RESULT
+
+    def test_modified_file_is_not_reused(self, sample_xlsx):
+        manifest = ResultManifest(CURRENTS, VOLTAGES)
+        manifest.record(str(sample_xlsx), RESULT)
+        with open(sample_xlsx, "ab") as f:
+            f.write(b"\0")
+        assert manifest.lookup(str(sample_xlsx)) is None
+
+    def test_touched_file_with_same_content_is_reused(self, sample_xlsx):
+        manifest = ResultManifest(CURRENTS, VOLTAGES)
+        manifest.record(str(sample_xlsx), RESULT)
+        stat = os.stat(sample_xlsx)
+        os.utime(sample_xlsx, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert manifest.lookup(str(sample_xlsx)) is not None
+
+    def test_changed_levels_discard_entries(self, sample_xlsx, tmp_path):
+        manifest = ResultManifest(CURRENTS, VOLTAGES)
+        manifest.record(str(sample_xlsx), RESULT)
+        manifest.save(str(tmp_path))
+
+        data = read_manifest_file(str(tmp_path / INFO_MANIFEST_JSON))
+        assert ResultManifest.from_dict(data, CURRENTS, [3.0]).entries == {}
+
+    def test_find_previous_prefers_renamed_result_dir(self, tmp_path):
+        for name in ("V1", "20250610_v1"):
+            ResultManifest(CURRENTS, VOLTAGES).save(str(tmp_path / name))
+        os.utime(tmp_path / "V1" / INFO_MANIFEST_JSON, ns=(0, 0))
+        assert find_previous_manifest(str(tmp_path), "1") == str(tmp_path / "20250610_v1" / INFO_MANIFEST_JSON)
+
+
+class TestIncrementalAnalysis:
+    def test_second_run_only_processes_new_files(self, tmp_path):
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        create_sample_xlsx(input_dir, "cell_1.xlsx")
+        output_dir = str(tmp_path / "output")
+
+        first = BatteryAnalysis(str(input_dir), output_dir, _test_info(), incremental=True,
+                                executor=TaskExecutor("inline"))
+        assert first.UBA_GetErrorLog() == ""
+        assert first.listReusedXlsx == []
+
+        create_sample_xlsx(input_dir, "cell_2.xlsx")
+        second = BatteryAnalysis(str(input_dir), output_dir, _test_info(), incremental=True,
+                                 executor=TaskExecutor("inline"))
+
+        assert [os.path.basename(p) for p in second.listReusedXlsx] == ["cell_1.xlsx"]
+        assert len(second.listBatteryName) == 2
+        assert second.listAllBatteryCharge[0] == first.listAllBatteryCharge[0]
+
+    def test_manifest_records_fingerprint_taken_before_reading(self, tmp_path):
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        path = str(create_sample_xlsx(input_dir, "cell_1.xlsx"))
+        before = file_fingerprint(path)
+        read_sheets = xlsx_reader.read_analysis_sheets
+
+        def _read_then_modify(filepath, *args, **kwargs):
+            sheets = read_sheets(filepath, *args, **kwargs)
+            with open(filepath, "ab") as f:  # 分析期间文件被修改
+                f.write(b"\0")
+            return sheets
+
+        with patch("battery_analysis.utils.processors.battery_analysis.read_analysis_sheets",
+                   side_effect=_read_then_modify), \
+                patch("battery_analysis.utils.processors.result_manifest.file_fingerprint") as rehash:
+            BatteryAnalysis(str(input_dir), str(tmp_path / "output"), _test_info(),
+                            incremental=True, executor=TaskExecutor("inline"))
+
+        rehash.assert_not_called()
+        manifest = ResultManifest.load(str(tmp_path / "output" / "V1" / INFO_MANIFEST_JSON),
+                                       CURRENTS, VOLTAGES)
+        assert manifest.entries["cell_1.xlsx"]["fingerprint"] == list(before[1:])
+        assert manifest.lookup(path) is None
+
+    def test_results_stream_in_file_order_with_progress_per_file(self, tmp_path):
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        for name in ("cell_1.xlsx", "cell_2.xlsx", "cell_10.xlsx"):
+            create_sample_xlsx(input_dir, name)
+        (input_dir / "cell_3.xlsx").write_bytes(b"not a workbook")
+        progress = []
+
+        analysis = BatteryAnalysis(str(input_dir), str(tmp_path / "output"), _test_info(),
+                                   progress_callback=lambda pct, msg: progress.append(msg),
+                                   executor=TaskExecutor("thread", max_workers=2))
+
+        assert analysis.UBA_GetErrorLog() == ""
+        assert len(analysis.listBatteryName) == 3
+        assert [m for m in progress if m.startswith("Analyzing battery data...")] == \
+            [f"Analyzing battery data... ({i}/4)" for i in range(1, 5)]
+        result_dir = tmp_path / "output" / "V1"
+        assert sorted(p.name for p in result_dir.iterdir()) == \
+            ["Info_Image.csv", "Info_Image.npz", "Info_Plot.json"]
@@ -0,0 +1,129 @@
+import math
+import os
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from battery_analysis.utils.task_executor import EXECUTOR_BACKENDS, GraphTask, TaskExecutor
+from battery_analysis.utils.worker_pool import get_worker_pool
+
+ARGS = [9, -1, 16, 25, -4, 36]
+EXPECTED = [3.0, None, 4.0, 5.0, None, 6.0]
+
+
+@pytest.mark.parametrize("backend", ["process", "thread", "serial"])
+class TestBackends:
+    def test_results_in_submission_order_with_failures_skipped(self, backend):
+        errors = []
+        results = TaskExecutor(backend, max_workers=2).map(
+            math.sqrt, ARGS, skip_exceptions=(ValueError,),
+            on_error=lambda idx, e: errors.append(idx))
+        assert results == EXPECTED
+        assert sorted(errors) == [1, 4]
+
+    def test_progress_reported_per_task(self, backend):
+        progress = []
+        TaskExecutor(backend, max_workers=2).map(
+            math.sqrt, ARGS, skip_exceptions=(ValueError,),
+            on_progress=lambda done, total: progress.append((done, total)))
+        assert progress == [(i, len(ARGS)) for i in range(1, len(ARGS) + 1)]
+
+    def test_imap_unordered_yields_each_index_once(self, backend):
+        results = dict(TaskExecutor(backend, max_workers=2, chunk_size=1).imap_unordered(
+            math.sqrt, ARGS, skip_exceptions=(ValueError,), on_error=lambda idx, e: None))
+        assert [results[idx] for idx in range(len(ARGS))] == EXPECTED
+
+    def test_unlisted_exceptions_propagate(self, backend):
+        with pytest.raises(ValueError):
+            TaskExecutor(backend, max_workers=2).map(math.sqrt, ARGS, skip_exceptions=(KeyError,))
+
+
+class TestTaskExecutor:
+    def test_inline_raises_first_failure(self):
+        with pytest.raises(ValueError):
+            TaskExecutor("inline").map(math.sqrt, ARGS, skip_exceptions=(ValueError,))
+
+    def test_process_backend_chunks_keep_order(self):
+        results = TaskExecutor("process", max_workers=2, chunk_size=4).map(
+            math.sqrt, ARGS, skip_exceptions=(ValueError,))
+        assert results == EXPECTED
+
+    def test_process_backend_per_call_limits(self):
+        results = dict(TaskExecutor("process", max_workers=2).imap_unordered(
+            math.sqrt, ARGS, skip_exceptions=(ValueError,), on_error=lambda idx, e: None,
+            chunk_size=1, max_concurrent=1))
+        assert [results[idx] for idx in range(len(ARGS))] == EXPECTED
+
+    def test_process_backend_crashed_worker_fails_its_tasks(self):
+        errors = {}
+        results = dict(TaskExecutor("process").imap_unordered(
+            os._exit, [3], skip_exceptions=(Exception,),
+            on_error=lambda idx, e: errors.setdefault(idx, e)))
+        assert results == {0: None}
+        assert isinstance(errors[0], BrokenProcessPool)
+        # 进程池在下次提交时重建
+        assert TaskExecutor("process").map(math.sqrt, [4]) == [2.0]
+
+    def test_process_backend_keeps_shared_pool_size(self):
+        pool = get_worker_pool()
+        workers = pool.start()
+        executor = pool._executor
+        assert TaskExecutor("process", max_workers=workers + 1).map(math.sqrt, [4, 9]) == [2.0, 3.0]
+        TaskExecutor("process", max_workers=1).run_graph([GraphTask("a", math.sqrt, (4,))])
+        assert pool.max_workers == workers and pool._executor is executor
+
+    def test_thread_backend_respects_max_concurrent(self):
+        lock, running, peak = threading.Lock(), [0], [0]
+
+        def _task(value):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            return value
+
+        results = dict(TaskExecutor("thread", max_workers=4).imap_unordered(
+            _task, range(8), max_concurrent=2))
+        assert sorted(results.values()) == list(range(8))
+        assert peak[0] <= 2
+
+    def test_empty_input(self):
+        assert TaskExecutor("serial").map(math.sqrt, []) == []
+
+    def test_unknown_backend_rejected(self):
+        with pytest.raises(ValueError):
+            TaskExecutor("gpu")
+
+    def test_backends_listed(self):
+        assert set(EXECUTOR_BACKENDS) == {"process", "thread", "serial", "inline"}
+
+
+class TestRunGraph:
+    @pytest.mark.parametrize("backend", ["process", "thread", "serial"])
+    def test_returns_timing_per_task(self, backend):
+        timings = TaskExecutor(backend, max_workers=2).run_graph([
+            GraphTask("a", math.sqrt, (4,)),
+            GraphTask("b", math.sqrt, (9,)),
+            GraphTask("c", math.sqrt, (16,), deps=("a", "b")),
+        ])
+        assert set(timings) == {"a", "b", "c"}
+        assert list(timings)[-1] == "c"
+        assert all(seconds >= 0 for seconds in timings.values())
+
+    def test_dependents_wait_and_failures_stop_the_graph(self):
+        order = []
+        with pytest.raises(ValueError):
+            TaskExecutor("thread", max_workers=4).run_graph([
+                GraphTask("plots", order.append, ("plots",)),
+                GraphTask("broken", math.sqrt, (-1,)),
+                GraphTask("report", order.append, ("report",), deps=("plots", "broken")),
+            ])
+        assert order == ["plots"]
+
+    def test_undeclared_dependency_rejected(self):
+        with pytest.raises(ValueError, match="undeclared"):
+            TaskExecutor("serial").run_graph([GraphTask("report", print, deps=("plots",))])
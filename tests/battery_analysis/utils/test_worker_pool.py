@@ -0,0 +1,55 @@
+import math
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from battery_analysis.utils.worker_pool import WorkerPool, get_worker_pool
+
+
+@pytest.fixture
+def pool():
+    worker_pool = WorkerPool(max_workers=1, max_pending=1)
+    yield worker_pool
+    worker_pool.shutdown()
+
+
+class TestWorkerPool:
+    def test_starts_lazily(self, pool):
+        assert not pool.is_running
+        assert pool.submit(math.sqrt, 16).result(timeout=60) == 4
+        assert pool.is_running
+
+    def test_workers_are_reused_between_tasks(self, pool):
+        """常驻进程池：连续提交的任务由同一子进程执行"""
+        first = pool.submit(os.getpid).result(timeout=60)
+        second = pool.submit(os.getpid).result(timeout=60)
+        assert first == second != os.getpid()
+
+    def test_submit_blocks_when_queue_is_full(self, pool):
+        pool.submit(math.sqrt, 1).result(timeout=60)
+        pool.submit(time.sleep, 0.5)
+        start = time.perf_counter()
+        pool.submit(math.sqrt, 1).result(timeout=60)
+        assert time.perf_counter() - start >= 0.3
+
+    def test_restarts_after_worker_crash(self, pool):
+        with pytest.raises(BrokenProcessPool):
+            pool.submit(os._exit, 1).result(timeout=60)
+        assert pool.submit(math.sqrt, 9).result(timeout=60) == 3
+
+    def test_shutdown_then_submit_restarts(self, pool):
+        pool.submit(math.sqrt, 1).result(timeout=60)
+        pool.shutdown()
+        assert not pool.is_running
+        assert pool.submit(math.sqrt, 4).result(timeout=60) == 2
+
+    def test_default_pool_is_shared(self):
+        assert get_worker_pool() is get_worker_pool()
+
+    def test_resize_restarts_with_new_size(self, pool):
+        pool.submit(math.sqrt, 1).result(timeout=60)
+        pool.resize(2)
+        assert not pool.is_running
+        assert pool.start() == 2
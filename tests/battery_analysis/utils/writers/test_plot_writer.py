@@ -34,8 +34,8 @@ def test_filtered_plot_uses_filtered_data(tmp_path, info_image_csv, monkeypatch)
     monkeypatch.setattr(plot_writer.plt, "grid", Mock())
     monkeypatch.setattr(plot_writer.plt, "gca", Mock())
     monkeypatch.setattr(plot_writer.plt, "savefig", Mock())
-    mock_plot = Mock(side_effect=lambda *a, **k: plot_calls.append(a))
-    monkeypatch.setattr(plot_writer.plt, "plot", mock_plot)
+    monkeypatch.setattr(plot_writer, "LineCollection",
+                        Mock(side_effect=lambda segments, **k: plot_calls.append(segments[0])))
     monkeypatch.setattr(plot_writer.plot_utils, "set_plt_axis", Mock())
     monkeypatch.setattr(plot_writer, "MultipleLocator", lambda v: Mock())
     # 过滤后数据固定为已知值，便于断言
@@ -64,17 +64,37 @@ def test_filtered_plot_uses_filtered_data(tmp_path, info_image_csv, monkeypatch)
         max_xaxis=5.0,
     )
 
-    # Unfiltered 图 + Filtered 图各一次 plt.plot
-    assert len(plot_calls) == 2, "应恰好有 unfiltered 图与 filtered 图两次 plt.plot 调用"
+    # Unfiltered 图 + Filtered 图各一个 LineCollection（1 个电流等级），记录其首条线段
+    assert len(plot_calls) == 2, "应恰好有 unfiltered 图与 filtered 图两个 LineCollection"
 
-    # 第一次 plt.plot 调用即 Unfiltered 图：仍应使用原始数据 [0]/[1]
+    # 第一个 LineCollection 即 Unfiltered 图：仍应使用原始数据 [0]/[1]
     unfiltered_call = plot_calls[0]
-    assert list(unfiltered_call[0]) == [1.0, 2.0, 3.0, 4.0], \
+    assert list(unfiltered_call[:, 0]) == [1.0, 2.0, 3.0, 4.0], \
         "Unfiltered 图应使用原始 charge 数据 [0]"
-    assert list(unfiltered_call[1]) == [5.0, 6.0, 7.0, 8.0], \
+    assert list(unfiltered_call[:, 1]) == [5.0, 6.0, 7.0, 8.0], \
         "Unfiltered 图应使用原始 voltage 数据 [1]"
 
-    # 最后一次 plt.plot 调用即 Filtered 图：应使用过滤后数据 [2]/[3]
+    # 最后一个 LineCollection 即 Filtered 图：应使用过滤后数据 [2]/[3]
     last_call = plot_calls[-1]
-    assert list(last_call[0]) == [9.0, 10.0], "Filtered 图应使用过滤后 charge 数据 [2]"
-    assert list(last_call[1]) == [11.0, 12.0], "Filtered 图应使用过滤后 voltage 数据 [3]"
+    assert list(last_call[:, 0]) == [9.0, 10.0], "Filtered 图应使用过滤后 charge 数据 [2]"
+    assert list(last_call[:, 1]) == [11.0, 12.0], "Filtered 图应使用过滤后 voltage 数据 [3]"
+
+
+def test_dense_curves_are_rasterized_in_svg(tmp_path, info_image_csv, monkeypatch):
+    """曲线条数超过阈值时以 rasterized=True 绘制，SVG 以 SVG_RASTER_DPI 保存"""
+    from battery_analysis.utils.writers import plot_writer
+
+    plot_kwargs, savefig_kwargs = [], []
+    monkeypatch.setattr(plot_writer, "RASTERIZE_SVG_LINES_ABOVE", 0)
+    real_line_collection = plot_writer.LineCollection
+    monkeypatch.setattr(plot_writer, "LineCollection",
+                        lambda segments, **k: plot_kwargs.append(k) or real_line_collection(segments, **k))
+    monkeypatch.setattr(plot_writer.plt, "savefig", Mock(side_effect=lambda *a, **k: savefig_kwargs.append(k)))
+    monkeypatch.setattr(plot_writer.plot_utils, "set_plt_axis", Mock())
+
+    plot_writer.draw_load_voltage_curves(
+        str(info_image_csv), 1, "test", str(tmp_path / "c.png"), str(tmp_path / "c.svg"),
+        [[0.0, 5.0]], ["C0"], 1, 5.0, filtered=False, image_formats=("svg",))
+
+    assert [k["rasterized"] for k in plot_kwargs] == [True]
+    assert savefig_kwargs == [{"dpi": plot_writer.SVG_RASTER_DPI}]
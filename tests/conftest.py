@@ -1,7 +1,28 @@
+import os
+import shutil
+import tempfile
+
 import openpyxl
 import pytest
 from pathlib import Path
 
+_SESSION_CACHE_DIR = None
+
+
+def pytest_configure(config):
+    """收集测试前就把缓存根目录指向临时目录
+
+    导入 battery_analysis.i18n 时即写入翻译目录缓存，发生在函数级 fixture 生效之前。
+    """
+    global _SESSION_CACHE_DIR
+    _SESSION_CACHE_DIR = tempfile.mkdtemp(prefix="battery_analysis_cache_")
+    os.environ["BATTERY_ANALYSIS_CACHE_DIR"] = _SESSION_CACHE_DIR
+
+
+def pytest_unconfigure(config):
+    if _SESSION_CACHE_DIR:
+        shutil.rmtree(_SESSION_CACHE_DIR, ignore_errors=True)
+
 
 @pytest.fixture
 def project_root() -> Path:
@@ -21,6 +42,12 @@ def test_data_dir() -> Path:
     return Path(__file__).parent / "data"
 
 
+@pytest.fixture(autouse=True)
+def isolated_sheet_cache(tmp_path, monkeypatch):
+    """xlsx 解析缓存写入临时目录，避免测试污染用户缓存"""
+    monkeypatch.setenv("BATTERY_ANALYSIS_CACHE_DIR", str(tmp_path / "cache"))
+
+
 def pytest_collection_modifyitems(config, items):
     """自动跳过 tests/manual/ 下的测试（除非用 --run-manual 标记运行）"""
     if config.getoption("--run-manual", default=False):
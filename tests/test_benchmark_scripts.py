@@ -0,0 +1,53 @@
+"""测试 scripts/benchmark_data.py 的合成数据与 scripts/benchmark.py 的计时 / 对比逻辑"""
+import pandas as pd
+
+from battery_analysis.utils.processors.battery_analysis import BatteryAnalysis
+from scripts.benchmark import bench_stages, compare_results
+from scripts.benchmark_data import WorkbookSpec, generate_dataset, record_columns
+
+
+class TestSyntheticWorkbooks:
+    def test_same_spec_is_deterministic(self):
+        spec = WorkbookSpec(rows=500)
+        first, second = record_columns(spec, 3), record_columns(spec, 3)
+        assert all((first[name] == second[name]).all() for name in first)
+        assert not (record_columns(spec, 4)["voltage"] == first["voltage"]).all()
+
+    def test_every_level_is_matched(self, tmp_path):
+        spec = WorkbookSpec(rows=3000, cycles=5)
+        path = generate_dataset(str(tmp_path), spec)[0]
+        name, charges, curves, timestamps, _ = BatteryAnalysis._parallel_process_file(
+            (path, list(spec.current_levels), list(spec.voltage_levels)))
+        assert name == "SYN_0001"
+        assert len(charges) == len(spec.current_levels) * len(spec.voltage_levels) and all(charges)
+        assert all(len(posi) == 100 for posi in curves.posi_lists())
+        assert timestamps[0] == "2025-06-10 08:00:00"
+        assert len(pd.read_excel(path, sheet_name=2, header=None, engine="calamine")) == spec.rows + 2
+
+    def test_existing_dataset_is_reused(self, tmp_path):
+        spec = WorkbookSpec(files=2, rows=200)
+        paths = generate_dataset(str(tmp_path), spec)
+        mtimes = [p.stat().st_mtime_ns for p in sorted(tmp_path.glob("*.xlsx"))]
+        assert generate_dataset(str(tmp_path), spec) == paths
+        assert [p.stat().st_mtime_ns for p in sorted(tmp_path.glob("*.xlsx"))] == mtimes
+
+
+class TestBenchmark:
+    def test_bench_stages_times_every_stage(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("BATTERY_ANALYSIS_SHEET_CACHE", "0")
+        spec = WorkbookSpec(rows=300, cycles=3)
+        timings = bench_stages(generate_dataset(str(tmp_path / "data"), spec)[0], spec, repeat=2)
+        assert set(timings) == {"read_xlsx_sheets", "read_projected_sheets", "detect_pulse_rows",
+                                "match_pulse_levels", "charge_calculator", "write_info_csv",
+                                "info_image_writer", "process_file"}
+        assert all(len(t["runs"]) == 2 and t["min"] <= t["median"] for t in timings.values())
+
+    def test_compare_flags_regressions(self):
+        def _result(read, match):
+            return {"results": [{"scenario": "stages-1k", "timings": {
+                "read": {"median": read}, "match": {"median": match}}}, {"scenario": "run-10", "error": "x"}]}
+
+        rows, regressed = compare_results(_result(1.0, 1.0), _result(1.05, 0.5), threshold=1.1)
+        assert [(stage, round(ratio, 2)) for _, stage, _, _, ratio in rows] == [("match", 0.5), ("read", 1.05)]
+        assert not regressed
+        assert compare_results(_result(1.0, 1.0), _result(1.2, 1.0), threshold=1.1)[1]